@@ -1,9 +1,11 @@
 from fastapi import APIRouter
 
-from app.api.v1 import auth, users, spots
+from app.api.v1 import auth, users, spots, notifications, uploads
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router)
 api_router.include_router(users.router)
-api_router.include_router(spots.router)
\ No newline at end of file
+api_router.include_router(spots.router)
+api_router.include_router(notifications.router)
+api_router.include_router(uploads.router)
\ No newline at end of file
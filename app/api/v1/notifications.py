@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from typing import List
+
+from app.core.database import get_db
+from app.core.auth import get_current_user
+from app.core.invalidation import publish
+from app.core.notifications import get_unread_count, unread_count_cache
+from app.models.user import User
+from app.models.notification import Notification
+from app.schemas.notification import NotificationResponse, UnreadCountResponse, NotificationMarkRead
+
+router = APIRouter(prefix="/notifications", tags=["notifications"])
+
+
+@router.get("/", response_model=List[NotificationResponse])
+async def get_notifications(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    unread_only: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the current user's notification inbox, most recent activity first"""
+    query = select(Notification).where(Notification.user_id == current_user.id)
+    
+    if unread_only:
+        query = query.where(Notification.is_read == False)
+    
+    query = query.order_by(Notification.updated_at.desc()).offset(skip).limit(limit)
+    
+    result = await db.execute(query)
+    notifications = result.scalars().all()
+    
+    return notifications
+
+
+@router.get("/unread-count", response_model=UnreadCountResponse)
+async def get_notifications_unread_count(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the number of unread notifications"""
+    count = await get_unread_count(db, current_user.id)
+    return {"unread_count": count}
+
+
+@router.post("/read")
+async def mark_notifications_read(
+    mark_read: NotificationMarkRead,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Mark notifications as read (all of them when no ids are given)"""
+    query = (
+        update(Notification)
+        .where(Notification.user_id == current_user.id, Notification.is_read == False)
+        .values(is_read=True)
+    )
+    
+    if mark_read.notification_ids is not None:
+        query = query.where(Notification.id.in_(mark_read.notification_ids))
+    
+    result = await db.execute(query)
+    await publish(db, unread_count_cache.name, [current_user.id])
+    await db.commit()
+    
+    return {"message": "Notifications marked as read", "updated": result.rowcount}
@@ -1,25 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File, Form
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, func, and_, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from uuid import UUID
-import math
 
-from app.core.database import get_db
+from app.core.database import get_db, any_of
 from app.core.auth import get_current_user
+from app.core.counts import count_rows, set_total_headers
+from app.core.http import conditional_response
+from app.core.invalidation import publish, SPOTS_TOPIC
+from app.core.jobs import enqueue_job
+from app.core.lean import SPOT_COLUMNS, spot_record, load_spot_records, spot_list_response
+from app.core.loaders import Loaders, get_loaders
+from app.core.cloudinary import SPOT_IMAGE_FOLDER
+from app.core.media import (
+    read_upload, acquire_media, reference_media_url, insert_spot_image, SPOT_IMAGE_MAX_BYTES
+)
+from app.core.spot_detail import load_spot_detail
+from app.core.notifications import notify
+from app.core.ratings import apply_rating_change
+from app.core.spot_purge import PURGE_TOPIC
+from app.core.spot_grid import add_spot_to_grid, remove_spot_from_grid, get_clusters
+from app.core.spot_sync import (
+    get_spot_changes, record_spot_deletion,
+    SyncTokenError, SyncTokenExpired
+)
+from app.core.trending import get_trending_spots
+from app.core.spot_tiles import (
+    get_tile, invalidate_spot_tiles,
+    TILE_MIN_ZOOM, TILE_MAX_ZOOM, TILE_MEDIA_TYPE
+)
 from app.models.user import User
 from app.models.spot import Spot, SpotRating, SpotImage
 from app.schemas.spot import (
     SpotResponse, SpotCreate, SpotUpdate, 
-    SpotRatingCreate, SpotRatingResponse,
-    SpotImageCreate, SpotImageResponse
+    SpotListItem, SpotRatingCreate, SpotRatingResponse, SpotReviewResponse,
+    SpotImageCreate, SpotImageResponse,
+    SpotClusterResponse, SpotChangesResponse, SpotTrendingItem,
+    SpotBatchRequest, SpotBatchResponse, SpotDetailResponse, SpotNearbyRequest,
+    SpotAlongRouteRequest, SpotRouteItem, SpotSimilarItem
 )
 
 router = APIRouter(prefix="/spots", tags=["spots"])
 
 
-@router.get("/", response_model=List[SpotResponse])
+@router.get("/", response_model=List[SpotListItem])
 async def get_spots(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
@@ -29,10 +57,13 @@ async def get_spots(
     latitude: Optional[float] = None,
     longitude: Optional[float] = None,
     radius_km: Optional[float] = Query(None, ge=0.1, le=100),
+    include_creator: bool = False,
+    include_total: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
     """Get spots with optional filtering and location-based search"""
-    query = select(Spot).where(Spot.is_public == True)
+    # Lean path: plain columns serialized directly (see app.core.lean)
+    query = select(*SPOT_COLUMNS).where(Spot.is_public == True, Spot.deleted_at.is_(None))
     
     if search:
         search_filter = or_(
@@ -48,31 +79,194 @@ async def get_spots(
     if difficulty:
         query = query.where(Spot.difficulty == difficulty)
     
-    # Location-based filtering using Haversine formula approximation
     if latitude is not None and longitude is not None and radius_km is not None:
-        # Convert km to degrees (rough approximation)
-        lat_delta = radius_km / 111.0  # 1 degree lat ≈ 111 km
-        lon_delta = radius_km / (111.0 * math.cos(math.radians(latitude)))
+        # Bounding boxes select candidates; exact distances filter and order them, nearest first
+        # Imported here so NumPy stays off the cold-start path
+        from app.core.geo_rank import TooManyCandidates, nearest_spots, within_boxes
         
-        query = query.where(
-            and_(
-                Spot.latitude.between(latitude - lat_delta, latitude + lat_delta),
-                Spot.longitude.between(longitude - lon_delta, longitude + lon_delta)
+        points = [(latitude, longitude)]
+        try:
+            spots, total = await nearest_spots(
+                db, query.where(within_boxes(points, radius_km)), points, radius_km, limit, skip
             )
+        except TooManyCandidates as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        total = await count_rows(db, query, Spot.id, SPOTS_TOPIC) if include_total else None
+        
+        query = query.offset(skip).limit(limit).order_by(Spot.created_at.desc())
+        
+        result = await db.execute(query)
+        spots = [spot_record(row) for row in result.all()]
+    
+    response = await spot_list_response(db, spots, include_creator)
+    return set_total_headers(response, total) if include_total else response
+
+
+@router.post("/nearby", response_model=List[SpotListItem])
+async def get_spots_nearby(
+    search: SpotNearbyRequest,
+    include_creator: bool = False,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get spots within a radius of any of several points, nearest first"""
+    from app.core.geo_rank import TooManyCandidates, nearest_spots, within_boxes
+    
+    points = [(point.latitude, point.longitude) for point in search.points]
+    query = select(Spot.id).where(
+        Spot.is_public == True,
+        Spot.deleted_at.is_(None),
+        within_boxes(points, search.radius_km)
+    )
+    if search.spot_type:
+        query = query.where(Spot.spot_type == search.spot_type)
+    if search.difficulty:
+        query = query.where(Spot.difficulty == search.difficulty)
+    
+    try:
+        spots, _ = await nearest_spots(db, query, points, search.radius_km, search.limit)
+    except TooManyCandidates as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return await spot_list_response(db, spots, include_creator)
+
+
+@router.post("/along-route", response_model=List[SpotRouteItem])
+async def get_spots_along_route(
+    search: SpotAlongRouteRequest,
+    include_creator: bool = False,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get spots within a corridor around a route, in the order the route passes them"""
+    from app.core.geo_rank import TooManyCandidates, spots_along_route, along_route_boxes
+    
+    route = [(point.latitude, point.longitude) for point in search.route]
+    query = select(Spot.id).where(
+        Spot.is_public == True,
+        Spot.deleted_at.is_(None),
+        along_route_boxes(route, search.corridor_km)
+    )
+    if search.spot_type:
+        query = query.where(Spot.spot_type == search.spot_type)
+    if search.difficulty:
+        query = query.where(Spot.difficulty == search.difficulty)
+    
+    try:
+        spots = await spots_along_route(db, query, route, search.corridor_km, search.limit)
+    except TooManyCandidates as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return await spot_list_response(db, spots, include_creator)
+
+
+@router.get("/clusters", response_model=List[SpotClusterResponse])
+async def get_spot_clusters(
+    min_latitude: float = Query(..., ge=-90, le=90),
+    min_longitude: float = Query(..., ge=-180, le=180),
+    max_latitude: float = Query(..., ge=-90, le=90),
+    max_longitude: float = Query(..., ge=-180, le=180),
+    zoom: int = Query(..., ge=0, le=22),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get spot clusters for a map viewport from the precomputed grid"""
+    if min_latitude > max_latitude:
+        raise HTTPException(status_code=400, detail="min_latitude must not exceed max_latitude")
+    
+    try:
+        clusters = await get_clusters(db, min_latitude, min_longitude, max_latitude, max_longitude, zoom)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return clusters
+
+
+@router.get("/trending", response_model=List[SpotTrendingItem])
+async def get_spots_trending(
+    latitude: Optional[float] = Query(None, ge=-90, le=90),
+    longitude: Optional[float] = Query(None, ge=-180, le=180),
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get trending spots near a location (or worldwide) from the precomputed ranking"""
+    ranked = await get_trending_spots(db, latitude, longitude, limit)
+    
+    return [
+        SpotTrendingItem.model_validate(spot).model_copy(update={"trending_score": score})
+        for spot, score in ranked
+    ]
+
+
+@router.get("/changes", response_model=SpotChangesResponse)
+async def get_spots_changes(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get spots created, updated or deleted since a sync token (omit it for a full sync)"""
+    try:
+        changes = await get_spot_changes(db, since, limit)
+    except SyncTokenExpired as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    except SyncTokenError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return changes
+
+
+@router.get("/tiles/{z}/{x}/{y}")
+async def get_spot_tile(
+    request: Request,
+    z: int,
+    x: int,
+    y: int,
+    v: Optional[int] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a compact binary tile of map pins (see app/core/spot_tiles.py for the layout)"""
+    if z < TILE_MIN_ZOOM or z > TILE_MAX_ZOOM:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tiles are available for zoom {TILE_MIN_ZOOM}-{TILE_MAX_ZOOM}; use /spots/clusters below that"
         )
     
-    query = query.offset(skip).limit(limit).order_by(Spot.created_at.desc())
+    if not (0 <= x < (1 << z) and 0 <= y < (1 << z)):
+        raise HTTPException(status_code=404, detail="Tile not found")
     
-    result = await db.execute(query)
-    spots = result.scalars().all()
+    tile = await get_tile(db, z, x, y)
     
-    return spots
+    # A versioned URL always maps to the same bytes, so clients may cache it forever
+    if v == tile.version:
+        cache_control = "public, max-age=31536000, immutable"
+    else:
+        cache_control = "public, max-age=60"
+    
+    return conditional_response(
+        request,
+        tile.data,
+        media_type=TILE_MEDIA_TYPE,
+        etag=tile.etag,
+        headers={"Cache-Control": cache_control, "X-Tile-Version": str(tile.version)}
+    )
+
+
+@router.post("/batch", response_model=SpotBatchResponse)
+async def get_spots_batch(batch: SpotBatchRequest, db: AsyncSession = Depends(get_db)):
+    """Get many spots by ID in one query, in request order with not-found markers"""
+    result = await db.execute(select(Spot).where(any_of(Spot.id, set(batch.ids)), Spot.deleted_at.is_(None)))
+    spots = {spot.id: spot for spot in result.scalars().all()}
+    
+    items = [
+        {"id": spot_id, "found": spot_id in spots, "spot": spots.get(spot_id)}
+        for spot_id in batch.ids
+    ]
+    
+    return {"items": items}
 
 
 @router.get("/{spot_id}", response_model=SpotResponse)
 async def get_spot(spot_id: UUID, db: AsyncSession = Depends(get_db)):
     """Get spot by ID"""
-    result = await db.execute(select(Spot).where(Spot.id == spot_id))
+    result = await db.execute(select(Spot).where(Spot.id == spot_id, Spot.deleted_at.is_(None)))
     spot = result.scalar_one_or_none()
     
     if not spot:
@@ -81,6 +275,50 @@ async def get_spot(spot_id: UUID, db: AsyncSession = Depends(get_db)):
     return spot
 
 
+@router.get("/{spot_id}/detail", response_model=SpotDetailResponse)
+async def get_spot_detail(spot_id: UUID, request: Request):
+    """Get the spot page in one payload: spot, images, rating summary, reviews and sessions"""
+    detail = await load_spot_detail(spot_id)
+    
+    if not detail:
+        raise HTTPException(status_code=404, detail="Spot not found")
+    
+    return conditional_response(
+        request,
+        detail.model_dump_json().encode(),
+        media_type="application/json",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+@router.get("/{spot_id}/similar", response_model=List[SpotSimilarItem])
+async def get_similar_spots(
+    spot_id: UUID,
+    limit: int = Query(10, ge=1, le=50),
+    max_distance_km: Optional[float] = Query(None, ge=0.1, le=500),
+    include_creator: bool = False,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the spots most like this one by type, difficulty, features and rating"""
+    # Imported here so NumPy stays off the cold-start path
+    from app.core.similar_spots import similar_spots
+    
+    matches = await similar_spots(db, spot_id, limit, max_distance_km)
+    if matches is None:
+        raise HTTPException(status_code=404, detail="Spot not found")
+    
+    records = await load_spot_records(db, [match_id for match_id, _, _ in matches])
+    spots = []
+    for match_id, similarity, distance in matches:
+        spot = records.get(match_id)
+        if spot is not None:
+            spot["distance_km"] = round(distance, 3)
+            spot["similarity"] = round(similarity, 4)
+            spots.append(spot)
+    
+    return await spot_list_response(db, spots, include_creator)
+
+
 @router.post("/", response_model=SpotResponse)
 async def create_spot(
     spot_data: SpotCreate,
@@ -88,14 +326,18 @@ async def create_spot(
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new spot"""
-    db_spot = Spot(
-        **spot_data.model_dump(),
-        creator_id=current_user.id
+    # RETURNING brings back server defaults (created_at, counters) without a refresh
+    db_spot = await db.scalar(
+        insert(Spot)
+        .values(**spot_data.model_dump(), creator_id=current_user.id)
+        .returning(Spot)
     )
     
-    db.add(db_spot)
+    if db_spot.is_public:
+        await add_spot_to_grid(db, db_spot.latitude, db_spot.longitude, db_spot.spot_type)
+        await invalidate_spot_tiles(db, db_spot.latitude, db_spot.longitude)
+    await publish(db, SPOTS_TOPIC, [db_spot.id])
     await db.commit()
-    await db.refresh(db_spot)
     
     return db_spot
 
@@ -108,28 +350,55 @@ async def update_spot(
     db: AsyncSession = Depends(get_db)
 ):
     """Update a spot (only by creator)"""
-    result = await db.execute(select(Spot).where(Spot.id == spot_id))
-    spot = result.scalar_one_or_none()
-    
-    if not spot:
-        raise HTTPException(status_code=404, detail="Spot not found")
-    
-    if spot.creator_id != current_user.id:
-        raise HTTPException(
-            status_code=403, 
-            detail="Only the spot creator can update this spot"
-        )
-    
     update_data = spot_update.model_dump(exclude_unset=True)
     
+    # Ownership is part of the WHERE clause; the locked CTE supplies the pre-update
+    # type and visibility, so the whole update is one statement
+    old = (
+        select(Spot.id, Spot.spot_type, Spot.is_public)
+        .where(Spot.id == spot_id, Spot.creator_id == current_user.id, Spot.deleted_at.is_(None))
+        .with_for_update()
+        .cte("old")
+    )
+    row = None
     if update_data:
-        await db.execute(
+        result = await db.execute(
             update(Spot)
-            .where(Spot.id == spot_id)
+            .where(Spot.id == old.c.id)
             .values(**update_data)
+            .returning(Spot, old.c.spot_type.label("old_spot_type"), old.c.is_public.label("old_is_public"))
         )
-        await db.commit()
-        await db.refresh(spot)
+        row = result.first()
+    
+    if row is None:
+        result = await db.execute(select(Spot).where(Spot.id == spot_id, Spot.deleted_at.is_(None)))
+        spot = result.scalar_one_or_none()
+        
+        if not spot:
+            raise HTTPException(status_code=404, detail="Spot not found")
+        
+        if spot.creator_id != current_user.id:
+            raise HTTPException(
+                status_code=403, 
+                detail="Only the spot creator can update this spot"
+            )
+        
+        return spot
+    
+    spot = row.Spot
+    
+    # Keep the cluster grid in step with type and visibility changes
+    if (spot.spot_type, spot.is_public) != (row.old_spot_type, row.old_is_public):
+        if row.old_is_public:
+            await remove_spot_from_grid(db, spot.latitude, spot.longitude, row.old_spot_type)
+        if spot.is_public:
+            await add_spot_to_grid(db, spot.latitude, spot.longitude, spot.spot_type)
+    
+    if update_data.keys() & {"spot_type", "difficulty", "is_public"}:
+        await invalidate_spot_tiles(db, spot.latitude, spot.longitude)
+    
+    await publish(db, SPOTS_TOPIC, [spot.id])
+    await db.commit()
     
     return spot
 
@@ -141,19 +410,35 @@ async def delete_spot(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a spot (only by creator)"""
-    result = await db.execute(select(Spot).where(Spot.id == spot_id))
-    spot = result.scalar_one_or_none()
-    
-    if not spot:
-        raise HTTPException(status_code=404, detail="Spot not found")
+    # Soft delete in the request; ratings, images and remote media are purged in the
+    # background (see app.core.spot_purge), so large spots delete as fast as small ones
+    result = await db.execute(
+        update(Spot)
+        .where(Spot.id == spot_id, Spot.creator_id == current_user.id, Spot.deleted_at.is_(None))
+        .values(deleted_at=func.now())
+        .returning(Spot.latitude, Spot.longitude, Spot.spot_type, Spot.is_public)
+    )
+    spot = result.first()
     
-    if spot.creator_id != current_user.id:
+    if spot is None:
+        creator_id = await db.scalar(
+            select(Spot.creator_id).where(Spot.id == spot_id, Spot.deleted_at.is_(None))
+        )
+        
+        if creator_id is None:
+            raise HTTPException(status_code=404, detail="Spot not found")
+        
         raise HTTPException(
             status_code=403,
             detail="Only the spot creator can delete this spot"
         )
     
-    await db.delete(spot)
+    if spot.is_public:
+        await remove_spot_from_grid(db, spot.latitude, spot.longitude, spot.spot_type)
+        await invalidate_spot_tiles(db, spot.latitude, spot.longitude)
+    await record_spot_deletion(db, spot_id)
+    enqueue_job(db, PURGE_TOPIC, {"spot_id": str(spot_id)})
+    await publish(db, SPOTS_TOPIC, [spot_id])
     await db.commit()
     
     return {"message": "Spot deleted successfully"}
@@ -167,13 +452,6 @@ async def rate_spot(
     db: AsyncSession = Depends(get_db)
 ):
     """Rate a spot"""
-    # Check if spot exists
-    spot_result = await db.execute(select(Spot).where(Spot.id == spot_id))
-    spot = spot_result.scalar_one_or_none()
-    
-    if not spot:
-        raise HTTPException(status_code=404, detail="Spot not found")
-    
     # Validate rating
     if rating_data.rating < 1 or rating_data.rating > 5:
         raise HTTPException(
@@ -181,74 +459,91 @@ async def rate_spot(
             detail="Rating must be between 1 and 5"
         )
     
-    # Check if user already rated this spot
-    existing_rating = await db.execute(
-        select(SpotRating).where(
+    # Update the user's existing rating, reading its previous value from the locked row
+    existing = (
+        select(SpotRating.id, SpotRating.rating)
+        .where(
             and_(
                 SpotRating.spot_id == spot_id,
                 SpotRating.user_id == current_user.id
             )
         )
+        .with_for_update()
+        .cte("existing")
     )
-    
-    existing = existing_rating.scalar_one_or_none()
-    
-    if existing:
-        # Update existing rating
-        await db.execute(
-            update(SpotRating)
-            .where(SpotRating.id == existing.id)
-            .values(
-                rating=rating_data.rating,
-                review=rating_data.review
-            )
-        )
-        await db.commit()
-        await db.refresh(existing)
-        db_rating = existing
-    else:
-        # Create new rating
-        db_rating = SpotRating(
-            spot_id=spot_id,
-            user_id=current_user.id,
+    update_existing = (
+        update(SpotRating)
+        .where(SpotRating.id == existing.c.id)
+        .values(
             rating=rating_data.rating,
             review=rating_data.review
         )
-        db.add(db_rating)
-        await db.commit()
-        await db.refresh(db_rating)
-    
-    # Update spot's average rating
-    rating_stats = await db.execute(
-        select(
-            func.avg(SpotRating.rating),
-            func.count(SpotRating.id)
-        ).where(SpotRating.spot_id == spot_id)
+        .returning(SpotRating, existing.c.rating.label("previous_rating"))
     )
+    row = (await db.execute(update_existing)).first()
+    
+    if row is None:
+        # Create new rating; a missing spot fails the foreign key, and a concurrent
+        # first rating by the same user is skipped rather than raising
+        try:
+            db_rating = await db.scalar(
+                insert(SpotRating)
+                .values(
+                    spot_id=spot_id,
+                    user_id=current_user.id,
+                    rating=rating_data.rating,
+                    review=rating_data.review
+                )
+                .on_conflict_do_nothing(index_elements=[SpotRating.spot_id, SpotRating.user_id])
+                .returning(SpotRating)
+            )
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=404, detail="Spot not found")
+        
+        if db_rating is not None:
+            previous_rating = None
+        else:
+            # The other request's rating has committed, so this one replaces it
+            row = (await db.execute(update_existing)).first()
+            if row is None:
+                # Ratings only disappear when a deleted spot is purged
+                await db.rollback()
+                raise HTTPException(status_code=404, detail="Spot not found")
+    
+    if row is not None:
+        db_rating, previous_rating = row.SpotRating, row.previous_rating
+    
+    # Update the spot's histogram and average in the same transaction
+    spot = await apply_rating_change(db, spot_id, rating_data.rating, previous_rating)
+    if spot is None:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Spot not found")
     
-    avg_rating, count = rating_stats.first()
-    
-    await db.execute(
-        update(Spot)
-        .where(Spot.id == spot_id)
-        .values(
-            rating=float(avg_rating) if avg_rating else 0.0,
-            rating_count=count
-        )
-    )
+    if previous_rating is None:
+        notify(db, spot.creator_id, current_user.id, "spot_rating", target_id=spot_id)
+    if spot.is_public:
+        await invalidate_spot_tiles(db, spot.latitude, spot.longitude)
+    await publish(db, SPOTS_TOPIC, [spot_id])
     await db.commit()
     
     return db_rating
 
 
-@router.get("/{spot_id}/ratings", response_model=List[SpotRatingResponse])
+@router.get("/{spot_id}/ratings", response_model=List[SpotReviewResponse])
 async def get_spot_ratings(
     spot_id: UUID,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
-    """Get ratings for a spot"""
+    """Get ratings for a spot with their authors"""
+    # A deleted spot keeps its ratings until the purge job reaches them
+    live = await db.scalar(select(Spot.id).where(Spot.id == spot_id, Spot.deleted_at.is_(None)))
+    if live is None:
+        raise HTTPException(status_code=404, detail="Spot not found")
+    
     query = (
         select(SpotRating)
         .where(SpotRating.spot_id == spot_id)
@@ -260,6 +555,8 @@ async def get_spot_ratings(
     result = await db.execute(query)
     ratings = result.scalars().all()
     
+    await loaders.attach(ratings, "user", loaders.users, "user_id")
+    
     return ratings
 
 
@@ -270,21 +567,50 @@ async def add_spot_image(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Add an image to a spot"""
-    # Check if spot exists
-    spot_result = await db.execute(select(Spot).where(Spot.id == spot_id))
-    if not spot_result.scalar_one_or_none():
+    """Add an image to a spot by URL"""
+    values = image_data.model_dump()
+    values["image_url"] = await reference_media_url(db, image_data.image_url)
+    db_image = await insert_spot_image(db, spot_id, uploaded_by=current_user.id, **values)
+    
+    if db_image is None:
+        # Rolling back also returns the media reference
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Spot not found")
+    
+    await db.commit()
+    
+    return db_image
+
+
+@router.post("/{spot_id}/images/upload", response_model=SpotImageResponse)
+async def upload_spot_image(
+    spot_id: UUID,
+    file: UploadFile = File(...),
+    caption: Optional[str] = Form(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Upload a photo of a spot; bytes already in storage are reused, not uploaded"""
+    if not file.content_type or not file.content_type.startswith('image/'):
+        raise HTTPException(status_code=400, detail="File must be an image")
+    
+    live = await db.scalar(select(Spot.id).where(Spot.id == spot_id, Spot.deleted_at.is_(None)))
+    if live is None:
         raise HTTPException(status_code=404, detail="Spot not found")
     
-    db_image = SpotImage(
-        spot_id=spot_id,
-        uploaded_by=current_user.id,
-        **image_data.model_dump()
+    content, digest = await read_upload(file, SPOT_IMAGE_MAX_BYTES)
+    image_url = await acquire_media(db, content, digest, folder=SPOT_IMAGE_FOLDER)
+    
+    db_image = await insert_spot_image(
+        db, spot_id, uploaded_by=current_user.id, image_url=image_url, caption=caption
     )
     
-    db.add(db_image)
+    if db_image is None:
+        # Deleted meanwhile; rolling back also returns the media reference
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Spot not found")
+    
     await db.commit()
-    await db.refresh(db_image)
     
     return db_image
 
@@ -295,6 +621,10 @@ async def get_spot_images(
     db: AsyncSession = Depends(get_db)
 ):
     """Get images for a spot"""
+    live = await db.scalar(select(Spot.id).where(Spot.id == spot_id, Spot.deleted_at.is_(None)))
+    if live is None:
+        raise HTTPException(status_code=404, detail="Spot not found")
+    
     result = await db.execute(
         select(SpotImage)
         .where(SpotImage.spot_id == spot_id)
@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta, timezone
+import time
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.auth import get_current_user
+from app.core.cloudinary import (
+    sign_upload, inspect_upload, delete_image,
+    verify_local_upload, save_local_upload, sign_local_response
+)
+from app.core.media import read_upload, register_media, insert_spot_image
+from app.core.profiles import invalidate_profile, replace_avatar
+from app.core.uploads import INTENT_FOLDERS, INTENT_MAX_BYTES
+from app.models.media import UploadIntent
+from app.models.spot import Spot
+from app.models.user import User
+from app.schemas.media import UploadIntentCreate, UploadIntentResponse, UploadConfirm, UploadConfirmResponse
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+
+@router.post("/intents", response_model=UploadIntentResponse)
+async def create_upload_intent(
+    intent_data: UploadIntentCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get signed parameters for uploading an image straight to storage"""
+    if intent_data.purpose == "spot_image":
+        if intent_data.spot_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="spot_id is required for spot images"
+            )
+        live = await db.scalar(
+            select(Spot.id).where(Spot.id == intent_data.spot_id, Spot.deleted_at.is_(None))
+        )
+        if live is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Spot not found")
+    
+    folder = INTENT_FOLDERS[intent_data.purpose]
+    public_id = uuid.uuid4().hex
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=settings.UPLOAD_INTENT_TTL_SECONDS)
+    
+    intent = UploadIntent(
+        user_id=current_user.id,
+        purpose=intent_data.purpose,
+        spot_id=intent_data.spot_id if intent_data.purpose == "spot_image" else None,
+        public_id=f"{folder}/{public_id}",
+        expires_at=expires_at
+    )
+    db.add(intent)
+    await db.commit()
+    
+    return UploadIntentResponse(
+        intent_id=intent.id,
+        expires_at=expires_at,
+        **sign_upload(folder, public_id, expires_at)
+    )
+
+
+@router.post("/intents/{intent_id}/confirm", response_model=UploadConfirmResponse)
+async def confirm_upload(
+    intent_id: uuid.UUID,
+    confirm: UploadConfirm,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Record a direct upload and attach it as the avatar or a spot image"""
+    user_id = current_user.id
+    intent = await db.scalar(
+        select(UploadIntent)
+        .where(
+            UploadIntent.id == intent_id,
+            UploadIntent.user_id == user_id,
+            UploadIntent.status == "pending"
+        )
+        .with_for_update()
+    )
+    
+    if not intent:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload intent not found")
+    
+    if intent.expires_at < datetime.now(timezone.utc):
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Upload intent has expired")
+    
+    # Only storage's signed upload response proves the bytes arrived; duplicates are found
+    # by the digest of what was stored, never by one a client declares
+    uploaded = await inspect_upload(intent.public_id, confirm.version, confirm.signature, confirm.bytes)
+    if uploaded is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Nothing has been uploaded for this intent"
+        )
+    
+    max_bytes = INTENT_MAX_BYTES[intent.purpose]
+    if uploaded["bytes"] > max_bytes:
+        await delete_image(intent.public_id)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File size must be less than {max_bytes // (1024 * 1024)}MB"
+        )
+    url = await register_media(
+        db, uploaded["url"], intent.public_id, uploaded["bytes"], uploaded["sha256"]
+    )
+    
+    spot_image = None
+    if intent.purpose == "avatar":
+        await replace_avatar(db, user_id, url)
+        await invalidate_profile(db, user_id)
+    else:
+        spot_image = await insert_spot_image(
+            db, intent.spot_id, uploaded_by=user_id, image_url=url, caption=confirm.caption
+        )
+        if spot_image is None:
+            # Left pending, so the expiry job removes the upload
+            await db.rollback()
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Spot not found")
+    
+    intent.status = "completed"
+    intent.completed_at = func.now()
+    await db.commit()
+    
+    return UploadConfirmResponse(url=url, spot_image=spot_image)
+
+
+@router.post("/local")
+async def local_upload(
+    file: UploadFile = File(...),
+    public_id: str = Form(...),
+    expires: int = Form(...),
+    signature: str = Form(...)
+):
+    """Stand-in for the storage upload API when MEDIA_STORAGE=local"""
+    if settings.MEDIA_STORAGE != "local":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Local uploads are disabled")
+    
+    if not verify_local_upload(public_id, expires, signature):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired upload signature"
+        )
+    
+    content, _ = await read_upload(file, max(INTENT_MAX_BYTES.values()))
+    result = await save_local_upload(public_id, content)
+    
+    if not result["success"]:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to upload image: {result['error']}"
+        )
+    
+    # Shaped like Cloudinary's upload response, which the client passes on to confirm
+    version = int(time.time())
+    return {
+        "public_id": result["public_id"],
+        "url": result["url"],
+        "version": version,
+        "signature": sign_local_response(result["public_id"], version),
+        "bytes": len(content)
+    }
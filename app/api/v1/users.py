@@ -1,15 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, func, and_, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, insert, update, func, and_, or_
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import List, Optional
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.database import get_db, any_of
 from app.core.auth import get_current_user
-from app.core.cloudinary import upload_image, delete_image
+from app.core.counts import count_rows, set_total_headers
+from app.core.invalidation import publish, USERS_TOPIC
+from app.core.profiles import get_profile, invalidate_profile, replace_avatar
+from app.core.cloudinary import AVATAR_FOLDER
+from app.core.media import read_upload, acquire_media, reference_media_url, AVATAR_MAX_BYTES
+from app.core.lean import USER_COLUMNS, user_record, json_response
+from app.core.suggestions import get_suggestions
 from app.models.user import User
-from app.schemas.user import UserResponse, UserFullResponse, UserUpdate
+from app.schemas.user import (
+    UserResponse, UserFullResponse, UserUpdate, UserBatchRequest, UserBatchResponse,
+    SkaterSuggestionResponse
+)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -20,10 +29,12 @@ async def get_users(
     limit: int = Query(100, ge=1, le=100),
     search: Optional[str] = None,
     account_type: Optional[str] = Query(None, regex="^(skater|skateshop)$"),
+    include_total: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
     """Get users with optional filtering and pagination"""
-    query = select(User).where(User.is_active == True)
+    # Lean path: plain columns serialized directly (see app.core.lean)
+    query = select(*USER_COLUMNS).where(User.is_active == True)
     
     if search:
         search_filter = or_(
@@ -33,61 +44,62 @@ async def get_users(
         query = query.where(search_filter)
     
     if account_type:
-        query = query.where(User.account_type == account_type)
+        query = query.where(User.is_shop == (account_type == "skateshop"))
+    
+    total = await count_rows(db, query, User.id, USERS_TOPIC) if include_total else None
     
     query = query.offset(skip).limit(limit).order_by(User.created_at.desc())
     
     result = await db.execute(query)
-    users = result.scalars().all()
     
-    return users
+    response = json_response([user_record(row) for row in result.all()])
+    return set_total_headers(response, total) if total else response
+
+
+@router.post("/batch", response_model=UserBatchResponse)
+async def get_users_batch(
+    batch: UserBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get many users by ID in one query, in request order with not-found markers"""
+    result = await db.execute(
+        select(User).where(any_of(User.id, set(batch.ids)), User.is_active == True)
+    )
+    users = {user.id: user for user in result.scalars().all()}
+    
+    items = [
+        {"id": user_id, "found": user_id in users, "user": users.get(user_id)}
+        for user_id in batch.ids
+    ]
+    
+    return {"items": items}
+
+
+@router.get("/suggestions", response_model=List[SkaterSuggestionResponse])
+async def get_skater_suggestions(
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get skaters the current user may know, from sessions skated together"""
+    return json_response(await get_suggestions(db, current_user.id, limit))
 
 
 @router.get("/{user_id}", response_model=UserFullResponse)
 async def get_user(
     user_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get user by ID with full profile information"""
-    query = select(User).where(User.id == user_id, User.is_active == True)
-    
-    result = await db.execute(query)
-    user = result.scalar_one_or_none()
-    
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     # Note: Follow functionality not implemented yet (no follows table in database)
-    # For now, set is_following to False
-    if current_user:
-        user.is_following = False
-    
-    # Build response with skate setups if not a shop
-    response_data = user.__dict__.copy()
-    response_data["id"] = str(user.id)
+    profile = await get_profile(db, user_id)
     
-    if not user.is_shop:
-        from app.models.user import SkateSetup
-        setups_result = await db.execute(
-            select(SkateSetup).where(SkateSetup.user_id == user.id)
-        )
-        setups = setups_result.scalars().all()
-        response_data["skate_setups"] = [
-            {
-                "id": str(setup.id),
-                "deck_brand": setup.deck_brand,
-                "deck_size": setup.deck_size,
-                "trucks": setup.trucks,
-                "wheels": setup.wheels,
-                "bearings": setup.bearings,
-                "grip_tape": setup.grip_tape,
-                "photo_url": setup.photo_url,
-            }
-            for setup in setups
-        ]
+    if profile is None:
+        raise HTTPException(status_code=404, detail="User not found")
     
-    return response_data
+    return profile
 
 
 @router.put("/profile", response_model=UserFullResponse)
@@ -98,31 +110,44 @@ async def update_user_profile(
 ):
     """Update current user's basic profile"""
     update_data = user_update.model_dump(exclude_unset=True)
+    changed = bool(update_data)
+    user_id = current_user.id
     
-    if update_data:
-        await db.execute(
-            update(User)
-            .where(User.id == current_user.id)
-            .values(**update_data)
-        )
-        await db.commit()
-        
-        # Reload the user with skate_setups relationship
-        result = await db.execute(
-            select(User)
-            .options(selectinload(User.skate_setups))
-            .where(User.id == current_user.id)
-        )
-        updated_user = result.scalar_one()
-        return updated_user
+    if "profile_picture" in update_data:
+        # An avatar holds a reference to its image when the URL is a registered upload
+        avatar_url = update_data.pop("profile_picture")
+        if avatar_url is not None:
+            avatar_url = await reference_media_url(db, avatar_url)
+        await replace_avatar(db, user_id, avatar_url)
     
-    # If no update data, return current user with loaded skate_setups
-    result = await db.execute(
-        select(User)
-        .options(selectinload(User.skate_setups))
-        .where(User.id == current_user.id)
+    user = current_user
+    if changed:
+        # Expire the loaded user so the RETURNING row (including updated_at) repopulates it
+        db.expire(current_user)
+        if update_data:
+            user = await db.scalar(
+                update(User)
+                .where(User.id == user_id)
+                .values(**update_data)
+                .returning(User)
+            )
+        else:
+            user = await db.scalar(select(User).where(User.id == user_id))
+    
+    from app.models.user import SkateSetup
+    setups_result = await db.execute(
+        select(SkateSetup).where(SkateSetup.user_id == user.id)
     )
-    return result.scalar_one()
+    set_committed_value(user, "skate_setups", setups_result.scalars().all())
+    
+    if changed:
+        await invalidate_profile(db, user.id)
+        if update_data:
+            # Names are searchable, so listing totals may have changed
+            await publish(db, USERS_TOPIC, [user.id])
+        await db.commit()
+    
+    return user
 
 
 @router.post("/skate-setup", response_model=dict)
@@ -140,21 +165,27 @@ async def create_skate_setup(
     
     from app.models.user import SkateSetup
     
+    photo_url = setup_data.get("photo_url")
+    if photo_url:
+        photo_url = await reference_media_url(db, photo_url)
+    
     # Create new skate setup
-    setup = SkateSetup(
-        user_id=current_user.id,
-        deck_brand=setup_data.get("deck_brand", ""),
-        deck_size=setup_data.get("deck_size", ""),
-        trucks=setup_data.get("trucks", ""),
-        wheels=setup_data.get("wheels", ""),
-        bearings=setup_data.get("bearings", ""),
-        grip_tape=setup_data.get("grip_tape", ""),
-        photo_url=setup_data.get("photo_url")
+    setup = await db.scalar(
+        insert(SkateSetup)
+        .values(
+            user_id=current_user.id,
+            deck_brand=setup_data.get("deck_brand", ""),
+            deck_size=setup_data.get("deck_size", ""),
+            trucks=setup_data.get("trucks", ""),
+            wheels=setup_data.get("wheels", ""),
+            bearings=setup_data.get("bearings", ""),
+            grip_tape=setup_data.get("grip_tape", ""),
+            photo_url=photo_url
+        )
+        .returning(SkateSetup)
     )
-    
-    db.add(setup)
+    await invalidate_profile(db, current_user.id)
     await db.commit()
-    await db.refresh(setup)
     
     return {
         "id": str(setup.id),
@@ -182,48 +213,16 @@ async def upload_avatar(
             detail="File must be an image"
         )
     
-    # Check file size (5MB limit)
-    content = await file.read()
-    if len(content) > 5 * 1024 * 1024:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File size must be less than 5MB"
-        )
-    
-    # Delete old avatar if exists
-    if current_user.avatar:
-        try:
-            # Extract public_id from URL
-            old_public_id = current_user.avatar.split('/')[-1].split('.')[0]
-            if old_public_id:
-                await delete_image(f"sk8brigade/avatars/{old_public_id}")
-        except Exception:
-            pass  # Continue even if deletion fails
-    
-    # Upload new image
-    result = await upload_image(
-        content,
-        folder="sk8brigade/avatars",
-        public_id=f"user_{current_user.id}"
-    )
-    
-    if not result["success"]:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to upload image: {result['error']}"
-        )
-    
-    # Update user avatar URL
-    await db.execute(
-        update(User)
-        .where(User.id == current_user.id)
-        .values(avatar=result["url"])
-    )
+    # Hashed while read; an image already in storage is reused, not uploaded
+    content, digest = await read_upload(file, AVATAR_MAX_BYTES)
+    avatar_url = await acquire_media(db, content, digest, folder=AVATAR_FOLDER)
+    await replace_avatar(db, current_user.id, avatar_url)
+    await invalidate_profile(db, current_user.id)
     await db.commit()
     
     return {
         "message": "Avatar uploaded successfully",
-        "avatar_url": result["url"]
+        "avatar_url": avatar_url
     }
 
 
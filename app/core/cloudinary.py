@@ -1,19 +1,75 @@
-import cloudinary
-import cloudinary.uploader
+import asyncio
+import hashlib
+import hmac
+import time
+import uuid
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
 from app.core.config import settings
 
-# Configure Cloudinary
-cloudinary.config(
-    cloud_name=settings.CLOUDINARY_CLOUD_NAME,
-    api_key=settings.CLOUDINARY_API_KEY,
-    api_secret=settings.CLOUDINARY_API_SECRET
-)
+# Local storage mirrors Cloudinary's "<folder>/<public_id>.webp" layout; bytes are kept as uploaded
+LOCAL_EXTENSION = ".webp"
+
+AVATAR_FOLDER = "sk8brigade/avatars"
+SPOT_IMAGE_FOLDER = "sk8brigade/spots"
+
+# Longest side of a directly uploaded image, applied by storage as it is received
+UPLOAD_MAX_DIMENSION = 2048
+
+
+@lru_cache(maxsize=None)
+def get_uploader():
+    """Configure Cloudinary on first use and return its uploader module"""
+    # Imported here so the SDK (and its HTTP stack) stays off the cold-start path
+    import cloudinary
+    import cloudinary.uploader
+    
+    cloudinary.config(
+        cloud_name=settings.CLOUDINARY_CLOUD_NAME,
+        api_key=settings.CLOUDINARY_API_KEY,
+        api_secret=settings.CLOUDINARY_API_SECRET
+    )
+    return cloudinary.uploader
+
+
+def _local_path(public_id: str) -> Path:
+    # Resolved and checked, so ".." segments or an absolute public_id cannot leave the root
+    root = Path(settings.MEDIA_LOCAL_ROOT).resolve()
+    path = (root / f"{public_id}{LOCAL_EXTENSION}").resolve()
+    if not path.is_relative_to(root):
+        raise ValueError(f"public_id {public_id!r} is outside MEDIA_LOCAL_ROOT")
+    return path
+
+
+def _write_local(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+
+
+async def _upload_local(file_content: bytes, folder: str, public_id: str = None) -> dict:
+    full_id = f"{folder}/{public_id or uuid.uuid4().hex}"
+    try:
+        await asyncio.to_thread(_write_local, _local_path(full_id), file_content)
+    except (OSError, ValueError) as e:
+        return {"success": False, "error": str(e)}
+    
+    return {
+        "success": True,
+        "url": f"{settings.MEDIA_LOCAL_URL}/{full_id}{LOCAL_EXTENSION}",
+        "public_id": full_id
+    }
 
 
 async def upload_image(file_content: bytes, folder: str = "sk8brigade", public_id: str = None) -> dict:
     """Upload image to Cloudinary"""
+    if settings.MEDIA_STORAGE == "local":
+        return await _upload_local(file_content, folder, public_id)
+    
     try:
-        result = cloudinary.uploader.upload(
+        result = get_uploader().upload(
             file_content,
             folder=folder,
             public_id=public_id,
@@ -37,8 +93,15 @@ async def upload_image(file_content: bytes, folder: str = "sk8brigade", public_i
 
 async def delete_image(public_id: str) -> dict:
     """Delete image from Cloudinary"""
+    if settings.MEDIA_STORAGE == "local":
+        try:
+            await asyncio.to_thread(_local_path(public_id).unlink, missing_ok=True)
+        except (OSError, ValueError) as e:
+            return {"success": False, "error": str(e)}
+        return {"success": True, "result": {"result": "ok"}}
+    
     try:
-        result = cloudinary.uploader.destroy(public_id)
+        result = get_uploader().destroy(public_id)
         return {
             "success": True,
             "result": result
@@ -48,3 +111,100 @@ async def delete_image(public_id: str) -> dict:
             "success": False,
             "error": str(e)
         }
+
+
+# Direct uploads: the client sends bytes straight to storage using parameters signed here,
+# then confirms. In local mode, POST /uploads/local stands in for Cloudinary's upload API.
+
+def _local_signature(message: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), message.encode(), hashlib.sha256).hexdigest()
+
+
+def verify_local_upload(public_id: str, expires: int, signature: str) -> bool:
+    """Check the signed fields of a local stand-in upload"""
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(_local_signature(f"{public_id}:{expires}"), signature)
+
+
+def sign_local_response(public_id: str, version: int) -> str:
+    """Signature of a local stand-in upload response, like Cloudinary's over public_id and version"""
+    # Prefixed so the signature of an upload's fields never verifies as a response
+    return _local_signature(f"uploaded:{public_id}:{version}")
+
+
+async def save_local_upload(public_id: str, file_content: bytes) -> dict:
+    """Store bytes received by the local stand-in upload endpoint"""
+    folder, _, name = public_id.rpartition("/")
+    return await _upload_local(file_content, folder, name)
+
+
+def sign_upload(folder: str, public_id: str, expires_at: datetime) -> dict:
+    """Upload URL and form fields that let a client upload one image directly"""
+    if settings.MEDIA_STORAGE == "local":
+        full_id = f"{folder}/{public_id}"
+        expires = int(expires_at.timestamp())
+        return {
+            "upload_url": f"{settings.API_V1_STR}/uploads/local",
+            "fields": {
+                "public_id": full_id,
+                "expires": expires,
+                "signature": _local_signature(f"{full_id}:{expires}")
+            }
+        }
+    
+    get_uploader()
+    import cloudinary.utils
+    
+    # Cloudinary rejects signed uploads whose timestamp is over an hour old. The incoming
+    # transformation bounds what is stored, since confirm cannot see the upload's real size.
+    params = {
+        "folder": folder,
+        "public_id": public_id,
+        "format": "webp",
+        "transformation": f"c_limit,w_{UPLOAD_MAX_DIMENSION},h_{UPLOAD_MAX_DIMENSION}",
+        "timestamp": int(time.time())
+    }
+    return {
+        "upload_url": f"https://api.cloudinary.com/v1_1/{settings.CLOUDINARY_CLOUD_NAME}/image/upload",
+        "fields": {
+            **params,
+            "api_key": settings.CLOUDINARY_API_KEY,
+            "signature": cloudinary.utils.api_sign_request(params, settings.CLOUDINARY_API_SECRET)
+        }
+    }
+
+
+def _inspect_local(public_id: str) -> Optional[dict]:
+    path = _local_path(public_id)
+    if not path.is_file():
+        return None
+    content = path.read_bytes()
+    # The stand-in wrote these bytes itself, so their digest can be trusted for deduplication
+    return {
+        "url": f"{settings.MEDIA_LOCAL_URL}/{public_id}{LOCAL_EXTENSION}",
+        "bytes": len(content),
+        "sha256": hashlib.sha256(content).hexdigest()
+    }
+
+
+def _verify_cloudinary(public_id: str, version: int, signature: str, size_bytes: int) -> Optional[dict]:
+    get_uploader()
+    import cloudinary.utils
+    
+    # Checked offline; the Admin API would cost a rate-limited call per confirm
+    if not cloudinary.utils.verify_api_response_signature(public_id, version, signature):
+        return None
+    url, _ = cloudinary.utils.cloudinary_url(public_id, version=version, format="webp", secure=True)
+    # The signature does not cover the size, so it is the client's report. Cloudinary does
+    # not report a SHA-256 either, so these assets are not deduplicated.
+    return {"url": url, "bytes": size_bytes, "sha256": None}
+
+
+async def inspect_upload(public_id: str, version: int, signature: str, size_bytes: int) -> Optional[dict]:
+    """Verify a direct upload from storage's signed response: its URL, size and (when known) SHA-256"""
+    if settings.MEDIA_STORAGE == "local":
+        if not hmac.compare_digest(sign_local_response(public_id, version), signature):
+            return None
+        return await asyncio.to_thread(_inspect_local, public_id)
+    return _verify_cloudinary(public_id, version, signature, size_bytes)
@@ -34,6 +34,78 @@ class Settings(BaseSettings):
     CLOUDINARY_API_KEY: str = ""
     CLOUDINARY_API_SECRET: str = ""
     
+    # Media storage: 'cloudinary', or 'local' to write files under MEDIA_LOCAL_ROOT (development, benchmarks)
+    MEDIA_STORAGE: str = "cloudinary"
+    MEDIA_LOCAL_ROOT: str = "media"
+    MEDIA_LOCAL_URL: str = "/media"
+    # Direct uploads: clients send bytes straight to storage with short-lived signed parameters
+    UPLOAD_INTENT_TTL_SECONDS: int = 10 * 60
+    
+    # Background jobs (outbox workers run inside each API process)
+    JOB_WORKER_ENABLED: bool = True
+    JOB_WORKER_CONCURRENCY: int = 2
+    JOB_BATCH_SIZE: int = 100
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    JOB_BATCH_WINDOW_SECONDS: float = 0.2
+    JOB_PERIODIC_TICK_SECONDS: float = 60.0
+    JOB_MAX_ATTEMPTS: int = 8
+    JOB_RETRY_BASE_SECONDS: float = 5.0
+    JOB_RETRY_MAX_SECONDS: float = 15 * 60
+    JOB_RETENTION_DAYS: int = 7
+    
+    # Cross-worker cache invalidation over Postgres LISTEN/NOTIFY
+    INVALIDATION_BUS_ENABLED: bool = True
+    INVALIDATION_HEARTBEAT_SECONDS: float = 10.0
+    INVALIDATION_RECONNECT_MAX_SECONDS: float = 30.0
+    
+    # Listing totals (include_total=true on GET /spots/ and /users/)
+    COUNT_EXACT_LIMIT: int = 1000  # Larger totals are reported as planner estimates
+    COUNT_CACHE_SECONDS: float = 30.0
+    
+    # Location searches rank at most this many bounding-box candidates by exact distance;
+    # searches matching more are refused
+    GEO_CANDIDATE_LIMIT: int = 100_000
+    
+    # Skater suggestions (GET /users/suggestions)
+    SKATER_SUGGESTIONS_PER_USER: int = 50
+    SKATER_SUGGESTIONS_REBUILD_SECONDS: int = 24 * 60 * 60
+    SESSION_COMPLETION_SWEEP_SECONDS: int = 5 * 60
+    
+    # User profiles (GET /users/{id}, /auth/me)
+    PROFILE_CACHE_SECONDS: float = 30.0
+    
+    # Notifications
+    NOTIFICATION_UNREAD_CACHE_SECONDS: float = 30.0
+    
+    # Spot delta sync
+    SYNC_SETTLE_SECONDS: int = 10  # Changes newer than this are held back until in-flight writes commit
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 90
+    
+    # Spot deletion (children are purged in batches by a background job)
+    SPOT_PURGE_BATCH_SIZE: int = 1000
+    
+    # Trending spots
+    TRENDING_REFRESH_SECONDS: int = 15 * 60
+    TRENDING_WINDOW_DAYS: int = 30
+    TRENDING_HALF_LIFE_HOURS: float = 72.0
+    TRENDING_CELL_ZOOM: int = 6  # Tiles at zoom 6 are roughly 600 km across
+    TRENDING_TOP_K: int = 50
+    
+    # Load shedding (starting concurrency per route class; limits adapt to latency)
+    LOAD_SHEDDING_ENABLED: bool = True
+    LIMIT_AUTH_CONCURRENCY: int = 4  # bcrypt is CPU bound
+    LIMIT_SEARCH_CONCURRENCY: int = 8
+    LIMIT_WRITE_CONCURRENCY: int = 8
+    LIMIT_READ_CONCURRENCY: int = 32
+    LIMIT_MAX_MULTIPLIER: float = 4.0
+    LOGIN_ATTEMPTS_PER_IP_PER_MINUTE: int = 20
+    LOGIN_ATTEMPTS_PER_ACCOUNT_PER_MINUTE: int = 5
+    TRUSTED_PROXY_HOPS: int = 0  # Reverse proxies in front of the app that append to X-Forwarded-For
+    
+    # Startup (pre-warm opens pool connections and loads crypto backends before serving)
+    PREWARM_ENABLED: bool = False
+    PREWARM_POOL_CONNECTIONS: int = 2
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,73 @@
+import json
+from typing import Tuple
+
+from fastapi import Response
+from sqlalchemy import select, func, Select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.invalidation import subscribe, SPOTS_TOPIC, USERS_TOPIC
+
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_ACCURACY_HEADER = "X-Total-Count-Accuracy"
+EXACT = "exact"
+ESTIMATE = "estimate"
+
+# Listing totals are optional metadata. Up to COUNT_EXACT_LIMIT matching rows are counted
+# exactly; past that the count stops and the planner's row estimate is reported instead, so
+# a broad filter never costs a full COUNT(*). Results are cached briefly per filter.
+
+# Each listing has its own cache, cleared by writes to the table it lists; a cleared
+# cache only costs one recount per filter
+count_caches = {
+    topic: TTLCache(f"{topic}.counts", ttl_seconds=settings.COUNT_CACHE_SECONDS)
+    for topic in (SPOTS_TOPIC, USERS_TOPIC)
+}
+
+for _topic, _cache in count_caches.items():
+    subscribe(_topic, lambda keys, cache=_cache: cache.clear())
+
+
+def _compile(connection: AsyncConnection, query: Select) -> Tuple[str, tuple]:
+    # Compiled for the driver with its positional parameters, so filter values never
+    # become part of the SQL text
+    compiled = query.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.construct_params()
+    return compiled.string, tuple(params[name] for name in compiled.positiontup)
+
+
+async def _planner_estimate(connection: AsyncConnection, sql: str, params: tuple) -> int:
+    plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}", params)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(db: AsyncSession, query: Select, key_column, topic: str) -> Tuple[int, str]:
+    """Total rows matching a listing query (without its paging), and how accurate it is"""
+    rows = query.with_only_columns(key_column).order_by(None).limit(None).offset(None)
+    connection = await db.connection()
+    cache_key = _compile(connection, rows)
+    count_cache = count_caches[topic]
+    cached = count_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    limit = settings.COUNT_EXACT_LIMIT
+    counted = await db.scalar(select(func.count()).select_from(rows.limit(limit + 1).subquery()))
+    if counted <= limit:
+        total = (counted, EXACT)
+    else:
+        # The estimate can undershoot, but never below what was already counted
+        total = (max(await _planner_estimate(connection, *cache_key), counted), ESTIMATE)
+
+    count_cache.set(cache_key, total)
+    return total
+
+
+def set_total_headers(response: Response, total: Tuple[int, str]) -> Response:
+    count, accuracy = total
+    response.headers[TOTAL_COUNT_HEADER] = str(count)
+    response.headers[TOTAL_ACCURACY_HEADER] = accuracy
+    return response
@@ -1,24 +1,54 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import asyncio
+
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import MetaData
-from typing import AsyncGenerator
+from sqlalchemy import MetaData, any_, literal, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from typing import AsyncGenerator, Awaitable, Callable, Iterable, Optional, TypeVar
 
 from app.core.config import settings
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
-    pool_pre_ping=True
-)
+# The engine and session factory are built on first use rather than at import,
+# which keeps the database driver off the cold-start path
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker] = None
+
+
+def get_engine() -> AsyncEngine:
+    """Get the async engine, creating it on first use"""
+    global _engine
+    if _engine is None:
+        _engine = create_async_engine(
+            settings.DATABASE_URL,
+            echo=settings.DEBUG,
+            future=True,
+            pool_pre_ping=True
+        )
+    return _engine
+
+
+def get_sessionmaker() -> async_sessionmaker:
+    """Get the session factory, creating it on first use"""
+    global _sessionmaker
+    if _sessionmaker is None:
+        _sessionmaker = async_sessionmaker(
+            get_engine(),
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+    return _sessionmaker
 
-# Create async session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False
-)
+
+def AsyncSessionLocal() -> AsyncSession:
+    """Create a session (kept callable under its old name for existing call sites)"""
+    return get_sessionmaker()()
+
+
+def __getattr__(name: str):
+    # `from app.core.database import engine` keeps working without an import-time engine
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Base(DeclarativeBase):
@@ -34,7 +64,33 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+T = TypeVar("T")
+
+
+async def run_in_session(fn: Callable[[AsyncSession], Awaitable[T]]) -> T:
+    """Run fn on its own pooled connection so it can overlap with other queries"""
+    async with AsyncSessionLocal() as session:
+        return await fn(session)
+
+
+def any_of(column, values: Iterable):
+    """Build `column = ANY(:values)`, binding every value as a single array parameter"""
+    return column == any_(literal(list(values), ARRAY(column.type)))
+
+
+async def prewarm_pool(connections: int) -> None:
+    """Open pool connections up front so the first requests skip connection setup"""
+    engine = get_engine()
+    # All connections are held open together so the pool keeps distinct ones
+    opened = await asyncio.gather(*(engine.connect().start() for _ in range(connections)))
+    try:
+        for conn in opened:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        await asyncio.gather(*(conn.close() for conn in opened))
+
+
 async def create_tables():
     """Create database tables"""
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
@@ -0,0 +1,47 @@
+import math
+from typing import Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Web Mercator cannot represent the poles; tiles stop at this latitude
+MAX_MERCATOR_LATITUDE = 85.05112878
+
+
+def clamp_latitude(latitude: float) -> float:
+    return max(-MAX_MERCATOR_LATITUDE, min(MAX_MERCATOR_LATITUDE, latitude))
+
+
+def lonlat_to_tile(latitude: float, longitude: float, zoom: int) -> Tuple[int, int]:
+    """Return the slippy-map tile (x, y) containing a point at the given zoom"""
+    n = 1 << zoom
+    lat_rad = math.radians(clamp_latitude(latitude))
+    x = int((longitude + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bounds(zoom: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """Return (min_lat, min_lon, max_lat, max_lon) of a slippy-map tile"""
+    n = 1 << zoom
+    min_lon = x / n * 360.0 - 180.0
+    max_lon = (x + 1) / n * 360.0 - 180.0
+    max_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    min_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return min_lat, min_lon, max_lat, max_lon
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """Return (min_lat, min_lon, max_lat, max_lon) of a box enclosing a radius"""
+    # Convert km to degrees (rough approximation)
+    lat_delta = radius_km / 111.0  # 1 degree lat ≈ 111 km
+    lon_delta = radius_km / (111.0 * max(math.cos(math.radians(latitude)), 0.01))
+    return latitude - lat_delta, longitude - lon_delta, latitude + lat_delta, longitude + lon_delta
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
@@ -0,0 +1,230 @@
+"""
+Exact distance ranking for location searches.
+
+SQL narrows spots to bounding boxes, which also match corners outside the real radius.
+This stage reads only (id, latitude, longitude) for those candidates and computes
+great-circle distances over NumPy arrays. It drops anything outside the radius and
+keeps the nearest k. Full rows are then loaded for just those k spots.
+
+Route searches work the same way. Each group of route segments contributes one box, and
+candidates are measured only against the segments of boxes they fall in, in a local flat
+projection. At city scale that projection is accurate to a few metres, so routes are
+limited to ROUTE_MAX_LENGTH_KM (see app.schemas.spot).
+
+SQL returns at most GEO_CANDIDATE_LIMIT candidates in no particular order, so a search
+matching more is refused rather than ranked from an arbitrary subset.
+
+NumPy is imported with this module, so routers import it inside the handler to keep it
+off the cold-start path.
+"""
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Select, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.counts import EXACT
+from app.core.geo import EARTH_RADIUS_KM, bounding_box
+from app.core.lean import load_spot_records
+from app.models.spot import Spot
+
+Point = Tuple[float, float]
+
+# One SQL box per group of consecutive segments, so long routes stay a bounded OR
+ROUTE_MAX_BOXES = 64
+
+
+def _haversine_terms(latitudes: np.ndarray, longitudes: np.ndarray, point: Point, cos_lat: np.ndarray) -> np.ndarray:
+    # The haversine "a" term; distance grows with it, so minimums can be taken before asin
+    lat, lon = np.radians(point[0]), np.radians(point[1])
+    d_lat = latitudes - lat
+    d_lon = longitudes - lon
+    return np.sin(d_lat / 2) ** 2 + np.cos(lat) * cos_lat * np.sin(d_lon / 2) ** 2
+
+
+def nearest_distances(latitudes, longitudes, points: Sequence[Point]) -> np.ndarray:
+    """Great-circle distance in km from each candidate to its nearest query point"""
+    latitudes = np.radians(np.asarray(latitudes, dtype=np.float64))
+    longitudes = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_lat = np.cos(latitudes)
+
+    # One vectorized pass per point keeps memory at O(candidates) for multi-point queries
+    terms = _haversine_terms(latitudes, longitudes, points[0], cos_lat)
+    for point in points[1:]:
+        np.minimum(terms, _haversine_terms(latitudes, longitudes, point, cos_lat), out=terms)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(terms, 0.0, 1.0)))
+
+
+def rank_within(latitudes, longitudes, points: Sequence[Point], radius_km: float, k: int) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Indices of the k candidates nearest to any point within radius_km, their distances, and how many were in range"""
+    distances = nearest_distances(latitudes, longitudes, points)
+    within = np.flatnonzero(distances <= radius_km)
+    in_range = len(within)
+
+    if 0 < k < in_range:
+        # Partial selection is O(n); only the k survivors are fully sorted
+        within = within[np.argpartition(distances[within], k - 1)[:k]]
+    elif k <= 0:
+        within = within[:0]
+
+    order = within[np.argsort(distances[within], kind="stable")]
+    return order, distances[order], in_range
+
+
+def within_boxes(points: Sequence[Point], radius_km: float):
+    """SQL filter for spots inside the bounding box of any point's radius"""
+    boxes = []
+    for latitude, longitude in points:
+        min_lat, min_lon, max_lat, max_lon = bounding_box(latitude, longitude, radius_km)
+        boxes.append(and_(
+            Spot.latitude.between(min_lat, max_lat),
+            Spot.longitude.between(min_lon, max_lon)
+        ))
+    return or_(*boxes)
+
+
+def _project(latitudes: np.ndarray, longitudes: np.ndarray, origin_latitude: float) -> Tuple[np.ndarray, np.ndarray]:
+    # Equirectangular projection to km around the route's mean latitude
+    scale = np.radians(EARTH_RADIUS_KM)
+    return longitudes * scale * np.cos(np.radians(origin_latitude)), latitudes * scale
+
+
+def _segment_groups(segments: int) -> range:
+    return range(0, segments, -(-segments // ROUTE_MAX_BOXES))
+
+
+def route_positions(latitudes, longitudes, route: Sequence[Point], corridor_km: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Distance in km from each candidate to a route, and how far along the route its closest point lies
+
+    Only candidates inside a segment group's corridor-padded box are measured against that
+    group; the distance of any candidate outside every box is inf.
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    route_lat = np.array([point[0] for point in route], dtype=np.float64)
+    route_lon = np.array([point[1] for point in route], dtype=np.float64)
+
+    origin = float(route_lat.mean())
+    px, py = _project(latitudes, longitudes, origin)
+    rx, ry = _project(route_lat, route_lon, origin)
+
+    ax, ay = rx[:-1], ry[:-1]
+    dx, dy = rx[1:] - ax, ry[1:] - ay
+    length_sq = dx * dx + dy * dy
+    lengths = np.sqrt(length_sq)
+    starts = np.concatenate(([0.0], np.cumsum(lengths)[:-1]))
+    # Repeated vertices give zero-length segments; their projection is the vertex itself
+    safe_length_sq = np.where(length_sq > 0, length_sq, 1.0)
+
+    distances = np.full(len(px), np.inf)
+    along = np.zeros(len(px))
+    groups = _segment_groups(len(ax))
+    for first in groups:
+        group = slice(first, first + groups.step)
+        gx, gy = rx[first:first + groups.step + 1], ry[first:first + groups.step + 1]
+        inside = np.flatnonzero(
+            (px >= gx.min() - corridor_km) & (px <= gx.max() + corridor_km)
+            & (py >= gy.min() - corridor_km) & (py <= gy.max() + corridor_km)
+        )
+        if not len(inside):
+            continue
+
+        bx, by = px[inside, None], py[inside, None]
+        sx, sy, sdx, sdy = ax[group], ay[group], dx[group], dy[group]
+        t = np.clip(((bx - sx) * sdx + (by - sy) * sdy) / safe_length_sq[group], 0.0, 1.0)
+        gap_sq = (bx - (sx + t * sdx)) ** 2 + (by - (sy + t * sdy)) ** 2
+
+        nearest = np.argmin(gap_sq, axis=1)
+        rows = np.arange(len(inside))
+        gap = np.sqrt(gap_sq[rows, nearest])
+        # Strictly closer only, so a tie keeps the earlier position along the route
+        closer = gap < distances[inside]
+        distances[inside[closer]] = gap[closer]
+        along[inside[closer]] = (starts[group][nearest] + t[rows, nearest] * lengths[group][nearest])[closer]
+    return distances, along
+
+
+def along_route_boxes(route: Sequence[Point], corridor_km: float):
+    """SQL filter for spots inside the corridor-padded bounding box of any group of route segments"""
+    groups = _segment_groups(len(route) - 1)
+    boxes = []
+    for first in groups:
+        vertices = route[first:first + groups.step + 1]
+        corners = [bounding_box(latitude, longitude, corridor_km) for latitude, longitude in vertices]
+        boxes.append(and_(
+            Spot.latitude.between(min(c[0] for c in corners), max(c[2] for c in corners)),
+            Spot.longitude.between(min(c[1] for c in corners), max(c[3] for c in corners))
+        ))
+    return or_(*boxes)
+
+
+class TooManyCandidates(ValueError):
+    pass
+
+
+async def _candidates(db: AsyncSession, query: Select, too_many: str):
+    limit = settings.GEO_CANDIDATE_LIMIT
+    result = await db.execute(
+        query.with_only_columns(Spot.id, Spot.latitude, Spot.longitude)
+        .order_by(None).offset(None).limit(limit + 1)
+    )
+    rows = result.all()
+    if len(rows) > limit:
+        raise TooManyCandidates(too_many)
+    return tuple(zip(*rows)) if rows else ((), (), ())
+
+
+async def _load_ordered(db: AsyncSession, ids: Sequence, order: np.ndarray, **fields: np.ndarray) -> List[Dict[str, Any]]:
+    records = await load_spot_records(db, [ids[i] for i in order])
+    spots = []
+    for position, index in enumerate(order.tolist()):
+        spot = records.get(ids[index])
+        if spot is not None:
+            for name, values in fields.items():
+                spot[name] = round(float(values[position]), 3)
+            spots.append(spot)
+    return spots
+
+
+async def spots_along_route(
+    db: AsyncSession,
+    query: Select,
+    route: Sequence[Point],
+    corridor_km: float,
+    limit: int
+) -> List[Dict[str, Any]]:
+    """Spot records within corridor_km of a route, in the order the route passes them"""
+    ids, latitudes, longitudes = await _candidates(
+        db, query, "Too many spots along the route, please use a shorter route or a narrower corridor"
+    )
+    if not ids:
+        return []
+
+    distances, along = route_positions(latitudes, longitudes, route, corridor_km)
+    within = np.flatnonzero(distances <= corridor_km)
+    # Ordered by position along the route, then by distance from it
+    order = within[np.lexsort((distances[within], along[within]))][:limit]
+    return await _load_ordered(
+        db, ids, order, distance_km=distances[order], along_route_km=along[order]
+    )
+
+
+async def nearest_spots(
+    db: AsyncSession,
+    query: Select,
+    points: Sequence[Point],
+    radius_km: float,
+    limit: int,
+    skip: int = 0
+) -> Tuple[List[Dict[str, Any]], Tuple[int, str]]:
+    """Spot records for a filtered query, nearest first, with distance_km and the total in range"""
+    ids, latitudes, longitudes = await _candidates(
+        db, query, "Too many spots in the search area, please search a smaller area"
+    )
+    if not ids:
+        return [], (0, EXACT)
+
+    order, distances, in_range = rank_within(latitudes, longitudes, points, radius_km, skip + limit)
+    spots = await _load_ordered(db, ids, order[skip:], distance_km=distances[skip:])
+    return spots, (in_range, EXACT)
@@ -0,0 +1,28 @@
+import hashlib
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(content: bytes) -> str:
+    return '"' + hashlib.blake2b(content, digest_size=16).hexdigest() + '"'
+
+
+def conditional_response(
+    request: Request,
+    content: bytes,
+    media_type: str,
+    etag: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Build a response with an ETag, answering 304 when the client copy is current"""
+    etag = etag or make_etag(content)
+    response_headers = {"ETag": etag, **(headers or {})}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        if etag in candidates or f"W/{etag}" in candidates or "*" in candidates:
+            return Response(status_code=304, headers=response_headers)
+
+    return Response(content=content, media_type=media_type, headers=response_headers)
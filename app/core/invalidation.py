@@ -0,0 +1,154 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import all_caches, get_cache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Every worker keeps its own in-process caches. Writers publish invalidations with
+# pg_notify inside their transaction, so Postgres delivers them to all listening
+# workers exactly when (and only if) the write commits. A topic names a TTLCache, whose
+# keys are dropped, and/or subscribers registered with subscribe().
+
+CHANNEL = "cache_invalidation"
+SPOTS_TOPIC = "spots"
+USERS_TOPIC = "users"
+
+# NOTIFY payloads are capped at 8000 bytes; larger key lists clear the whole topic
+MAX_PAYLOAD_BYTES = 7000
+RECONNECT_BASE_SECONDS = 0.5
+
+_PENDING_KEY = "pending_invalidations"
+
+Subscriber = Callable[[Optional[List[str]]], None]
+_subscribers: Dict[str, List[Subscriber]] = defaultdict(list)
+
+
+def subscribe(topic: str, callback: Subscriber) -> None:
+    """Call callback(keys) for each event on topic; keys is None when everything is stale"""
+    _subscribers[topic].append(callback)
+
+
+def dispatch(topic: str, keys: Optional[List[str]]) -> None:
+    """Apply an invalidation to this process"""
+    cache = get_cache(topic)
+    if cache is not None:
+        if keys is None:
+            cache.clear()
+        else:
+            for key in keys:
+                cache.invalidate(key)
+
+    for callback in _subscribers.get(topic, ()):
+        try:
+            callback(keys)
+        except Exception:
+            logger.exception("Invalidation subscriber for %s failed", topic)
+
+
+def flush_all() -> None:
+    """Drop everything cached in this process, for when events may have been missed"""
+    for topic in set(all_caches()) | set(_subscribers):
+        dispatch(topic, None)
+
+
+async def publish(db: AsyncSession, topic: str, keys: Iterable) -> None:
+    """Invalidate keys on every worker once db's transaction commits"""
+    keys = [str(key) for key in keys]
+    payload = json.dumps({"topic": topic, "keys": keys})
+    if len(payload) > MAX_PAYLOAD_BYTES:
+        keys = None
+        payload = json.dumps({"topic": topic, "keys": None})
+
+    await db.execute(select(func.pg_notify(CHANNEL, payload)))
+    # This worker applies it on commit without waiting for its own notification
+    db.info.setdefault(_PENDING_KEY, []).append((topic, keys))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    for topic, keys in session.info.pop(_PENDING_KEY, ()):
+        dispatch(topic, keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _listen_dsn() -> str:
+    # asyncpg takes a plain postgresql:// DSN
+    url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+class InvalidationBus:
+    """Background LISTEN connection delivering other workers' invalidations"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.connected = False
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+            dispatch(event["topic"], event["keys"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed invalidation %r", payload)
+
+    async def _run(self) -> None:
+        import asyncpg
+
+        delay = RECONNECT_BASE_SECONDS
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(_listen_dsn())
+                await connection.add_listener(CHANNEL, self._on_notify)
+                # Writes committed while nobody was listening were never delivered here
+                flush_all()
+                self.connected = True
+                delay = RECONNECT_BASE_SECONDS
+                logger.info("Listening for cache invalidations")
+
+                # A silent network drop only shows up when the connection is used
+                while True:
+                    await asyncio.sleep(settings.INVALIDATION_HEARTBEAT_SECONDS)
+                    await asyncio.wait_for(
+                        connection.fetchval("SELECT 1"),
+                        timeout=settings.INVALIDATION_HEARTBEAT_SECONDS
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Invalidation listener lost its connection (%s); retrying in %.1fs", e, delay)
+            finally:
+                self.connected = False
+                if connection is not None:
+                    connection.terminate()
+
+            # Until the listener is back, cached entries cannot be trusted
+            flush_all()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.INVALIDATION_RECONNECT_MAX_SECONDS)
+
+
+bus = InvalidationBus()
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import zlib
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update, delete, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.outbox import OutboxJob
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[AsyncSession, List[dict]], Awaitable[None]]
+PeriodicJob = Callable[[AsyncSession], Awaitable[None]]
+
+_handlers: Dict[str, JobHandler] = {}
+_periodic_jobs: Dict[str, Tuple[float, PeriodicJob]] = {}
+
+PERIODIC_TOPIC_PREFIX = "periodic:"
+
+
+def job_handler(topic: str):
+    """Register a batch handler for an outbox topic"""
+    def decorator(fn: JobHandler) -> JobHandler:
+        _handlers[topic] = fn
+        return fn
+    return decorator
+
+
+def periodic_job(name: str, interval_seconds: float):
+    """Register a job that runs at most once per interval across all workers"""
+    def decorator(fn: PeriodicJob) -> PeriodicJob:
+        _periodic_jobs[name] = (interval_seconds, fn)
+        return fn
+    return decorator
+
+
+def enqueue_job(db: AsyncSession, topic: str, payload: dict, delay_seconds: float = 0) -> OutboxJob:
+    """Add a job to the outbox; workers only see it once the caller commits"""
+    job = OutboxJob(topic=topic, payload=payload, status="pending", attempts=0)
+    if delay_seconds:
+        job.available_at = func.now() + timedelta(seconds=delay_seconds)
+
+    db.add(job)
+    worker.wake()
+    return job
+
+
+def _retry_delay(attempts: int) -> float:
+    return min(settings.JOB_RETRY_BASE_SECONDS * (2 ** attempts), settings.JOB_RETRY_MAX_SECONDS)
+
+
+class JobWorker:
+    """In-process asyncio workers draining the outbox table"""
+
+    def __init__(self):
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        for _ in range(settings.JOB_WORKER_CONCURRENCY):
+            self._tasks.append(asyncio.create_task(self._run_queue()))
+        for name, (interval, fn) in _periodic_jobs.items():
+            self._tasks.append(asyncio.create_task(self._run_periodic(name, interval, fn)))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+
+    async def _run_queue(self) -> None:
+        while True:
+            try:
+                processed = await self.process_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Job worker iteration failed")
+                processed = 0
+
+            # A full batch means more work is probably waiting
+            if processed >= settings.JOB_BATCH_SIZE:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.JOB_POLL_INTERVAL_SECONDS)
+                # Let concurrent writers commit so their jobs land in the same batch
+                await asyncio.sleep(settings.JOB_BATCH_WINDOW_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def process_batch(self) -> int:
+        """Claim and run one batch of due jobs, returning how many were claimed"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(OutboxJob.id, OutboxJob.topic, OutboxJob.payload, OutboxJob.attempts)
+                .where(
+                    OutboxJob.status == "pending",
+                    OutboxJob.available_at <= func.now()
+                )
+                .order_by(OutboxJob.id)
+                .limit(settings.JOB_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )
+            jobs = result.all()
+
+            if not jobs:
+                return 0
+
+            by_topic: Dict[str, list] = {}
+            for job in jobs:
+                by_topic.setdefault(job.topic, []).append(job)
+
+            for topic, topic_jobs in by_topic.items():
+                await self._dispatch(db, topic, topic_jobs)
+
+            await db.commit()
+            return len(jobs)
+
+    async def _dispatch(self, db: AsyncSession, topic: str, jobs: list) -> None:
+        handler = _handlers.get(topic)
+        if handler is None:
+            for job in jobs:
+                await self._mark_failed(db, job, f"No handler registered for topic '{topic}'")
+            return
+
+        try:
+            async with db.begin_nested():
+                await handler(db, [job.payload for job in jobs])
+        except Exception as e:
+            if len(jobs) == 1:
+                logger.warning("Job %s (%s) failed: %s", jobs[0].id, topic, e)
+                await self._mark_failed(db, jobs[0], str(e))
+                return
+
+            # Retry one by one so a single bad payload cannot hold back the batch
+            for job in jobs:
+                await self._dispatch(db, topic, [job])
+            return
+
+        await db.execute(
+            update(OutboxJob)
+            .where(OutboxJob.id.in_([job.id for job in jobs]))
+            .values(status="done", processed_at=func.now())
+        )
+
+    async def _mark_failed(self, db: AsyncSession, job, error: str) -> None:
+        attempts = job.attempts + 1
+        exhausted = attempts >= settings.JOB_MAX_ATTEMPTS
+
+        await db.execute(
+            update(OutboxJob)
+            .where(OutboxJob.id == job.id)
+            .values(
+                attempts=attempts,
+                last_error=error[:2000],
+                status="failed" if exhausted else "pending",
+                available_at=func.now() + timedelta(seconds=_retry_delay(attempts))
+            )
+        )
+
+    async def _run_periodic(self, name: str, interval: float, fn: PeriodicJob) -> None:
+        lock_key = zlib.crc32(name.encode())
+        topic = PERIODIC_TOPIC_PREFIX + name
+
+        while True:
+            await asyncio.sleep(min(interval, settings.JOB_PERIODIC_TICK_SECONDS))
+            try:
+                async with AsyncSessionLocal() as db:
+                    # Only one worker process runs a given periodic job at a time
+                    locked = await db.execute(
+                        text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": lock_key}
+                    )
+                    if not locked.scalar():
+                        continue
+
+                    # The last completed run is recorded in the outbox itself
+                    recent_run = await db.execute(
+                        select(OutboxJob.id)
+                        .where(
+                            OutboxJob.topic == topic,
+                            OutboxJob.processed_at > func.now() - timedelta(seconds=interval)
+                        )
+                        .limit(1)
+                    )
+                    if recent_run.first() is not None:
+                        continue
+
+                    await fn(db)
+                    db.add(OutboxJob(
+                        topic=topic,
+                        payload={},
+                        status="done",
+                        attempts=1,
+                        processed_at=func.now()
+                    ))
+                    await db.commit()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Periodic job %s failed", name)
+
+
+worker = JobWorker()
+
+
+@periodic_job("outbox.prune", interval_seconds=6 * 60 * 60)
+async def prune_outbox(db: AsyncSession) -> None:
+    """Drop processed jobs older than the retention window"""
+    await db.execute(
+        delete(OutboxJob).where(
+            OutboxJob.status == "done",
+            OutboxJob.processed_at < func.now() - timedelta(days=settings.JOB_RETENTION_DAYS)
+        )
+    )
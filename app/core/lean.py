@@ -0,0 +1,82 @@
+from typing import Any, Dict, Iterable, List, Sequence, Type
+
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import any_of
+from app.models.spot import Spot
+from app.models.user import User
+from app.schemas.spot import SpotResponse
+from app.schemas.user import UserResponse, UserSummary
+
+# List endpoints select plain columns and serialize the rows directly, skipping ORM
+# identity-map bookkeeping and per-row Pydantic validation. The column lists are
+# derived from the response schemas so both paths emit the same fields.
+
+HISTOGRAM_COLUMNS = [getattr(Spot, f"rating_{stars}_count") for stars in range(1, 6)]
+
+
+def schema_columns(model, schema: Type[BaseModel]) -> List[Any]:
+    """Model columns backing the schema's fields, in schema order"""
+    table_columns = model.__table__.c
+    return [getattr(model, name) for name in schema.model_fields if name in table_columns]
+
+
+SPOT_COLUMNS = schema_columns(Spot, SpotResponse) + HISTOGRAM_COLUMNS
+SPOT_FIELDS = list(SpotResponse.model_fields)
+USER_COLUMNS = schema_columns(User, UserResponse)
+USER_SUMMARY_COLUMNS = schema_columns(User, UserSummary)
+
+
+def spot_record(row) -> Dict[str, Any]:
+    values = dict(row._mapping)
+    values["rating_histogram"] = {
+        stars: values[f"rating_{stars}_count"] or 0 for stars in range(1, 6)
+    }
+    # Schema field order, so the JSON matches what the response model would produce
+    return {name: values[name] for name in SPOT_FIELDS}
+
+
+def user_record(row) -> Dict[str, Any]:
+    return dict(row._mapping)
+
+
+async def load_user_summaries(db: AsyncSession, user_ids: Iterable) -> Dict[Any, Dict[str, Any]]:
+    """Fetch UserSummary-shaped dicts for many users in one query"""
+    ids = set(user_ids)
+    if not ids:
+        return {}
+    result = await db.execute(select(*USER_SUMMARY_COLUMNS).where(any_of(User.id, ids)))
+    return {row.id: dict(row._mapping) for row in result.all()}
+
+
+async def load_spot_records(db: AsyncSession, spot_ids: Iterable) -> Dict[Any, Dict[str, Any]]:
+    """Fetch SpotResponse-shaped dicts for many live spots in one query"""
+    ids = set(spot_ids)
+    if not ids:
+        return {}
+    result = await db.execute(
+        select(*SPOT_COLUMNS).where(any_of(Spot.id, ids), Spot.deleted_at.is_(None))
+    )
+    return {row.id: spot_record(row) for row in result.all()}
+
+
+async def spot_list_response(
+    db: AsyncSession, spots: List[Dict[str, Any]], include_creator: bool
+) -> Response:
+    """Serialize spot records as SpotListItem, loading creators in one query if requested"""
+    creators = {}
+    if include_creator:
+        creators = await load_user_summaries(db, (spot["creator_id"] for spot in spots))
+    for spot in spots:
+        spot["creator"] = creators.get(spot["creator_id"])
+        spot.setdefault("distance_km", None)
+    return json_response(spots)
+
+
+def json_response(records: Sequence[Dict[str, Any]]) -> Response:
+    """Serialize records (UUIDs and datetimes as Pydantic would) without a response model pass"""
+    return Response(content=to_json(records), media_type="application/json")
@@ -0,0 +1,230 @@
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+# Exponential moving average weight of the newest latency sample
+LATENCY_EWMA_ALPHA = 0.2
+# Multiplicative decrease applied when latency runs over target
+BACKOFF_RATIO = 0.9
+
+API_PREFIX = settings.API_V1_STR
+
+# GET endpoints whose cost grows with the filters rather than a primary key lookup
+SEARCH_PATHS = {
+    f"{API_PREFIX}/spots/",
+    f"{API_PREFIX}/spots/clusters",
+    f"{API_PREFIX}/users/",
+}
+
+# Read-only searches that take their query as a JSON body
+SEARCH_POST_PATHS = {
+    f"{API_PREFIX}/spots/nearby",
+    f"{API_PREFIX}/spots/along-route",
+}
+
+
+class AdaptiveLimit:
+    """Concurrency limit for one route class, adjusted AIMD-style from observed latency"""
+
+    def __init__(self, name: str, initial: int, target_latency: float):
+        self.name = name
+        self.limit = float(initial)
+        self.min_limit = 1.0
+        self.max_limit = float(initial) * settings.LIMIT_MAX_MULTIPLIER
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self.latency: Optional[float] = None
+        self.accepted = 0
+        self.rejected = 0
+        self._last_decrease = 0.0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            self.rejected += 1
+            return False
+        self.in_flight += 1
+        self.accepted += 1
+        return True
+
+    def release(self, latency: float) -> None:
+        busy = self.in_flight * 2 >= self.limit
+        self.in_flight -= 1
+
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += LATENCY_EWMA_ALPHA * (latency - self.latency)
+
+        now = time.monotonic()
+        if self.latency > self.target_latency:
+            # Back off at most once per target window so one slow burst counts once
+            if now - self._last_decrease >= self.target_latency:
+                self.limit = max(self.min_limit, self.limit * BACKOFF_RATIO)
+                self._last_decrease = now
+        elif busy:
+            # Only grow a limit that is actually being used
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.latency or 1))
+
+
+class TokenBucket:
+    """Per-key token buckets; acquire() returns 0 when allowed, else seconds until a token"""
+
+    def __init__(self, name: str, per_minute: int, max_keys: int = 100000):
+        self.name = name
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.max_keys = max_keys
+        self.rejected = 0
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def acquire(self, key: str) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            self.rejected += 1
+            return (1 - tokens) / self.rate
+
+        if key not in self._buckets and len(self._buckets) >= self.max_keys:
+            self._prune(now)
+        self._buckets[key] = (tokens - 1, now)
+        return 0.0
+
+    def _prune(self, now: float) -> None:
+        # A bucket that has refilled completely behaves the same as a missing one
+        self._buckets = {
+            key: (tokens, updated)
+            for key, (tokens, updated) in self._buckets.items()
+            if tokens + (now - updated) * self.rate < self.capacity
+        }
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+route_limits = {
+    "auth": AdaptiveLimit("auth", settings.LIMIT_AUTH_CONCURRENCY, target_latency=0.5),
+    "search": AdaptiveLimit("search", settings.LIMIT_SEARCH_CONCURRENCY, target_latency=0.5),
+    "write": AdaptiveLimit("write", settings.LIMIT_WRITE_CONCURRENCY, target_latency=0.3),
+    "read": AdaptiveLimit("read", settings.LIMIT_READ_CONCURRENCY, target_latency=0.2),
+}
+
+login_ip_buckets = TokenBucket("ip", settings.LOGIN_ATTEMPTS_PER_IP_PER_MINUTE)
+login_account_buckets = TokenBucket("account", settings.LOGIN_ATTEMPTS_PER_ACCOUNT_PER_MINUTE)
+
+
+def classify_route(method: str, path: str) -> Optional[str]:
+    """Map a request to its route class (None for routes outside the API)"""
+    if not path.startswith(API_PREFIX):
+        return None
+    if path.startswith(f"{API_PREFIX}/auth/") and method == "POST":
+        return "auth"  # Password hashing dominates login and register
+    if method in ("GET", "HEAD"):
+        return "search" if path in SEARCH_PATHS else "read"
+    if method == "OPTIONS":
+        return None
+    if method == "POST" and path in SEARCH_POST_PATHS:
+        return "search"
+    return "write"
+
+
+def get_client_ip(request: Request) -> Optional[str]:
+    """The client's address, taken from X-Forwarded-For when behind TRUSTED_PROXY_HOPS proxies"""
+    hops = settings.TRUSTED_PROXY_HOPS
+    if hops:
+        # Each proxy appends the address it received the request from, so the entry `hops`
+        # from the end was written by the outermost trusted proxy. Earlier ones are the client's.
+        forwarded = [
+            entry.strip()
+            for header in request.headers.getlist("x-forwarded-for")
+            for entry in header.split(",")
+            if entry.strip()
+        ]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.client.host if request.client else None
+
+
+def check_login_rate(client_ip: Optional[str], account: str) -> float:
+    """Charge one login attempt to the IP and the account; returns seconds to wait (0 if allowed)"""
+    wait = login_ip_buckets.acquire(client_ip or "unknown")
+    if wait:
+        return wait
+    return login_account_buckets.acquire(account.strip().lower())
+
+
+class LoadSheddingMiddleware:
+    """Reject requests beyond their route class's concurrency limit with a fast 503"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify_route(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limit = route_limits[route_class]
+        if not limit.try_acquire():
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry shortly"},
+                status_code=503,
+                headers={"Retry-After": str(limit.retry_after())}
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limit.release(time.perf_counter() - started)
+
+
+def render_metrics() -> str:
+    """Limiter state in the Prometheus text exposition format"""
+    gauges = [
+        ("sk8_limiter_limit", "Current adaptive concurrency limit", lambda l: round(l.limit, 2)),
+        ("sk8_limiter_in_flight", "Requests currently holding a slot", lambda l: l.in_flight),
+        ("sk8_limiter_latency_seconds", "Moving average request latency", lambda l: round(l.latency or 0.0, 4)),
+    ]
+    counters = [
+        ("sk8_limiter_accepted_total", "Requests admitted", lambda l: l.accepted),
+        ("sk8_limiter_rejected_total", "Requests shed with 503", lambda l: l.rejected),
+    ]
+
+    lines = []
+    for metric_type, metrics in (("gauge", gauges), ("counter", counters)):
+        for name, help_text, value in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for limit in route_limits.values():
+                lines.append(f'{name}{{route_class="{limit.name}"}} {value(limit)}')
+
+    lines.append("# HELP sk8_login_rejected_total Login attempts refused by a token bucket")
+    lines.append("# TYPE sk8_login_rejected_total counter")
+    for buckets in (login_ip_buckets, login_account_buckets):
+        lines.append(f'sk8_login_rejected_total{{scope="{buckets.name}"}} {buckets.rejected}')
+
+    lines.append("# HELP sk8_login_tracked_keys Keys with a partially drained login bucket")
+    lines.append("# TYPE sk8_login_tracked_keys gauge")
+    for buckets in (login_ip_buckets, login_account_buckets):
+        lines.append(f'sk8_login_tracked_keys{{scope="{buckets.name}"}} {len(buckets)}')
+
+    return "\n".join(lines) + "\n"
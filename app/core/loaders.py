@@ -0,0 +1,95 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Sequence
+
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.database import get_db, any_of
+from app.models.user import User
+
+BatchFn = Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+
+
+class DataLoader:
+    """Collects load() calls made in one event-loop tick and resolves them with one query"""
+
+    def __init__(self, batch_fn: BatchFn, lock: asyncio.Lock, default: Callable[[], Any] = lambda: None):
+        self._batch_fn = batch_fn
+        self._lock = lock
+        self._default = default
+        self._cache: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[Hashable] = []
+
+    def load(self, key: Hashable) -> asyncio.Future:
+        if key in self._cache:
+            return self._cache[key]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._cache[key] = future
+        self._queue.append(key)
+
+        # The first key of a tick schedules the dispatch; later keys ride along
+        if len(self._queue) == 1:
+            loop.call_soon(self._dispatch)
+
+        return future
+
+    async def load_many(self, keys: Iterable[Hashable]) -> List[Any]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        asyncio.ensure_future(self._run_batch(keys))
+
+    async def _run_batch(self, keys: List[Hashable]) -> None:
+        try:
+            # All loaders of a request share one AsyncSession, which allows one query at a time
+            async with self._lock:
+                results = await self._batch_fn(keys)
+        except Exception as e:
+            for key in keys:
+                future = self._cache.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key in keys:
+            future = self._cache[key]
+            if not future.done():
+                future.set_result(results.get(key, self._default()))
+
+
+class Loaders:
+    """Per-request loaders for related entities, memoized for the rest of the request"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._lock = asyncio.Lock()
+        self.users = DataLoader(self._load_users, self._lock)
+
+    async def attach(
+        self,
+        instances: Sequence[Any],
+        relationship: str,
+        loader: DataLoader,
+        key_attr: str
+    ) -> None:
+        """Populate a relationship on each instance without triggering a lazy load"""
+        if not instances:
+            return
+
+        values = await loader.load_many(getattr(instance, key_attr) for instance in instances)
+        for instance, value in zip(instances, values):
+            set_committed_value(instance, relationship, value)
+
+    async def _load_users(self, ids: List[Hashable]) -> Dict[Hashable, User]:
+        result = await self.db.execute(select(User).where(any_of(User.id, ids)))
+        return {user.id: user for user in result.scalars().all()}
+
+
+async def get_loaders(db: AsyncSession = Depends(get_db)) -> Loaders:
+    """Dependency providing loaders bound to the request's database session"""
+    return Loaders(db)
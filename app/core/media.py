@@ -0,0 +1,144 @@
+import hashlib
+import logging
+import uuid
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import select, update, delete, literal
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cloudinary import upload_image, delete_image
+from app.core.config import settings
+from app.core.jobs import enqueue_job, job_handler
+from app.models.media import MediaAsset
+from app.models.spot import Spot, SpotImage
+
+logger = logging.getLogger(__name__)
+
+MEDIA_DELETE_TOPIC = "media.delete"
+UPLOAD_CHUNK_BYTES = 64 * 1024
+AVATAR_MAX_BYTES = 5 * 1024 * 1024
+SPOT_IMAGE_MAX_BYTES = settings.MAX_UPLOAD_SIZE
+
+# Uploaded images are registered by the SHA-256 of their bytes. Re-uploading the same
+# bytes reuses the stored URL, and ref_count tracks how many avatars and spot images
+# point at it, so storage is only deleted when the last one lets go.
+
+
+async def read_upload(file: UploadFile, max_bytes: int) -> Tuple[bytes, str]:
+    """Read an upload in chunks, hashing as it arrives and stopping once it is too large"""
+    digest = hashlib.sha256()
+    chunks = []
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File size must be less than {max_bytes // (1024 * 1024)}MB"
+            )
+        digest.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks), digest.hexdigest()
+
+
+async def _reference(db: AsyncSession, condition) -> Optional[str]:
+    return await db.scalar(
+        update(MediaAsset)
+        .where(condition)
+        .values(ref_count=MediaAsset.ref_count + 1)
+        .returning(MediaAsset.url)
+    )
+
+
+async def reference_media(db: AsyncSession, digest: str) -> Optional[str]:
+    """Take a reference to a stored asset by digest, returning its URL, or None if unknown"""
+    return await _reference(db, MediaAsset.digest == digest)
+
+
+async def reference_media_url(db: AsyncSession, url: str) -> str:
+    """Take a reference to the image behind a client-supplied URL if it is registered"""
+    # Unregistered URLs (external links, or uploads from before the registry) are stored
+    # as they are. release_media skips them too, so they are never deleted from storage.
+    await _reference(db, MediaAsset.url == url)
+    return url
+
+
+async def register_media(
+    db: AsyncSession, url: str, public_id: str, size_bytes: int, digest: Optional[str]
+) -> str:
+    """Record a fresh upload with one reference, returning the URL to use"""
+    registered_url = await db.scalar(
+        insert(MediaAsset)
+        .values(digest=digest, url=url, public_id=public_id, size_bytes=size_bytes, ref_count=1)
+        .on_conflict_do_update(
+            index_elements=[MediaAsset.digest],
+            set_={"ref_count": MediaAsset.ref_count + 1}
+        )
+        .returning(MediaAsset.url)
+    )
+    if registered_url != url:
+        # The same bytes were registered concurrently; keep that copy and drop ours
+        enqueue_job(db, MEDIA_DELETE_TOPIC, {"public_id": public_id})
+    return registered_url
+
+
+async def acquire_media(db: AsyncSession, content: bytes, digest: str, folder: str) -> str:
+    """Take a reference to the stored copy of these bytes, uploading only if there is none"""
+    url = await reference_media(db, digest)
+    if url:
+        return url
+    
+    # Random public_ids keep a concurrent delete of an earlier copy away from this one
+    result = await upload_image(content, folder=folder, public_id=uuid.uuid4().hex)
+    if not result["success"]:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to upload image: {result['error']}"
+        )
+    
+    return await register_media(db, result["url"], result["public_id"], len(content), digest)
+
+
+async def release_media(db: AsyncSession, url: Optional[str]) -> None:
+    """Drop a reference to an uploaded image, deleting it from storage with the last one"""
+    if not url:
+        return
+    
+    row = (await db.execute(
+        update(MediaAsset)
+        .where(MediaAsset.url == url)
+        .values(ref_count=MediaAsset.ref_count - 1)
+        .returning(MediaAsset.id, MediaAsset.public_id, MediaAsset.ref_count)
+    )).first()
+    
+    # Storage is only ever deleted through the registry. An unregistered URL (uploaded
+    # before the registry existed, or set by a client) may be someone else's file.
+    if row is not None and row.ref_count <= 0:
+        await db.execute(delete(MediaAsset).where(MediaAsset.id == row.id))
+        enqueue_job(db, MEDIA_DELETE_TOPIC, {"public_id": row.public_id})
+
+
+async def insert_spot_image(db: AsyncSession, spot_id, **values) -> Optional[SpotImage]:
+    """Insert an image row, or nothing when the spot is missing or deleted"""
+    # Inserting from a select over live spots makes the existence check part of the insert
+    columns = {"spot_id": Spot.id, **{name: literal(value) for name, value in values.items()}}
+    return await db.scalar(
+        insert(SpotImage)
+        .from_select(
+            list(columns),
+            select(*columns.values()).where(Spot.id == spot_id, Spot.deleted_at.is_(None))
+        )
+        .returning(SpotImage)
+    )
+
+
+@job_handler(MEDIA_DELETE_TOPIC)
+async def delete_media(db: AsyncSession, payloads: List[dict]) -> None:
+    """Remove images from storage; a failure raises so the outbox retries with backoff"""
+    for public_id in dict.fromkeys(payload["public_id"] for payload in payloads):
+        result = await delete_image(public_id)
+        if not result["success"]:
+            raise RuntimeError(f"Failed to delete media {public_id}: {result['error']}")
+        logger.debug("Deleted media %s", public_id)
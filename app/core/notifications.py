@@ -0,0 +1,111 @@
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.invalidation import publish
+from app.core.jobs import enqueue_job, job_handler
+from app.models.notification import Notification, NotificationActor
+
+NOTIFICATION_TOPIC = "notification"
+
+# Only the most recent distinct actors are kept for display ("Ana, Rui and 3 others")
+MAX_STORED_ACTORS = 50
+
+unread_count_cache = TTLCache(
+    "notifications.unread_count",
+    ttl_seconds=settings.NOTIFICATION_UNREAD_CACHE_SECONDS
+)
+
+
+def notify(
+    db: AsyncSession,
+    user_id: UUID,
+    actor_id: UUID,
+    notification_type: str,
+    target_id: Optional[UUID] = None
+) -> None:
+    """Queue a notification; it is written by the background job worker"""
+    if user_id == actor_id:
+        return
+
+    enqueue_job(db, NOTIFICATION_TOPIC, {
+        "user_id": str(user_id),
+        "actor_id": str(actor_id),
+        "notification_type": notification_type,
+        "target_id": str(target_id) if target_id else None,
+    })
+
+
+@job_handler(NOTIFICATION_TOPIC)
+async def deliver_notifications(db: AsyncSession, payloads: List[dict]) -> None:
+    """Write a batch of queued notifications, coalescing duplicates into one row"""
+    # One group per (recipient, type, target) holding its distinct actors, newest first
+    groups: Dict[Tuple[str, str, Optional[str]], List[str]] = {}
+    for payload in payloads:
+        key = (payload["user_id"], payload["notification_type"], payload.get("target_id"))
+        actors = groups.setdefault(key, [])
+        if payload["actor_id"] in actors:
+            actors.remove(payload["actor_id"])
+        actors.insert(0, payload["actor_id"])
+
+    # Groups are locked in key order, so concurrent batches cannot deadlock on each other
+    for (user_id, notification_type, target_id), actors in sorted(
+        groups.items(), key=lambda item: (item[0][0], item[0][1], item[0][2] or "")
+    ):
+        # The unread notification for the group absorbs the new actors. The upsert locks it,
+        # so concurrent batches for the same group apply one after the other.
+        stmt = insert(Notification).values(
+            user_id=UUID(user_id),
+            notification_type=notification_type,
+            target_id=UUID(target_id) if target_id else None,
+            actor_ids=[],
+            actor_count=0,
+            last_actor_id=UUID(actors[0]),
+            is_read=False
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Notification.user_id, Notification.notification_type, Notification.target_id],
+            index_where=Notification.is_read == False,
+            set_={"last_actor_id": stmt.excluded.last_actor_id, "updated_at": func.now()}
+        ).returning(Notification.id, Notification.actor_ids)
+        notification_id, previous = (await db.execute(stmt)).one()
+
+        # Only actors this notification has never had count, including ones past the stored list
+        added = await db.scalars(
+            insert(NotificationActor)
+            .values([{"notification_id": notification_id, "actor_id": UUID(actor)} for actor in actors])
+            .on_conflict_do_nothing()
+            .returning(NotificationActor.actor_id)
+        )
+        await db.execute(
+            update(Notification)
+            .where(Notification.id == notification_id)
+            .values(
+                actor_ids=(actors + [a for a in previous if a not in actors])[:MAX_STORED_ACTORS],
+                actor_count=Notification.actor_count + len(added.all())
+            )
+        )
+
+    await publish(db, unread_count_cache.name, {user_id for user_id, _, _ in groups})
+
+
+async def get_unread_count(db: AsyncSession, user_id: UUID) -> int:
+    """Return the number of unread notifications, served from cache when fresh"""
+    cached = unread_count_cache.get(str(user_id))
+    if cached is not None:
+        return cached
+
+    result = await db.execute(
+        select(func.count(Notification.id)).where(
+            Notification.user_id == user_id,
+            Notification.is_read == False
+        )
+    )
+    count = result.scalar() or 0
+    unread_count_cache.set(str(user_id), count)
+    return count
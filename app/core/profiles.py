@@ -0,0 +1,63 @@
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.invalidation import publish
+from app.core.media import release_media
+from app.models.user import User
+from app.schemas.user import UserFullResponse
+
+profile_cache = TTLCache("users.profile", ttl_seconds=settings.PROFILE_CACHE_SECONDS)
+
+
+async def get_profile(db: AsyncSession, user_id: UUID) -> Optional[UserFullResponse]:
+    """Return an active user's profile with skate setups, served from cache when fresh"""
+    cached = profile_cache.get(str(user_id))
+    if cached is not None:
+        return cached
+
+    # One round trip: the setups arrive through a LEFT JOIN on the user row
+    result = await db.execute(
+        select(User)
+        .options(joinedload(User.skate_setups))
+        .where(User.id == user_id, User.is_active == True)
+    )
+    user = result.unique().scalar_one_or_none()
+    if user is None:
+        return None
+
+    profile = UserFullResponse.model_validate(user)
+    if user.is_shop:
+        # Shops have no skate setups
+        profile = profile.model_copy(update={"skate_setups": None})
+
+    profile_cache.set(str(user_id), profile)
+    return profile
+
+
+async def invalidate_profile(db: AsyncSession, user_id: UUID) -> None:
+    """Drop the cached profile on every worker when a write to the user or their setups commits"""
+    await publish(db, profile_cache.name, [user_id])
+
+
+async def replace_avatar(db: AsyncSession, user_id: UUID, avatar_url: Optional[str]) -> None:
+    """Point the user at a new avatar and drop the reference to the previous one"""
+    # The previous URL is read from the locked row, so concurrent swaps release each URL once
+    old = (
+        select(User.id, User.profile_picture)
+        .where(User.id == user_id)
+        .with_for_update()
+        .cte("old")
+    )
+    previous_url = await db.scalar(
+        update(User)
+        .where(User.id == old.c.id)
+        .values(profile_picture=avatar_url)
+        .returning(old.c.profile_picture)
+    )
+    await release_media(db, previous_url)
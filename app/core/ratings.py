@@ -0,0 +1,147 @@
+import asyncio
+import logging
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import select, update, func, cast, Float, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.jobs import periodic_job
+from app.models.spot import Spot, SpotRating
+
+logger = logging.getLogger(__name__)
+
+STARS = range(1, 6)
+
+
+def _bucket(stars: int):
+    return getattr(Spot, f"rating_{stars}_count")
+
+
+def _rating_values(new_rating: int, previous_rating: Optional[int] = None) -> dict:
+    # Every right-hand side sees the row as it was before the UPDATE
+    old_total = sum(_bucket(stars) for stars in STARS)
+    old_sum = sum(stars * _bucket(stars) for stars in STARS)
+    new_total = old_total + (0 if previous_rating else 1)
+    new_sum = old_sum + new_rating - (previous_rating or 0)
+
+    values = {
+        "rating_count": new_total,
+        "rating": func.coalesce(cast(new_sum, Float) / func.nullif(new_total, 0), 0.0),
+    }
+    if previous_rating != new_rating:
+        values[f"rating_{new_rating}_count"] = _bucket(new_rating) + 1
+        if previous_rating:
+            values[f"rating_{previous_rating}_count"] = _bucket(previous_rating) - 1
+    return values
+
+
+async def apply_rating_change(
+    db: AsyncSession,
+    spot_id: UUID,
+    new_rating: int,
+    previous_rating: Optional[int] = None
+):
+    """Move a rating into its histogram bucket and refresh the average (None if no spot)"""
+    # Call inside the transaction that writes the SpotRating row so both commit together
+    # Returns the spot's creator_id, is_public, latitude and longitude for the caller
+    result = await db.execute(
+        update(Spot)
+        .where(Spot.id == spot_id, Spot.deleted_at.is_(None))
+        .values(**_rating_values(new_rating, previous_rating))
+        .returning(Spot.creator_id, Spot.is_public, Spot.latitude, Spot.longitude)
+    )
+    return result.first()
+
+
+async def reconcile_rating_histograms(db: AsyncSession, fix: bool = True) -> dict:
+    """Rebuild histogram counters from spot_ratings and report spots that had drifted"""
+    counts = (
+        select(
+            SpotRating.spot_id.label("spot_id"),
+            *[func.count().filter(SpotRating.rating == stars).label(f"c{stars}") for stars in STARS]
+        )
+        .group_by(SpotRating.spot_id)
+        .subquery()
+    )
+    actual = {stars: func.coalesce(getattr(counts.c, f"c{stars}"), 0) for stars in STARS}
+
+    result = await db.execute(
+        select(Spot.id, *[_bucket(stars) for stars in STARS], *actual.values())
+        .outerjoin(counts, counts.c.spot_id == Spot.id)
+        .where(
+            Spot.deleted_at.is_(None),
+            or_(
+                Spot.rating_count != sum(actual.values()),
+                *[_bucket(stars) != actual[stars] for stars in STARS]
+            )
+        )
+    )
+
+    drift: List[dict] = []
+    for row in result.all():
+        stored = {stars: row[stars] for stars in STARS}
+        expected = {stars: row[5 + stars] for stars in STARS}
+        drift.append({"spot_id": str(row[0]), "stored": stored, "actual": expected})
+
+    if fix and drift:
+        await _rebuild_histograms(db, [UUID(entry["spot_id"]) for entry in drift])
+
+    spots_checked = (await db.execute(
+        select(func.count(Spot.id)).where(Spot.deleted_at.is_(None))
+    )).scalar()
+    return {"spots_checked": spots_checked, "spots_drifted": len(drift), "drift": drift}
+
+
+async def _rebuild_histograms(db: AsyncSession, spot_ids: List[UUID]) -> None:
+    # Lock first, then count in a new statement. A rating write that committed while we
+    # waited is counted; one still in flight waits for us and then adds its increment.
+    await db.execute(
+        select(Spot.id).where(Spot.id.in_(spot_ids)).order_by(Spot.id).with_for_update()
+    )
+
+    def rated(*conditions):
+        return (
+            select(func.count())
+            .where(SpotRating.spot_id == Spot.id, *conditions)
+            .scalar_subquery()
+        )
+
+    await db.execute(
+        update(Spot)
+        .where(Spot.id.in_(spot_ids), Spot.deleted_at.is_(None))
+        .values(
+            rating_count=rated(),
+            rating=select(func.coalesce(func.avg(SpotRating.rating), 0.0))
+            .where(SpotRating.spot_id == Spot.id)
+            .scalar_subquery(),
+            **{f"rating_{stars}_count": rated(SpotRating.rating == stars) for stars in STARS}
+        )
+    )
+
+
+@periodic_job("ratings.reconcile_histograms", interval_seconds=24 * 60 * 60)
+async def reconcile_rating_histograms_job(db: AsyncSession) -> None:
+    report = await reconcile_rating_histograms(db)
+    if report["spots_drifted"]:
+        logger.warning(
+            "Rating histograms drifted on %s of %s spots and were rebuilt: %s",
+            report["spots_drifted"], report["spots_checked"], report["drift"][:20]
+        )
+
+
+if __name__ == "__main__":
+    # Manual run: python -m app.core.ratings [--dry-run]
+    import json
+    import sys
+
+    from app.core.database import AsyncSessionLocal
+
+    async def main():
+        fix = "--dry-run" not in sys.argv
+        async with AsyncSessionLocal() as db:
+            report = await reconcile_rating_histograms(db, fix=fix)
+            await db.commit()
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
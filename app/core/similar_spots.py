@@ -0,0 +1,208 @@
+"""
+Similar-spot recommendations from feature vectors.
+
+Each listed spot is encoded as one row of a float32 matrix: its spot type (one-hot),
+difficulty (one-hot, with half weight on the neighbouring levels), features such as
+rails and stairs (multi-hot), and its rating. Rows are L2-normalized, so a matrix-vector
+product scores every spot's cosine similarity to the query spot in one pass.
+
+Every worker keeps its own matrix. It is built on first use, and afterwards only the
+spots named by invalidation events on the "spots" topic are re-read and patched in place.
+A flush, or a value outside the known vocabulary, triggers a full rebuild instead.
+
+NumPy is imported with this module, so routers import it inside the handler.
+"""
+import asyncio
+import math
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import any_of
+from app.core.geo_rank import nearest_distances
+from app.core.invalidation import subscribe, SPOTS_TOPIC
+from app.models.spot import Spot
+
+DIFFICULTY_LEVELS = ["beginner", "intermediate", "advanced", "expert"]
+
+TYPE_WEIGHT = 1.0
+DIFFICULTY_WEIGHT = 0.8
+FEATURE_WEIGHT = 1.5
+RATING_WEIGHT = 0.5
+
+FEATURE_COLUMNS = (Spot.id, Spot.latitude, Spot.longitude, Spot.spot_type, Spot.difficulty, Spot.features, Spot.rating)
+
+
+def _normalize(value: Any) -> str:
+    return str(value).strip().lower()
+
+
+class SpotFeatureIndex:
+    """In-process feature matrix over listed spots, patched incrementally"""
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._needs_rebuild = True
+        self._stale: Set[str] = set()
+
+        self._types: Dict[str, int] = {}
+        self._features: Dict[str, int] = {}
+        self._ids: List[Optional[UUID]] = []
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._latitudes = np.zeros(0)
+        self._longitudes = np.zeros(0)
+        self._active = np.zeros(0, dtype=bool)
+
+    def invalidate(self, keys: Optional[Iterable[str]]) -> None:
+        if keys is None:
+            self._needs_rebuild = True
+        else:
+            self._stale.update(keys)
+
+    @property
+    def dimensions(self) -> int:
+        return len(self._types) + len(DIFFICULTY_LEVELS) + len(self._features) + 1
+
+    def _knows(self, row) -> bool:
+        return _normalize(row.spot_type) in self._types and all(
+            _normalize(feature) in self._features for feature in row.features or ()
+        )
+
+    def _encode(self, row) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        vector[self._types[_normalize(row.spot_type)]] = TYPE_WEIGHT
+
+        offset = len(self._types)
+        difficulty = _normalize(row.difficulty) if row.difficulty else None
+        if difficulty in DIFFICULTY_LEVELS:
+            level = DIFFICULTY_LEVELS.index(difficulty)
+            vector[offset + level] = DIFFICULTY_WEIGHT
+            for neighbour in (level - 1, level + 1):
+                if 0 <= neighbour < len(DIFFICULTY_LEVELS):
+                    vector[offset + neighbour] = DIFFICULTY_WEIGHT / 2
+
+        offset += len(DIFFICULTY_LEVELS)
+        features = {_normalize(feature) for feature in row.features or ()}
+        for feature in features:
+            # Scaled so spots listing many features do not outweigh the other blocks
+            vector[offset + self._features[feature]] = FEATURE_WEIGHT / math.sqrt(len(features))
+
+        vector[-1] = RATING_WEIGHT * (row.rating or 0.0) / 5.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _build(self, rows: List) -> None:
+        self._types = {value: i for i, value in enumerate(sorted({_normalize(row.spot_type) for row in rows}))}
+        self._features = {
+            value: i for i, value in
+            enumerate(sorted({_normalize(feature) for row in rows for feature in row.features or ()}))
+        }
+        self._ids = [row.id for row in rows]
+        self._rows = {str(row.id): i for i, row in enumerate(rows)}
+        self._free = []
+        self._matrix = np.zeros((len(rows), self.dimensions), dtype=np.float32)
+        for i, row in enumerate(rows):
+            self._matrix[i] = self._encode(row)
+        self._latitudes = np.array([row.latitude for row in rows], dtype=np.float64)
+        self._longitudes = np.array([row.longitude for row in rows], dtype=np.float64)
+        self._active = np.ones(len(rows), dtype=bool)
+
+    def _grow(self) -> int:
+        # Capacity doubles, so appending n spots copies the matrix O(log n) times
+        size = len(self._ids)
+        capacity = max(16, size * 2)
+        self._matrix = np.resize(self._matrix, (capacity, self.dimensions))
+        self._latitudes = np.resize(self._latitudes, capacity)
+        self._longitudes = np.resize(self._longitudes, capacity)
+        self._active = np.resize(self._active, capacity)
+        self._active[size:] = False
+        self._ids.extend([None] * (capacity - size))
+        self._free.extend(range(capacity - 1, size - 1, -1))
+        return self._free.pop()
+
+    def _patch(self, stale: Set[str], rows: List) -> bool:
+        """Apply re-read rows for stale ids; False when a full rebuild is needed instead"""
+        if not all(self._knows(row) for row in rows):
+            return False
+
+        found = {str(row.id) for row in rows}
+        for key in stale - found:
+            # Deleted or no longer public
+            index = self._rows.pop(key, None)
+            if index is not None:
+                self._active[index] = False
+                self._ids[index] = None
+                self._free.append(index)
+
+        for row in rows:
+            key = str(row.id)
+            index = self._rows.get(key)
+            if index is None:
+                index = self._free.pop() if self._free else self._grow()
+                self._rows[key] = index
+                self._ids[index] = row.id
+            self._matrix[index] = self._encode(row)
+            self._latitudes[index] = row.latitude
+            self._longitudes[index] = row.longitude
+            self._active[index] = True
+        return True
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Bring the matrix up to date with the invalidations received so far"""
+        async with self._lock:
+            if not self._needs_rebuild and not self._stale:
+                return
+
+            # Taken before reading, so events arriving meanwhile wait for the next refresh
+            stale, self._stale = self._stale, set()
+            query = select(*FEATURE_COLUMNS).where(Spot.is_public == True, Spot.deleted_at.is_(None))
+
+            if not self._needs_rebuild:
+                result = await db.execute(query.where(any_of(Spot.id, {UUID(key) for key in stale})))
+                if self._patch(stale, result.all()):
+                    return
+
+            self._needs_rebuild = False
+            result = await db.execute(query)
+            self._build(result.all())
+
+    def similar(
+        self, spot_id: UUID, limit: int, max_distance_km: Optional[float] = None
+    ) -> Optional[List[Tuple[UUID, float, float]]]:
+        """(spot id, similarity, distance km) for the most similar spots, or None for an unknown spot"""
+        index = self._rows.get(str(spot_id))
+        if index is None:
+            return None
+
+        scores = self._matrix @ self._matrix[index]
+        eligible = self._active.copy()
+        eligible[index] = False
+
+        distances = nearest_distances(
+            self._latitudes, self._longitudes, [(self._latitudes[index], self._longitudes[index])]
+        )
+        if max_distance_km is not None:
+            eligible &= distances <= max_distance_km
+
+        candidates = np.flatnonzero(eligible)
+        if limit < len(candidates):
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self._ids[i], float(scores[i]), float(distances[i])) for i in order.tolist()]
+
+
+spot_index = SpotFeatureIndex()
+subscribe(SPOTS_TOPIC, spot_index.invalidate)
+
+
+async def similar_spots(
+    db: AsyncSession, spot_id: UUID, limit: int, max_distance_km: Optional[float] = None
+) -> Optional[List[Tuple[UUID, float, float]]]:
+    """Most similar listed spots to spot_id, refreshing this worker's matrix first"""
+    await spot_index.refresh(db)
+    return spot_index.similar(spot_id, limit, max_distance_km)
@@ -0,0 +1,99 @@
+import asyncio
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.core.database import run_in_session
+from app.models.spot import Spot, SpotImage, SpotRating
+from app.models.session import Session, SessionParticipant
+from app.schemas.session import SessionSummaryResponse
+from app.schemas.spot import (
+    SpotResponse, SpotImageResponse, SpotReviewResponse,
+    SpotRatingSummary, SpotDetailResponse
+)
+
+DETAIL_IMAGE_LIMIT = 5
+DETAIL_REVIEW_LIMIT = 5
+DETAIL_SESSION_LIMIT = 5
+
+
+async def _load_spot(db: AsyncSession, spot_id: UUID) -> Optional[SpotResponse]:
+    result = await db.execute(select(Spot).where(Spot.id == spot_id, Spot.deleted_at.is_(None)))
+    spot = result.scalar_one_or_none()
+    return SpotResponse.model_validate(spot) if spot else None
+
+
+async def _load_images(db: AsyncSession, spot_id: UUID) -> List[SpotImageResponse]:
+    result = await db.execute(
+        select(SpotImage)
+        .where(SpotImage.spot_id == spot_id)
+        .order_by(SpotImage.is_primary.desc(), SpotImage.created_at.desc())
+        .limit(DETAIL_IMAGE_LIMIT)
+    )
+    return [SpotImageResponse.model_validate(image) for image in result.scalars().all()]
+
+
+async def _load_reviews(db: AsyncSession, spot_id: UUID) -> List[SpotReviewResponse]:
+    result = await db.execute(
+        select(SpotRating)
+        .options(joinedload(SpotRating.user))
+        .where(SpotRating.spot_id == spot_id, SpotRating.review.isnot(None))
+        .order_by(SpotRating.created_at.desc())
+        .limit(DETAIL_REVIEW_LIMIT)
+    )
+    return [SpotReviewResponse.model_validate(rating) for rating in result.scalars().all()]
+
+
+async def _load_upcoming_sessions(db: AsyncSession, spot_id: UUID) -> List[SessionSummaryResponse]:
+    participant_count = (
+        select(func.count(SessionParticipant.id))
+        .where(
+            SessionParticipant.session_id == Session.id,
+            SessionParticipant.status == "joined"
+        )
+        .correlate(Session)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(Session, participant_count.label("participant_count"))
+        .where(
+            Session.spot_id == spot_id,
+            Session.scheduled_date >= func.now(),
+            Session.is_public == True,
+            Session.is_cancelled == False
+        )
+        .order_by(Session.scheduled_date)
+        .limit(DETAIL_SESSION_LIMIT)
+    )
+    return [
+        SessionSummaryResponse.model_validate(session).model_copy(update={"participant_count": count})
+        for session, count in result.all()
+    ]
+
+
+async def load_spot_detail(spot_id: UUID) -> Optional[SpotDetailResponse]:
+    """Fetch everything the spot page needs, running independent queries concurrently"""
+    spot, images, reviews, sessions = await asyncio.gather(
+        run_in_session(lambda db: _load_spot(db, spot_id)),
+        run_in_session(lambda db: _load_images(db, spot_id)),
+        run_in_session(lambda db: _load_reviews(db, spot_id)),
+        run_in_session(lambda db: _load_upcoming_sessions(db, spot_id)),
+    )
+
+    if spot is None:
+        return None
+
+    return SpotDetailResponse(
+        spot=spot,
+        images=images,
+        rating_summary=SpotRatingSummary(
+            average=spot.rating,
+            count=spot.rating_count,
+            histogram=spot.rating_histogram
+        ),
+        latest_reviews=reviews,
+        upcoming_sessions=sessions
+    )
@@ -0,0 +1,162 @@
+from collections import defaultdict
+from typing import Dict, List
+
+from sqlalchemy import select, delete, or_, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.geo import lonlat_to_tile
+from app.core.jobs import periodic_job
+from app.models.spot import Spot, SpotGridCell
+
+# Aggregates are kept for every tile zoom level up to this one
+GRID_MAX_ZOOM = 16
+
+# A map tile is 256px; clustering four zoom levels deeper gives roughly 16px cells
+CLUSTER_ZOOM_OFFSET = 4
+
+# Upper bound on grid cells a single clusters request may touch
+MAX_CLUSTER_CELLS = 20000
+
+
+def grid_zoom_for_map_zoom(map_zoom: int) -> int:
+    return max(0, min(map_zoom + CLUSTER_ZOOM_OFFSET, GRID_MAX_ZOOM))
+
+
+def _cell_rows(latitude: float, longitude: float, spot_type: str, sign: int) -> List[dict]:
+    rows = []
+    for zoom in range(GRID_MAX_ZOOM + 1):
+        cell_x, cell_y = lonlat_to_tile(latitude, longitude, zoom)
+        rows.append({
+            "zoom": zoom,
+            "cell_x": cell_x,
+            "cell_y": cell_y,
+            "spot_type": spot_type,
+            "spot_count": sign,
+            "latitude_sum": sign * latitude,
+            "longitude_sum": sign * longitude,
+        })
+    return rows
+
+
+async def _apply(db: AsyncSession, rows: List[dict]) -> None:
+    stmt = insert(SpotGridCell).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SpotGridCell.zoom, SpotGridCell.cell_x, SpotGridCell.cell_y, SpotGridCell.spot_type],
+        set_={
+            "spot_count": SpotGridCell.spot_count + stmt.excluded.spot_count,
+            "latitude_sum": SpotGridCell.latitude_sum + stmt.excluded.latitude_sum,
+            "longitude_sum": SpotGridCell.longitude_sum + stmt.excluded.longitude_sum,
+        }
+    )
+    await db.execute(stmt)
+
+
+async def add_spot_to_grid(db: AsyncSession, latitude: float, longitude: float, spot_type: str) -> None:
+    """Count a public spot in every grid level (call inside the writing transaction)"""
+    await _apply(db, _cell_rows(latitude, longitude, spot_type, 1))
+
+
+async def remove_spot_from_grid(db: AsyncSession, latitude: float, longitude: float, spot_type: str) -> None:
+    """Undo add_spot_to_grid for a spot that was deleted, hidden or retyped"""
+    await _apply(db, _cell_rows(latitude, longitude, spot_type, -1))
+
+
+async def get_clusters(
+    db: AsyncSession,
+    min_latitude: float,
+    min_longitude: float,
+    max_latitude: float,
+    max_longitude: float,
+    map_zoom: int
+) -> List[dict]:
+    """Return cluster centroids, counts and dominant spot type inside a viewport"""
+    zoom = grid_zoom_for_map_zoom(map_zoom)
+    n = 1 << zoom
+
+    # Tile y grows southwards, so the north edge gives the smallest y
+    west_x, north_y = lonlat_to_tile(max_latitude, min_longitude, zoom)
+    east_x, south_y = lonlat_to_tile(min_latitude, max_longitude, zoom)
+
+    if min_longitude <= max_longitude:
+        x_ranges = [(west_x, east_x)]
+    else:
+        # Viewport crosses the antimeridian
+        x_ranges = [(west_x, n - 1), (0, east_x)]
+
+    cell_count = sum(hi - lo + 1 for lo, hi in x_ranges) * (south_y - north_y + 1)
+    if cell_count > MAX_CLUSTER_CELLS:
+        raise ValueError("Viewport is too large for this zoom level")
+
+    result = await db.execute(
+        select(SpotGridCell).where(
+            SpotGridCell.zoom == zoom,
+            SpotGridCell.cell_y.between(north_y, south_y),
+            or_(*[SpotGridCell.cell_x.between(lo, hi) for lo, hi in x_ranges]),
+            SpotGridCell.spot_count > 0
+        )
+    )
+
+    cells: Dict[tuple, dict] = {}
+    for row in result.scalars().all():
+        cell = cells.setdefault((row.cell_x, row.cell_y), {
+            "count": 0,
+            "latitude_sum": 0.0,
+            "longitude_sum": 0.0,
+            "dominant_spot_type": row.spot_type,
+            "dominant_count": 0,
+        })
+        cell["count"] += row.spot_count
+        cell["latitude_sum"] += row.latitude_sum
+        cell["longitude_sum"] += row.longitude_sum
+        if row.spot_count > cell["dominant_count"]:
+            cell["dominant_spot_type"] = row.spot_type
+            cell["dominant_count"] = row.spot_count
+
+    return [
+        {
+            "latitude": cell["latitude_sum"] / cell["count"],
+            "longitude": cell["longitude_sum"] / cell["count"],
+            "count": cell["count"],
+            "dominant_spot_type": cell["dominant_spot_type"],
+        }
+        for cell in cells.values()
+    ]
+
+
+@periodic_job("spot_grid.rebuild", interval_seconds=24 * 60 * 60)
+async def rebuild_spot_grid(db: AsyncSession) -> None:
+    """Recompute every grid aggregate from the spots table"""
+    totals: Dict[tuple, List[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+
+    # Writers block on their grid upsert until the rebuild commits, so none are lost
+    await db.execute(text("LOCK TABLE spot_grid_cells IN EXCLUSIVE MODE"))
+
+    result = await db.stream(
+        select(Spot.latitude, Spot.longitude, Spot.spot_type).where(
+            Spot.is_public == True, Spot.deleted_at.is_(None)
+        )
+    )
+    async for latitude, longitude, spot_type in result:
+        for row in _cell_rows(latitude, longitude, spot_type, 1):
+            total = totals[(row["zoom"], row["cell_x"], row["cell_y"], spot_type)]
+            total[0] += 1
+            total[1] += latitude
+            total[2] += longitude
+
+    await db.execute(delete(SpotGridCell))
+
+    rows = [
+        {
+            "zoom": zoom,
+            "cell_x": cell_x,
+            "cell_y": cell_y,
+            "spot_type": spot_type,
+            "spot_count": count,
+            "latitude_sum": latitude_sum,
+            "longitude_sum": longitude_sum,
+        }
+        for (zoom, cell_x, cell_y, spot_type), (count, latitude_sum, longitude_sum) in totals.items()
+    ]
+    for start in range(0, len(rows), 1000):
+        await db.execute(insert(SpotGridCell).values(rows[start:start + 1000]))
@@ -0,0 +1,69 @@
+import logging
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import select, update, delete, exists
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.jobs import enqueue_job, job_handler
+from app.core.media import release_media
+from app.models.post import Post
+from app.models.session import Session
+from app.models.spot import Spot, SpotRating, SpotImage
+
+logger = logging.getLogger(__name__)
+
+PURGE_TOPIC = "spots.purge"
+
+# Deleting a spot only stamps deleted_at. This job then removes its children with
+# set-based DELETEs of at most SPOT_PURGE_BATCH_SIZE rows each, re-queueing itself
+# until they are gone, so no transaction holds locks on thousands of rows at once.
+
+
+async def _delete_batch(db: AsyncSession, model, spot_id: UUID, *returning):
+    batch = (
+        select(model.id)
+        .where(model.spot_id == spot_id)
+        .limit(settings.SPOT_PURGE_BATCH_SIZE)
+        .scalar_subquery()
+    )
+    statement = delete(model).where(model.id.in_(batch))
+    if returning:
+        return (await db.execute(statement.returning(*returning))).all()
+    return (await db.execute(statement)).rowcount
+
+
+async def purge_spot(db: AsyncSession, spot_id: UUID) -> bool:
+    """Run one purge step for a soft-deleted spot; True when more work remains"""
+    deleted = await db.scalar(select(Spot.deleted_at.isnot(None)).where(Spot.id == spot_id))
+    if not deleted:
+        return False  # Already purged, or not a deleted spot
+
+    ratings = await _delete_batch(db, SpotRating, spot_id)
+    images = await _delete_batch(db, SpotImage, spot_id, SpotImage.image_url)
+    # Remote files go through the outbox, committed together with the row deletes
+    for (image_url,) in images:
+        await release_media(db, image_url)
+
+    if max(ratings, len(images)) >= settings.SPOT_PURGE_BATCH_SIZE:
+        return True
+
+    await db.execute(update(Post).where(Post.spot_id == spot_id).values(spot_id=None))
+    # Sessions keep their spot, so a spot that hosted one stays as a soft-deleted row
+    await db.execute(
+        delete(Spot).where(
+            Spot.id == spot_id,
+            ~exists().where(Session.spot_id == spot_id)
+        )
+    )
+    return False
+
+
+@job_handler(PURGE_TOPIC)
+async def purge_spots(db: AsyncSession, payloads: List[dict]) -> None:
+    for spot_id in dict.fromkeys(payload["spot_id"] for payload in payloads):
+        if await purge_spot(db, UUID(spot_id)):
+            enqueue_job(db, PURGE_TOPIC, {"spot_id": spot_id})
+        else:
+            logger.info("Purged spot %s", spot_id)
@@ -0,0 +1,147 @@
+import base64
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, delete, func, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.jobs import periodic_job
+from app.models.spot import Spot, SpotTombstone
+
+TOKEN_PREFIX = "v1"
+
+# Sorts after every real id, so a cursor on it covers everything at that timestamp
+MAX_UUID = UUID("ffffffff-ffff-ffff-ffff-ffffffffffff")
+MIN_UUID = UUID(int=0)
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+changed_at = func.coalesce(Spot.updated_at, Spot.created_at)
+
+
+class SyncTokenError(ValueError):
+    pass
+
+
+class SyncTokenExpired(SyncTokenError):
+    pass
+
+
+def encode_sync_token(position: Tuple[datetime, UUID]) -> str:
+    timestamp, spot_id = position
+    raw = f"{TOKEN_PREFIX}|{timestamp.isoformat()}|{spot_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> Tuple[datetime, UUID]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        prefix, timestamp, spot_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        if prefix != TOKEN_PREFIX:
+            raise ValueError(prefix)
+        changed = datetime.fromisoformat(timestamp)
+        # Positions are compared with timestamptz values, which a naive datetime cannot be
+        if changed.tzinfo is None:
+            raise ValueError(timestamp)
+        return changed, UUID(spot_id)
+    except Exception:
+        raise SyncTokenError("Invalid sync token")
+
+
+async def get_spot_changes(db: AsyncSession, token: Optional[str], limit: int) -> dict:
+    """Return spots changed and deleted after the token position, oldest first"""
+    # Writes stamp rows with their transaction start time, so anything newer than
+    # the settle window may still have an older concurrent write in flight
+    horizon_result = await db.execute(select(func.now() - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)))
+    horizon = horizon_result.scalar()
+
+    if token:
+        since = decode_sync_token(token)
+        # One day of margin keeps tokens clear of tombstones the daily prune may remove
+        retention_start = horizon - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS - 1)
+        if since[0] < retention_start:
+            # Tombstones older than this have been pruned, so deletions could be missed
+            raise SyncTokenExpired("Sync token has expired; start a full sync")
+    else:
+        since = (EPOCH, MIN_UUID)
+
+    spot_query = (
+        select(Spot, changed_at.label("changed_at"))
+        .where(
+            tuple_(changed_at, Spot.id) > tuple_(since[0], since[1]),
+            changed_at <= horizon,
+            # Deleted spots are reported through their tombstones
+            Spot.deleted_at.is_(None)
+        )
+        .order_by(changed_at, Spot.id)
+        .limit(limit + 1)
+    )
+    if not token:
+        # A first sync only needs what is currently visible
+        spot_query = spot_query.where(Spot.is_public == True)
+
+    spot_rows = (await db.execute(spot_query)).all()
+
+    tombstone_rows = []
+    if token:
+        tombstone_result = await db.execute(
+            select(SpotTombstone.spot_id, SpotTombstone.deleted_at)
+            .where(
+                tuple_(SpotTombstone.deleted_at, SpotTombstone.spot_id) > tuple_(since[0], since[1]),
+                SpotTombstone.deleted_at <= horizon
+            )
+            .order_by(SpotTombstone.deleted_at, SpotTombstone.spot_id)
+            .limit(limit + 1)
+        )
+        tombstone_rows = tombstone_result.all()
+
+    # Merge both ordered streams; the first `limit` entries are complete
+    changes = sorted(
+        [(row.changed_at, row.Spot.id, row.Spot) for row in spot_rows]
+        + [(row.deleted_at, row.spot_id, None) for row in tombstone_rows],
+        key=lambda change: (change[0], change[1])
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    upserted: List[Spot] = []
+    deleted: List[UUID] = []
+    for _, spot_id, spot in changes:
+        if spot is not None and spot.is_public:
+            upserted.append(spot)
+        else:
+            # Hidden spots leave client caches the same way deleted ones do
+            deleted.append(spot_id)
+
+    if has_more:
+        position = (changes[-1][0], changes[-1][1])
+    else:
+        position = (horizon, MAX_UUID)
+
+    return {
+        "upserted": upserted,
+        "deleted": deleted,
+        "sync_token": encode_sync_token(position),
+        "has_more": has_more,
+    }
+
+
+async def record_spot_deletion(db: AsyncSession, spot_id: UUID) -> None:
+    """Write a tombstone for a deleted spot (call inside the deleting transaction)"""
+    stmt = insert(SpotTombstone).values(spot_id=spot_id)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SpotTombstone.spot_id],
+        set_={"deleted_at": func.now()}
+    )
+    await db.execute(stmt)
+
+
+@periodic_job("spot_sync.prune_tombstones", interval_seconds=24 * 60 * 60)
+async def prune_tombstones(db: AsyncSession) -> None:
+    await db.execute(
+        delete(SpotTombstone).where(
+            SpotTombstone.deleted_at < func.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        )
+    )
@@ -0,0 +1,206 @@
+"""
+Binary map-pin tiles.
+
+A tile covers one slippy-map tile (z/x/y) and carries only what map pins need.
+All integers are little-endian:
+
+    header   magic b"SK8T", format version (u8), zoom (u8), x (u32), y (u32)
+    strings  spot types:   count (u16), then per entry length (u8) + UTF-8 bytes
+             difficulties: count (u16), then per entry length (u8) + UTF-8 bytes
+    spots    count (u32), then 25 bytes per spot:
+             id (16 bytes, raw UUID)
+             latitude, longitude (u16 each, position inside the tile bounds,
+                                  0 = south/west edge, 65535 = north/east edge)
+             spot type index (u16)
+             difficulty index (u16, 65535 = not set)
+             rating (u8, stars * 50, so 0-250)
+"""
+import struct
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select, update, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.geo import lonlat_to_tile, tile_bounds
+from app.core.http import make_etag
+from app.core.jobs import enqueue_job, job_handler
+from app.models.spot import Spot, SpotTile
+
+TILE_MAGIC = b"SK8T"
+TILE_FORMAT_VERSION = 2
+TILE_MEDIA_TYPE = "application/vnd.sk8brigade.spot-tile"
+
+# Below this zoom the map shows clusters instead of pins
+TILE_MIN_ZOOM = 10
+TILE_MAX_ZOOM = 16
+
+NO_DIFFICULTY = 65535
+# Largest string table that leaves NO_DIFFICULTY free
+MAX_TABLE_ENTRIES = 65535
+# Served for tiles that have never had a spot; those are not stored
+EMPTY_TILE_VERSION = 0
+TILE_REFRESH_TOPIC = "spot_tiles.refresh"
+
+_HEADER = struct.Struct("<4sBBII")
+_SPOT = struct.Struct("<16sHHHHB")
+_TABLE_COUNT = struct.Struct("<H")
+
+
+def _quantize(value: float, low: float, high: float) -> int:
+    if high <= low:
+        return 0
+    position = (value - low) / (high - low)
+    return max(0, min(65535, round(position * 65535)))
+
+
+def _string_table(values: List[str]) -> bytes:
+    if len(values) > MAX_TABLE_ENTRIES:
+        raise ValueError(f"A tile can hold at most {MAX_TABLE_ENTRIES} distinct values per table")
+    out = bytearray(_TABLE_COUNT.pack(len(values)))
+    for value in values:
+        encoded = value.encode("utf-8")[:255]
+        out.append(len(encoded))
+        out += encoded
+    return bytes(out)
+
+
+def encode_tile(zoom: int, x: int, y: int, spots: Iterable) -> bytes:
+    """Encode rows with id, latitude, longitude, spot_type, difficulty and rating"""
+    min_lat, min_lon, max_lat, max_lon = tile_bounds(zoom, x, y)
+    spots = list(spots)
+
+    spot_types = sorted({spot.spot_type for spot in spots})
+    difficulties = sorted({spot.difficulty for spot in spots if spot.difficulty})
+    type_index = {value: i for i, value in enumerate(spot_types)}
+    difficulty_index = {value: i for i, value in enumerate(difficulties)}
+
+    out = bytearray(_HEADER.pack(TILE_MAGIC, TILE_FORMAT_VERSION, zoom, x, y))
+    out += _string_table(spot_types)
+    out += _string_table(difficulties)
+
+    records = bytearray()
+    for spot in spots:
+        records += _SPOT.pack(
+            spot.id.bytes,
+            _quantize(spot.latitude, min_lat, max_lat),
+            _quantize(spot.longitude, min_lon, max_lon),
+            type_index[spot.spot_type],
+            difficulty_index.get(spot.difficulty, NO_DIFFICULTY),
+            max(0, min(250, round((spot.rating or 0.0) * 50)))
+        )
+
+    out += struct.pack("<I", len(spots))
+    out += records
+    return bytes(out)
+
+
+def tiles_for_point(latitude: float, longitude: float) -> List[Tuple[int, int, int]]:
+    return [
+        (zoom, *lonlat_to_tile(latitude, longitude, zoom))
+        for zoom in range(TILE_MIN_ZOOM, TILE_MAX_ZOOM + 1)
+    ]
+
+
+def _tile_key(zoom: int, x: int, y: int):
+    return (SpotTile.zoom == zoom, SpotTile.tile_x == x, SpotTile.tile_y == y)
+
+
+async def build_tile(
+    db: AsyncSession, zoom: int, x: int, y: int, generation: Optional[int] = None
+) -> Optional[SpotTile]:
+    """Encode a tile and store it as a new version, or return None if the row changed meanwhile"""
+    # generation is the stored row's generation as read before the build, None if no row.
+    # A tile that has never had spots is returned unsaved, so empty areas add no rows.
+    min_lat, min_lon, max_lat, max_lon = tile_bounds(zoom, x, y)
+
+    result = await db.execute(
+        select(Spot.id, Spot.latitude, Spot.longitude, Spot.spot_type, Spot.difficulty, Spot.rating)
+        .where(
+            Spot.is_public == True,
+            Spot.deleted_at.is_(None),
+            Spot.latitude.between(min_lat, max_lat),
+            Spot.longitude.between(min_lon, max_lon)
+        )
+        .order_by(Spot.id)
+    )
+    spots = result.all()
+    data = encode_tile(zoom, x, y, spots)
+
+    if generation is None:
+        if not spots:
+            return SpotTile(
+                zoom=zoom, tile_x=x, tile_y=y, version=EMPTY_TILE_VERSION,
+                data=data, etag=make_etag(data), is_stale=False, generation=0
+            )
+        stmt = insert(SpotTile).values(
+            zoom=zoom, tile_x=x, tile_y=y, version=1, data=data, etag=make_etag(data), is_stale=False
+        ).on_conflict_do_nothing()
+    else:
+        # A stored tile keeps its row once emptied, so its version keeps counting up
+        stmt = (
+            update(SpotTile)
+            .where(*_tile_key(zoom, x, y), SpotTile.generation == generation)
+            .values(
+                version=SpotTile.version + 1,
+                data=data,
+                etag=make_etag(data),
+                is_stale=False,
+                generated_at=func.now()
+            )
+        )
+
+    result = await db.execute(stmt.returning(SpotTile), execution_options={"populate_existing": True})
+    return result.scalar_one_or_none()
+
+
+async def _stored_tile(db: AsyncSession, zoom: int, x: int, y: int) -> Optional[SpotTile]:
+    result = await db.execute(
+        select(SpotTile).where(*_tile_key(zoom, x, y)),
+        execution_options={"populate_existing": True}
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_tile(db: AsyncSession, zoom: int, x: int, y: int) -> SpotTile:
+    """Return the current tile, regenerating it first if it is missing or stale"""
+    tile = await _stored_tile(db, zoom, x, y)
+
+    if tile is None or tile.is_stale:
+        built = await build_tile(db, zoom, x, y, None if tile is None else tile.generation)
+        await db.commit()
+        # None means the row changed meanwhile; serve it as stored (a stale row has a refresh queued)
+        tile = built or await _stored_tile(db, zoom, x, y)
+
+    return tile
+
+
+async def invalidate_spot_tiles(db: AsyncSession, latitude: float, longitude: float) -> None:
+    """Mark the stored tiles containing a point stale and queue their regeneration"""
+    keys = tiles_for_point(latitude, longitude)
+
+    result = await db.execute(
+        update(SpotTile)
+        .where(tuple_(SpotTile.zoom, SpotTile.tile_x, SpotTile.tile_y).in_(keys))
+        .values(is_stale=True, generation=SpotTile.generation + 1)
+        .returning(SpotTile.zoom, SpotTile.tile_x, SpotTile.tile_y)
+    )
+    stale = [list(row) for row in result.all()]
+
+    # Tiles nobody has requested yet are built on first request instead
+    if stale:
+        enqueue_job(db, TILE_REFRESH_TOPIC, {"tiles": stale})
+
+
+@job_handler(TILE_REFRESH_TOPIC)
+async def refresh_tiles(db: AsyncSession, payloads: List[dict]) -> None:
+    keys = {tuple(tile) for payload in payloads for tile in payload["tiles"]}
+
+    result = await db.execute(
+        select(SpotTile.zoom, SpotTile.tile_x, SpotTile.tile_y, SpotTile.generation).where(
+            tuple_(SpotTile.zoom, SpotTile.tile_x, SpotTile.tile_y).in_(list(keys)),
+            SpotTile.is_stale == True
+        )
+    )
+    for zoom, x, y, generation in result.all():
+        await build_tile(db, zoom, x, y, generation)
@@ -0,0 +1,197 @@
+from typing import Any, Dict, Iterable, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import select, update, delete, func, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import any_of
+from app.core.jobs import enqueue_job, job_handler, periodic_job
+from app.core.lean import USER_SUMMARY_COLUMNS
+from app.models.session import Session, SessionParticipant, SkaterSuggestion
+from app.models.user import User
+
+SESSION_COMPLETED_TOPIC = "sessions.completed"
+
+# Relative weight of skating together directly versus through a mutual skater
+SHARED_SESSION_WEIGHT = 1.0
+MUTUAL_SKATER_WEIGHT = 0.5
+
+# Sessions without a duration count as over this long after they start
+DEFAULT_SESSION_MINUTES = 120
+
+ATTENDING_STATUSES = ("joined", "attended")
+
+# "Skaters you may know" is read from skater_suggestions in one indexed lookup. The graph
+# behind it (skaters linked by completed sessions they attended together) is only walked
+# by jobs: a full rebuild now and then, and after each session completes, a recompute for
+# just the skaters whose one- and two-hop neighbourhoods the session changed.
+
+
+def _suggestion_rows(users: Optional[Set[UUID]] = None):
+    """Select the suggestion rows for users (everyone when None), best first per user"""
+    attendance = (
+        select(SessionParticipant.session_id, SessionParticipant.user_id)
+        .join(Session, Session.id == SessionParticipant.session_id)
+        .where(Session.status == "completed", SessionParticipant.status.in_(ATTENDING_STATUSES))
+        .distinct()
+        .cte("attendance")
+    )
+    a, b = attendance.alias("a"), attendance.alias("b")
+
+    def pairs(name: str, user_filter):
+        query = (
+            select(a.c.user_id, b.c.user_id.label("other_id"), func.count().label("shared"))
+            .join(b, and_(a.c.session_id == b.c.session_id, a.c.user_id != b.c.user_id))
+            .group_by(a.c.user_id, b.c.user_id)
+        )
+        if user_filter is not None:
+            query = query.where(user_filter)
+        return query.cte(name)
+
+    first = pairs("first_hop", any_of(a.c.user_id, users) if users is not None else None)
+    # The second hop starts from the first hop's partners, whoever they are
+    second = first.alias("second_hop") if users is None else pairs(
+        "second_hop", a.c.user_id.in_(select(first.c.other_id))
+    )
+
+    two_hop = (
+        select(
+            first.c.user_id,
+            second.c.other_id.label("suggested_user_id"),
+            func.count().label("mutual")
+        )
+        .join(second, second.c.user_id == first.c.other_id)
+        .where(second.c.other_id != first.c.user_id)
+        .group_by(first.c.user_id, second.c.other_id)
+        .cte("two_hop")
+    )
+
+    user_id = func.coalesce(first.c.user_id, two_hop.c.user_id)
+    suggested_user_id = func.coalesce(first.c.other_id, two_hop.c.suggested_user_id)
+    shared = func.coalesce(first.c.shared, 0)
+    mutual = func.coalesce(two_hop.c.mutual, 0)
+    score = SHARED_SESSION_WEIGHT * shared + MUTUAL_SKATER_WEIGHT * mutual
+
+    combined = (
+        select(
+            user_id.label("user_id"),
+            suggested_user_id.label("suggested_user_id"),
+            shared.label("shared_sessions"),
+            mutual.label("mutual_skaters"),
+            score.label("score"),
+            func.row_number().over(partition_by=user_id, order_by=score.desc()).label("rank")
+        )
+        .select_from(first.join(
+            two_hop,
+            and_(first.c.user_id == two_hop.c.user_id, first.c.other_id == two_hop.c.suggested_user_id),
+            full=True
+        ))
+        .subquery()
+    )
+
+    return select(
+        combined.c.user_id, combined.c.suggested_user_id,
+        combined.c.shared_sessions, combined.c.mutual_skaters, combined.c.score
+    ).where(combined.c.rank <= settings.SKATER_SUGGESTIONS_PER_USER)
+
+
+def _insert_suggestions(rows):
+    return insert(SkaterSuggestion).from_select(
+        ["user_id", "suggested_user_id", "shared_sessions", "mutual_skaters", "score"], rows
+    )
+
+
+async def rebuild_suggestions(db: AsyncSession, users: Optional[Set[UUID]] = None) -> None:
+    """Recompute stored suggestions for users, or for everyone"""
+    if users is None:
+        await db.execute(delete(SkaterSuggestion))
+    else:
+        await db.execute(delete(SkaterSuggestion).where(any_of(SkaterSuggestion.user_id, users)))
+    await db.execute(_insert_suggestions(_suggestion_rows(users)))
+
+
+async def affected_by_sessions(db: AsyncSession, session_ids: Iterable) -> Set[UUID]:
+    """Skaters whose suggestions change when these sessions complete"""
+    attendees = set((await db.execute(
+        select(SessionParticipant.user_id).where(
+            any_of(SessionParticipant.session_id, set(session_ids)),
+            SessionParticipant.status.in_(ATTENDING_STATUSES)
+        )
+    )).scalars().all())
+    if not attendees:
+        return set()
+
+    # New links run between attendees, so their two-hop counts change, and so do those of
+    # anyone linked to an attendee (a new path through that attendee)
+    partners = (await db.execute(
+        select(SessionParticipant.user_id.distinct())
+        .join(Session, Session.id == SessionParticipant.session_id)
+        .where(
+            Session.status == "completed",
+            SessionParticipant.status.in_(ATTENDING_STATUSES),
+            SessionParticipant.session_id.in_(
+                select(SessionParticipant.session_id).where(any_of(SessionParticipant.user_id, attendees))
+            )
+        )
+    )).scalars().all()
+    return attendees | set(partners)
+
+
+@job_handler(SESSION_COMPLETED_TOPIC)
+async def update_suggestions_for_sessions(db: AsyncSession, payloads: List[dict]) -> None:
+    """Recompute suggestions for the skaters around newly completed sessions"""
+    users = await affected_by_sessions(db, {UUID(payload["session_id"]) for payload in payloads})
+    if users:
+        await rebuild_suggestions(db, users)
+
+
+@periodic_job("sessions.complete", interval_seconds=settings.SESSION_COMPLETION_SWEEP_SECONDS)
+async def complete_ended_sessions(db: AsyncSession) -> None:
+    """Mark sessions completed once they have ended and queue their suggestion updates"""
+    ends_at = Session.scheduled_date + func.make_interval(
+        0, 0, 0, 0, 0, func.coalesce(Session.duration_minutes, DEFAULT_SESSION_MINUTES)
+    )
+    result = await db.execute(
+        update(Session)
+        .where(
+            Session.status.in_(["scheduled", "active"]),
+            Session.is_cancelled == False,
+            Session.scheduled_date <= func.now(),
+            ends_at <= func.now()
+        )
+        .values(status="completed")
+        .returning(Session.id)
+    )
+    for session_id in result.scalars().all():
+        enqueue_job(db, SESSION_COMPLETED_TOPIC, {"session_id": str(session_id)})
+
+
+@periodic_job("skater_suggestions.rebuild", interval_seconds=settings.SKATER_SUGGESTIONS_REBUILD_SECONDS)
+async def rebuild_all_suggestions(db: AsyncSession) -> None:
+    """Full rebuild, catching sessions completed outside the sweep or later edited"""
+    await rebuild_suggestions(db)
+
+
+async def get_suggestions(db: AsyncSession, user_id: UUID, limit: int) -> List[Dict[str, Any]]:
+    """Read a user's stored suggestions, best first, with the suggested skaters' summaries"""
+    result = await db.execute(
+        select(
+            SkaterSuggestion.shared_sessions, SkaterSuggestion.mutual_skaters, SkaterSuggestion.score,
+            *USER_SUMMARY_COLUMNS
+        )
+        .join(User, User.id == SkaterSuggestion.suggested_user_id)
+        .where(SkaterSuggestion.user_id == user_id, User.is_active == True)
+        .order_by(SkaterSuggestion.score.desc())
+        .limit(limit)
+    )
+    return [
+        {
+            "user": {column.name: row._mapping[column.name] for column in USER_SUMMARY_COLUMNS},
+            "shared_sessions": row.shared_sessions,
+            "mutual_skaters": row.mutual_skaters,
+            "score": row.score,
+        }
+        for row in result.all()
+    ]
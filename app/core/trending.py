@@ -0,0 +1,122 @@
+import heapq
+import math
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, delete, func, literal, union_all, extract
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.geo import lonlat_to_tile
+from app.core.jobs import periodic_job
+from app.models.spot import Spot, SpotRating, SpotTrendingScore
+from app.models.session import Session
+from app.models.post import Post
+
+WORLD_CELL = "world"
+
+# Relative weight of one event of each kind before decay
+RATING_WEIGHT = 1.0  # Scaled by stars / 5
+SESSION_WEIGHT = 3.0
+POST_WEIGHT = 2.0
+
+
+def cell_for(latitude: float, longitude: float) -> str:
+    zoom = settings.TRENDING_CELL_ZOOM
+    x, y = lonlat_to_tile(latitude, longitude, zoom)
+    return f"{zoom}/{x}/{y}"
+
+
+def _decay(timestamp):
+    """exp(-ln2 * age / half_life), evaluated in Postgres"""
+    age_hours = extract("epoch", func.now() - timestamp) / 3600.0
+    return func.exp(-math.log(2) * age_hours / settings.TRENDING_HALF_LIFE_HOURS)
+
+
+async def compute_trending_scores(db: AsyncSession) -> Dict[str, List[tuple]]:
+    """Score spots from recent activity and return the top spots per cell"""
+    window_start = func.now() - timedelta(days=settings.TRENDING_WINDOW_DAYS)
+    rating_time = func.coalesce(SpotRating.updated_at, SpotRating.created_at)
+
+    events = union_all(
+        select(
+            SpotRating.spot_id.label("spot_id"),
+            (RATING_WEIGHT * SpotRating.rating / 5.0 * _decay(rating_time)).label("weight")
+        ).where(rating_time >= window_start),
+        select(
+            Session.spot_id.label("spot_id"),
+            (literal(SESSION_WEIGHT) * _decay(Session.created_at)).label("weight")
+        ).where(Session.created_at >= window_start, Session.is_cancelled == False),
+        select(
+            Post.spot_id.label("spot_id"),
+            (literal(POST_WEIGHT) * _decay(Post.created_at)).label("weight")
+        ).where(Post.created_at >= window_start, Post.spot_id.isnot(None))
+    ).subquery()
+
+    score = func.sum(events.c.weight).label("score")
+    result = await db.execute(
+        select(Spot.id, Spot.latitude, Spot.longitude, score)
+        .join(events, events.c.spot_id == Spot.id)
+        .where(Spot.is_public == True, Spot.deleted_at.is_(None))
+        .group_by(Spot.id, Spot.latitude, Spot.longitude)
+    )
+
+    per_cell: Dict[str, list] = defaultdict(list)
+    top_k = settings.TRENDING_TOP_K
+    for spot_id, latitude, longitude, spot_score in result.all():
+        entry = (float(spot_score), str(spot_id), spot_id)
+        for cell in (WORLD_CELL, cell_for(latitude, longitude)):
+            heap = per_cell[cell]
+            if len(heap) < top_k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    return {
+        cell: [(spot_id, spot_score) for spot_score, _, spot_id in sorted(heap, reverse=True)]
+        for cell, heap in per_cell.items()
+    }
+
+
+@periodic_job("trending.refresh", interval_seconds=settings.TRENDING_REFRESH_SECONDS)
+async def refresh_trending_scores(db: AsyncSession) -> None:
+    """Rewrite the ranking table; readers keep seeing the old ranking until commit"""
+    rankings = await compute_trending_scores(db)
+
+    rows = [
+        {"cell": cell, "rank": rank, "spot_id": spot_id, "score": spot_score}
+        for cell, ranked in rankings.items()
+        for rank, (spot_id, spot_score) in enumerate(ranked, start=1)
+    ]
+
+    await db.execute(delete(SpotTrendingScore))
+    for start in range(0, len(rows), 1000):
+        await db.execute(insert(SpotTrendingScore).values(rows[start:start + 1000]))
+
+
+async def get_trending_spots(
+    db: AsyncSession,
+    latitude: Optional[float],
+    longitude: Optional[float],
+    limit: int
+) -> List[tuple]:
+    """Read (spot, score) pairs for the caller's cell, falling back to the world ranking"""
+    cells = [WORLD_CELL]
+    if latitude is not None and longitude is not None:
+        cells.insert(0, cell_for(latitude, longitude))
+
+    for cell in cells:
+        result = await db.execute(
+            select(Spot, SpotTrendingScore.score)
+            .join(SpotTrendingScore, SpotTrendingScore.spot_id == Spot.id)
+            .where(SpotTrendingScore.cell == cell, Spot.is_public == True, Spot.deleted_at.is_(None))
+            .order_by(SpotTrendingScore.rank)
+            .limit(limit)
+        )
+        ranked = result.all()
+        if ranked:
+            return ranked
+
+    return []
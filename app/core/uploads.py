@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cloudinary import AVATAR_FOLDER, SPOT_IMAGE_FOLDER
+from app.core.config import settings
+from app.core.jobs import enqueue_job, periodic_job
+from app.core.media import MEDIA_DELETE_TOPIC, AVATAR_MAX_BYTES, SPOT_IMAGE_MAX_BYTES
+from app.models.media import MediaAsset, UploadIntent
+
+# Storage folder and size limit for each upload purpose
+INTENT_FOLDERS = {"avatar": AVATAR_FOLDER, "spot_image": SPOT_IMAGE_FOLDER}
+INTENT_MAX_BYTES = {"avatar": AVATAR_MAX_BYTES, "spot_image": SPOT_IMAGE_MAX_BYTES}
+
+# Cloudinary accepts a signed upload for an hour after signing, so unconfirmed intents are
+# kept that long past expiry before whatever was uploaded for them is deleted
+INTENT_CLEANUP_GRACE = timedelta(hours=1)
+
+
+@periodic_job("uploads.expire", interval_seconds=settings.UPLOAD_INTENT_TTL_SECONDS)
+async def expire_upload_intents(db: AsyncSession) -> None:
+    """Drop old intents, deleting files uploaded for intents that were never confirmed"""
+    cutoff = func.now() - INTENT_CLEANUP_GRACE
+    
+    result = await db.execute(
+        delete(UploadIntent)
+        .where(UploadIntent.status == "pending", UploadIntent.expires_at < cutoff)
+        .returning(UploadIntent.public_id)
+    )
+    public_ids = set(result.scalars().all())
+    if public_ids:
+        # Never delete a file that made it into the registry
+        registered = await db.execute(
+            select(MediaAsset.public_id).where(MediaAsset.public_id.in_(public_ids))
+        )
+        for public_id in public_ids - set(registered.scalars().all()):
+            enqueue_job(db, MEDIA_DELETE_TOPIC, {"public_id": public_id})
+    
+    await db.execute(
+        delete(UploadIntent).where(UploadIntent.status == "completed", UploadIntent.completed_at < cutoff)
+    )
@@ -1,7 +1,10 @@
 from app.models.user import User, SkateSetup
-from app.models.spot import Spot, SpotImage, SpotRating
-from app.models.session import Session, SessionParticipant
+from app.models.spot import Spot, SpotImage, SpotRating, SpotGridCell, SpotTile, SpotTombstone, SpotTrendingScore
+from app.models.session import Session, SessionParticipant, SkaterSuggestion
 from app.models.post import Post, PostLike, PostComment
+from app.models.notification import Notification, NotificationActor
+from app.models.outbox import OutboxJob
+from app.models.media import MediaAsset, UploadIntent
 
 __all__ = [
     "User",
@@ -9,9 +12,19 @@ __all__ = [
     "Spot",
     "SpotImage",
     "SpotRating", 
+    "SpotGridCell",
+    "SpotTile",
+    "SpotTombstone",
+    "SpotTrendingScore",
     "Session",
     "SessionParticipant",
+    "SkaterSuggestion",
     "Post",
     "PostLike",
-    "PostComment"
+    "PostComment",
+    "Notification",
+    "NotificationActor",
+    "OutboxJob",
+    "MediaAsset",
+    "UploadIntent"
 ]
\ No newline at end of file
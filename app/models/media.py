@@ -0,0 +1,35 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+
+try:
+    from app.core.database_sync import Base
+except ImportError:
+    from app.core.database import Base
+
+
+class MediaAsset(Base):
+    __tablename__ = "media_assets"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    digest = Column(String(64), unique=True)  # SHA-256 of the bytes; null when storage cannot tell us
+    url = Column(String(500), unique=True, nullable=False)
+    public_id = Column(String(255), nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=1)  # Avatars and spot images using the URL
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class UploadIntent(Base):
+    __tablename__ = "upload_intents"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    purpose = Column(String(20), nullable=False)  # 'avatar' or 'spot_image'
+    spot_id = Column(UUID(as_uuid=True))  # For spot images
+    public_id = Column(String(255), unique=True, nullable=False)  # Where the client uploads to
+    status = Column(String(20), nullable=False, default="pending")  # 'pending', 'completed'
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True))
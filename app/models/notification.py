@@ -0,0 +1,47 @@
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, JSON, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import uuid
+
+try:
+    from app.core.database_sync import Base
+except ImportError:
+    from app.core.database import Base
+
+
+class Notification(Base):
+    __tablename__ = "notifications"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)  # Recipient
+    notification_type = Column(String(30), nullable=False)  # 'follow', 'post_like', 'post_comment', 'session_join', 'spot_rating'
+    target_id = Column(UUID(as_uuid=True), nullable=True)  # Post, session or spot the notification is about
+    actor_ids = Column(JSON, nullable=False, default=list)  # Most recent distinct actors, newest first
+    actor_count = Column(Integer, nullable=False, default=1)
+    last_actor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    is_read = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        Index("ix_notifications_user_id_updated_at", "user_id", "updated_at"),
+        Index("ix_notifications_user_id_is_read", "user_id", "is_read"),
+        # At most one unread notification per group, so delivery can upsert into it
+        Index(
+            "uq_notifications_unread_group", user_id, notification_type, target_id,
+            unique=True, postgresql_nulls_not_distinct=True, postgresql_where=is_read == False
+        ),
+    )
+    
+    # Relationships
+    user = relationship("User", foreign_keys=[user_id])
+    last_actor = relationship("User", foreign_keys=[last_actor_id])
+
+
+class NotificationActor(Base):
+    """Every distinct actor of a notification, so actor_count stays exact past the stored list"""
+    __tablename__ = "notification_actors"
+    
+    notification_id = Column(UUID(as_uuid=True), ForeignKey("notifications.id", ondelete="CASCADE"), primary_key=True)
+    actor_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
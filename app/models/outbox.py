@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Text, JSON, Index
+from sqlalchemy.sql import func
+
+try:
+    from app.core.database_sync import Base
+except ImportError:
+    from app.core.database import Base
+
+
+class OutboxJob(Base):
+    __tablename__ = "outbox_jobs"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    topic = Column(String(100), nullable=False)  # Handler name, e.g. 'notification'
+    payload = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # 'pending', 'done', 'failed'
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+    available_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    processed_at = Column(DateTime(timezone=True))
+    
+    __table_args__ = (
+        Index("ix_outbox_jobs_status_available_at", "status", "available_at"),
+    )
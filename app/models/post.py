@@ -14,12 +14,12 @@ class Post(Base):
     __tablename__ = "posts"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    author_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    author_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     content = Column(Text, nullable=False)
     post_type = Column(String(20), default="text")  # 'text', 'image', 'video', 'session', 'spot'
     media_urls = Column(JSON)  # Store media URLs as JSON array
-    session_id = Column(UUID(as_uuid=True), ForeignKey("sessions.id"), nullable=True)
-    spot_id = Column(UUID(as_uuid=True), ForeignKey("spots.id"), nullable=True)
+    session_id = Column(UUID(as_uuid=True), ForeignKey("sessions.id"), nullable=True, index=True)
+    spot_id = Column(UUID(as_uuid=True), ForeignKey("spots.id"), nullable=True, index=True)
     tags = Column(JSON)  # Post tags/hashtags
     location = Column(String(255))  # Optional location string
     likes_count = Column(Integer, default=0)
@@ -42,8 +42,8 @@ class PostLike(Base):
     __tablename__ = "post_likes"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    post_id = Column(UUID(as_uuid=True), ForeignKey("posts.id"), nullable=False)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    post_id = Column(UUID(as_uuid=True), ForeignKey("posts.id"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
@@ -55,9 +55,9 @@ class PostComment(Base):
     __tablename__ = "post_comments"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    post_id = Column(UUID(as_uuid=True), ForeignKey("posts.id"), nullable=False)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    parent_comment_id = Column(UUID(as_uuid=True), ForeignKey("post_comments.id"), nullable=True)
+    post_id = Column(UUID(as_uuid=True), ForeignKey("posts.id"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    parent_comment_id = Column(UUID(as_uuid=True), ForeignKey("post_comments.id"), nullable=True, index=True)
     content = Column(Text, nullable=False)
     likes_count = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, Text, JSON, ForeignKey, Boolean
+from sqlalchemy import Column, String, Integer, Float, DateTime, Text, JSON, ForeignKey, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -17,7 +17,7 @@ class Session(Base):
     title = Column(String(100), nullable=False)
     description = Column(Text)
     spot_id = Column(UUID(as_uuid=True), ForeignKey("spots.id"), nullable=False)
-    creator_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    creator_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     scheduled_date = Column(DateTime(timezone=True), nullable=False)
     duration_minutes = Column(Integer)  # Expected duration in minutes
     max_participants = Column(Integer)
@@ -29,6 +29,16 @@ class Session(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        # Upcoming sessions at a spot
+        Index("ix_sessions_spot_id_scheduled_date", spot_id, scheduled_date),
+        # Sessions still to be marked completed once they have ended
+        Index(
+            "ix_sessions_open_scheduled_date", scheduled_date,
+            postgresql_where=status.in_(["scheduled", "active"])
+        ),
+    )
+    
     # Relationships
     creator = relationship("User")
     spot = relationship("Spot")
@@ -40,12 +50,29 @@ class SessionParticipant(Base):
     __tablename__ = "session_participants"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    session_id = Column(UUID(as_uuid=True), ForeignKey("sessions.id"), nullable=False)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    session_id = Column(UUID(as_uuid=True), ForeignKey("sessions.id"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     status = Column(String(20), default="joined")  # 'joined', 'maybe', 'declined', 'attended'
     joined_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     session = relationship("Session", back_populates="participants")
-    user = relationship("User")
\ No newline at end of file
+    user = relationship("User")
+
+
+class SkaterSuggestion(Base):
+    """Precomputed "skaters you may know" per user, maintained by background jobs"""
+    __tablename__ = "skater_suggestions"
+    
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    suggested_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True)
+    shared_sessions = Column(Integer, nullable=False, default=0)  # Completed sessions skated together
+    mutual_skaters = Column(Integer, nullable=False, default=0)  # Skaters both have skated with
+    score = Column(Float, nullable=False)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        # The suggestions read: one user's best suggestions first
+        Index("ix_skater_suggestions_user_id_score", user_id, score.desc()),
+    )
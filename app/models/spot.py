@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, Text, JSON, ForeignKey
+from sqlalchemy import Column, String, Integer, SmallInteger, Float, Boolean, DateTime, Text, JSON, ForeignKey, LargeBinary, Index, and_
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -26,26 +26,46 @@ class Spot(Base):
     is_verified = Column(Boolean, default=False)
     rating = Column(Float, default=0.0)
     rating_count = Column(Integer, default=0)
-    creator_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    # Star distribution, kept in step with spot_ratings by rate_spot
+    rating_1_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_2_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_3_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_4_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_5_count = Column(Integer, nullable=False, default=0, server_default="0")
+    creator_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    deleted_at = Column(DateTime(timezone=True), nullable=True)  # Soft delete; rows are purged in the background
+    
+    __table_args__ = (
+        # Delta-sync feed reads changes in (changed_at, id) order
+        Index("ix_spots_changed_at_id", func.coalesce(updated_at, created_at), id),
+        Index("ix_spots_deleted_at", deleted_at, postgresql_where=deleted_at.isnot(None)),
+        # Spot listing (newest first) and its bounding-box search, over visible spots only
+        Index("ix_spots_listed_created_at", created_at, postgresql_where=and_(is_public, deleted_at.is_(None))),
+        Index("ix_spots_listed_location", latitude, longitude, postgresql_where=and_(is_public, deleted_at.is_(None))),
+    )
     
     # Relationships
     creator = relationship("User")
     sessions = relationship("Session")
     ratings = relationship("SpotRating", back_populates="spot", cascade="all, delete-orphan")
     images = relationship("SpotImage", back_populates="spot", cascade="all, delete-orphan")
+    
+    @property
+    def rating_histogram(self) -> dict:
+        return {stars: getattr(self, f"rating_{stars}_count") or 0 for stars in range(1, 6)}
 
 
 class SpotImage(Base):
     __tablename__ = "spot_images"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    spot_id = Column(UUID(as_uuid=True), ForeignKey("spots.id"), nullable=False)
+    spot_id = Column(UUID(as_uuid=True), ForeignKey("spots.id"), nullable=False, index=True)
     image_url = Column(String(500), nullable=False)
     caption = Column(String(255))
     is_primary = Column(Boolean, default=False)
-    uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
@@ -57,12 +77,67 @@ class SpotRating(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     spot_id = Column(UUID(as_uuid=True), ForeignKey("spots.id"), nullable=False)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     rating = Column(Integer, nullable=False)  # 1-5 stars
     review = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        # One rating per user and spot; also serves lookups by spot
+        Index("uq_spot_ratings_spot_id_user_id", spot_id, user_id, unique=True),
+        # Reviews of a spot, newest first
+        Index("ix_spot_ratings_spot_id_created_at", spot_id, created_at),
+    )
+    
     # Relationships
     spot = relationship("Spot", back_populates="ratings")
-    user = relationship("User")
\ No newline at end of file
+    user = relationship("User")
+
+
+class SpotGridCell(Base):
+    """Per-type spot counts for one slippy-map tile, used as a map cluster"""
+    __tablename__ = "spot_grid_cells"
+    
+    zoom = Column(SmallInteger, primary_key=True)
+    cell_x = Column(Integer, primary_key=True)
+    cell_y = Column(Integer, primary_key=True)
+    spot_type = Column(String(50), primary_key=True)
+    spot_count = Column(Integer, nullable=False, default=0)
+    latitude_sum = Column(Float, nullable=False, default=0.0)  # Sums give the cluster centroid
+    longitude_sum = Column(Float, nullable=False, default=0.0)
+
+
+class SpotTile(Base):
+    """Encoded map-pin tile; a tile's bytes never change for a given version"""
+    __tablename__ = "spot_tiles"
+    
+    zoom = Column(SmallInteger, primary_key=True)
+    tile_x = Column(Integer, primary_key=True)
+    tile_y = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    data = Column(LargeBinary, nullable=False)
+    etag = Column(String(64), nullable=False)
+    is_stale = Column(Boolean, nullable=False, default=False)
+    # Bumped by every invalidation, so a build started before one cannot mark the tile fresh
+    generation = Column(Integer, nullable=False, default=0, server_default="0")
+    generated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class SpotTombstone(Base):
+    """Record of a deleted spot so sync clients can drop it from their cache"""
+    __tablename__ = "spot_tombstones"
+    
+    spot_id = Column(UUID(as_uuid=True), primary_key=True)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
+
+
+class SpotTrendingScore(Base):
+    """Materialized trending ranking per geographic cell, rewritten by a background job"""
+    __tablename__ = "spot_trending_scores"
+    
+    cell = Column(String(32), primary_key=True)  # 'world' or a tile key 'z/x/y'
+    rank = Column(Integer, primary_key=True)
+    spot_id = Column(UUID(as_uuid=True), ForeignKey("spots.id", ondelete="CASCADE"), nullable=False, index=True)
+    score = Column(Float, nullable=False)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
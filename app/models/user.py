@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -29,6 +29,11 @@ class User(Base):
     follower_count = Column(Integer, nullable=False)
     following_count = Column(Integer, nullable=False)
     
+    __table_args__ = (
+        # User listing: newest active users first
+        Index("ix_users_active_created_at", created_at, postgresql_where=is_active),
+    )
+    
     # Relationships - match actual database tables ONLY
     skate_setups = relationship("SkateSetup", back_populates="user", cascade="all, delete-orphan")
 
@@ -47,7 +52,7 @@ class SkateSetup(Base):
     bearings = Column(String(100), nullable=False)
     grip_tape = Column(String(100), nullable=False)
     photo_url = Column(String(500), nullable=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     
     # Relationships
     user = relationship("User", back_populates="skate_setups")
\ No newline at end of file
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any
+from datetime import datetime
+from uuid import UUID
+
+from app.schemas.spot import SpotImageResponse
+
+
+class UploadIntentCreate(BaseModel):
+    purpose: str = Field(..., pattern="^(avatar|spot_image)$")
+    spot_id: Optional[UUID] = None  # Required for spot images
+
+
+class UploadIntentResponse(BaseModel):
+    intent_id: UUID
+    upload_url: str  # POST the file here as multipart, with `fields` as form fields
+    fields: Dict[str, Any]
+    expires_at: datetime
+
+
+class UploadConfirm(BaseModel):
+    # Copied from storage's upload response; the signature covers public_id and version
+    version: int
+    signature: str
+    bytes: int = Field(..., ge=0)
+    caption: Optional[str] = None  # Spot images only
+
+
+class UploadConfirmResponse(BaseModel):
+    url: str
+    spot_image: Optional[SpotImageResponse] = None
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+from uuid import UUID
+
+
+class NotificationResponse(BaseModel):
+    id: UUID
+    notification_type: str
+    target_id: Optional[UUID]
+    actor_ids: List[UUID]
+    actor_count: int
+    last_actor_id: UUID
+    is_read: bool
+    created_at: datetime
+    updated_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+
+class UnreadCountResponse(BaseModel):
+    unread_count: int
+
+
+class NotificationMarkRead(BaseModel):
+    notification_ids: Optional[List[UUID]] = None  # Omit to mark everything as read
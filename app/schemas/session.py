@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from uuid import UUID
+
+
+class SessionSummaryResponse(BaseModel):
+    id: UUID
+    title: str
+    spot_id: UUID
+    creator_id: UUID
+    scheduled_date: datetime
+    duration_minutes: Optional[int]
+    max_participants: Optional[int]
+    skill_level: Optional[str]
+    status: Optional[str]
+    participant_count: int = 0
+    
+    class Config:
+        from_attributes = True
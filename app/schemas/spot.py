@@ -1,8 +1,12 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List, Dict
 from datetime import datetime
 from uuid import UUID
 
+from app.core.geo import haversine_km
+from app.schemas.user import UserSummary
+from app.schemas.session import SessionSummaryResponse
+
 
 class SpotBase(BaseModel):
     name: str
@@ -34,6 +38,7 @@ class SpotResponse(SpotBase):
     id: UUID
     rating: float
     rating_count: int
+    rating_histogram: Dict[int, int]  # Stars (1-5) -> number of ratings
     creator_id: UUID
     is_verified: bool
     created_at: datetime
@@ -43,6 +48,72 @@ class SpotResponse(SpotBase):
         from_attributes = True
 
 
+class SpotListItem(SpotResponse):
+    creator: Optional[UserSummary] = None  # Only set when requested with include_creator
+    distance_km: Optional[float] = None  # Only set for location searches, to the nearest query point
+
+
+class SpotRouteItem(SpotListItem):
+    along_route_km: float  # Distance from the route start to the point closest to the spot
+
+
+class SpotSimilarItem(SpotListItem):
+    similarity: float  # Cosine similarity of the spots' feature vectors, up to 1.0
+
+
+class GeoPoint(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+
+
+class SpotNearbyRequest(BaseModel):
+    points: List[GeoPoint] = Field(..., min_length=1, max_length=20)
+    radius_km: float = Field(..., ge=0.1, le=100)
+    limit: int = Field(50, ge=1, le=100)
+    spot_type: Optional[str] = None
+    difficulty: Optional[str] = None
+
+
+# Route searches measure in a flat projection that is only accurate at city scale
+ROUTE_MAX_LENGTH_KM = 100
+
+
+class SpotAlongRouteRequest(BaseModel):
+    route: List[GeoPoint] = Field(..., min_length=2, max_length=1000)  # Polyline vertices in travel order
+    corridor_km: float = Field(0.2, ge=0.01, le=5)  # Maximum distance from the route
+    limit: int = Field(100, ge=1, le=500)
+    spot_type: Optional[str] = None
+    difficulty: Optional[str] = None
+    
+    @model_validator(mode="after")
+    def check_route_length(self):
+        length = sum(
+            haversine_km(a.latitude, a.longitude, b.latitude, b.longitude)
+            for a, b in zip(self.route, self.route[1:])
+        )
+        if length > ROUTE_MAX_LENGTH_KM:
+            raise ValueError(f"Routes can be at most {ROUTE_MAX_LENGTH_KM} km long")
+        return self
+
+
+class SpotTrendingItem(SpotResponse):
+    trending_score: float = 0.0
+
+
+class SpotBatchRequest(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=500)
+
+
+class SpotBatchItem(BaseModel):
+    id: UUID
+    found: bool
+    spot: Optional[SpotResponse] = None
+
+
+class SpotBatchResponse(BaseModel):
+    items: List[SpotBatchItem]  # Same order as the requested ids
+
+
 class SpotRatingCreate(BaseModel):
     rating: int  # 1-5 stars
     review: Optional[str] = None
@@ -60,6 +131,10 @@ class SpotRatingResponse(BaseModel):
         from_attributes = True
 
 
+class SpotReviewResponse(SpotRatingResponse):
+    user: Optional[UserSummary] = None
+
+
 class SpotImageCreate(BaseModel):
     image_url: str
     caption: Optional[str] = None
@@ -76,4 +151,32 @@ class SpotImageResponse(BaseModel):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class SpotClusterResponse(BaseModel):
+    latitude: float  # Centroid of the spots in the cluster
+    longitude: float
+    count: int
+    dominant_spot_type: str
+
+
+class SpotChangesResponse(BaseModel):
+    upserted: List[SpotResponse]
+    deleted: List[UUID]  # Deleted or hidden spots to drop from the local cache
+    sync_token: str  # Pass back as `since` on the next request
+    has_more: bool
+
+
+class SpotRatingSummary(BaseModel):
+    average: float
+    count: int
+    histogram: Dict[int, int]  # Stars (1-5) -> number of ratings
+
+
+class SpotDetailResponse(BaseModel):
+    spot: SpotResponse
+    images: List[SpotImageResponse]
+    rating_summary: SpotRatingSummary
+    latest_reviews: List[SpotReviewResponse]
+    upcoming_sessions: List[SessionSummaryResponse]
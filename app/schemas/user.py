@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
@@ -41,6 +41,19 @@ class SkateSetupUpdate(BaseModel):
     photo_url: Optional[str] = None
 
 
+class UserSummary(BaseModel):
+    """Compact user embedded in other resources (spot creator, review author)"""
+    id: UUID
+    username: str
+    display_name: str
+    profile_picture: Optional[str] = None
+    is_shop: bool
+    is_verified: bool
+    
+    class Config:
+        from_attributes = True
+
+
 class UserBase(BaseModel):
     username: str
     email: EmailStr
@@ -74,4 +87,25 @@ class UserResponse(UserBase):
 
 
 class UserFullResponse(UserResponse):
-    skate_setups: Optional[List[SkateSetupResponse]] = None
\ No newline at end of file
+    skate_setups: Optional[List[SkateSetupResponse]] = None
+
+
+class UserBatchRequest(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=500)
+
+
+class UserBatchItem(BaseModel):
+    id: UUID
+    found: bool
+    user: Optional[UserResponse] = None
+
+
+class UserBatchResponse(BaseModel):
+    items: List[UserBatchItem]  # Same order as the requested ids
+
+
+class SkaterSuggestionResponse(BaseModel):
+    user: UserSummary
+    shared_sessions: int  # Completed sessions skated together
+    mutual_skaters: int  # Skaters both have skated with
+    score: float
@@ -0,0 +1,102 @@
+"""Micro-benchmark for the exact-distance ranking stage of location searches.
+
+    python benchmarks/geo_rank.py
+    python benchmarks/geo_rank.py --candidates 10000 100000 --points 1 5 --runs 50
+
+Candidates are scattered around a city, as the bounding-box prefilter returns them.
+Each case ranks them with app.core.geo_rank.rank_within (NumPy) and with a plain
+Python loop over haversine_km plus a sort, and checks both pick the same spots.
+Route cases time route_positions (distance to a polyline and position along it)
+for routes of --route-vertices vertices with a CORRIDOR_KM corridor. No database is needed. Timings are the
+median of --runs.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.geo import bounding_box, haversine_km  # noqa: E402
+from app.core.geo_rank import rank_within, route_positions  # noqa: E402
+
+CENTER = (38.72, -9.14)
+RADIUS_KM = 5.0
+TOP_K = 100
+CORRIDOR_KM = 0.3
+
+
+def python_rank(latitudes, longitudes, points, radius_km, k):
+    distances = [
+        min(haversine_km(lat, lon, p_lat, p_lon) for p_lat, p_lon in points)
+        for lat, lon in zip(latitudes, longitudes)
+    ]
+    within = [i for i, distance in enumerate(distances) if distance <= radius_km]
+    within.sort(key=distances.__getitem__)
+    return within[:k]
+
+
+def median_ms(fn, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--points", type=int, nargs="+", default=[1, 5], help="Query points per case")
+    parser.add_argument("--route-vertices", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--python-runs", type=int, default=3, help="Runs for the slower pure-Python baseline")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'candidates':>11}{'points':>8}{'in range':>10}{'numpy ms':>10}{'python ms':>11}{'speedup':>9}")
+    for count in args.candidates:
+        min_lat, min_lon, max_lat, max_lon = bounding_box(*CENTER, RADIUS_KM)
+        latitudes = [rng.uniform(min_lat, max_lat) for _ in range(count)]
+        longitudes = [rng.uniform(min_lon, max_lon) for _ in range(count)]
+
+        for point_count in args.points:
+            points = [CENTER] + [
+                (rng.uniform(min_lat, max_lat), rng.uniform(min_lon, max_lon))
+                for _ in range(point_count - 1)
+            ]
+            order, _, in_range = rank_within(latitudes, longitudes, points, RADIUS_KM, TOP_K)
+            expected = python_rank(latitudes, longitudes, points, RADIUS_KM, TOP_K)
+            if set(order.tolist()) != set(expected):
+                sys.exit(f"Rankings differ for {count} candidates and {point_count} points")
+
+            numpy_ms = median_ms(lambda: rank_within(latitudes, longitudes, points, RADIUS_KM, TOP_K), args.runs)
+            python_ms = median_ms(
+                lambda: python_rank(latitudes, longitudes, points, RADIUS_KM, TOP_K), args.python_runs
+            )
+            print(
+                f"{count:>11}{point_count:>8}{in_range:>10}{numpy_ms:>10.2f}"
+                f"{python_ms:>11.2f}{python_ms / numpy_ms:>8.1f}x"
+            )
+
+    print(f"\n{'candidates':>11}{'vertices':>10}{'route ms':>10}")
+    for count in args.candidates:
+        min_lat, min_lon, max_lat, max_lon = bounding_box(*CENTER, RADIUS_KM)
+        latitudes = [rng.uniform(min_lat, max_lat) for _ in range(count)]
+        longitudes = [rng.uniform(min_lon, max_lon) for _ in range(count)]
+        for vertices in args.route_vertices:
+            # A wandering street route from one side of the box to the other
+            route = [
+                (min_lat + (max_lat - min_lat) * rng.random(), min_lon + (max_lon - min_lon) * i / (vertices - 1))
+                for i in range(vertices)
+            ]
+            route_ms = median_ms(lambda: route_positions(latitudes, longitudes, route, CORRIDOR_KM), args.runs)
+            print(f"{count:>11}{vertices:>10}{route_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
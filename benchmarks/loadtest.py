@@ -0,0 +1,274 @@
+"""HTTP load test: throughput and p50/p95/p99 latency per endpoint, compared to a baseline.
+
+    python benchmarks/seed.py --reset                         # once, against a throwaway database
+    python benchmarks/loadtest.py --in-process --save-baseline benchmarks/baseline.json
+    python benchmarks/loadtest.py --in-process --baseline benchmarks/baseline.json
+
+--in-process drives main.app through httpx's ASGI transport with local media storage
+and the login throttles and load shedding disabled. To test a real server, start
+uvicorn with the same settings instead and pass --base-url:
+
+    MEDIA_STORAGE=local LOAD_SHEDDING_ENABLED=false LOGIN_ATTEMPTS_PER_IP_PER_MINUTE=1000000 \\
+    LOGIN_ATTEMPTS_PER_ACCOUNT_PER_MINUTE=1000000 JOB_WORKER_ENABLED=false uvicorn main:app
+
+Each scenario runs --requests requests with --concurrency workers after a short
+warm-up. Throughput is completed requests per second of wall time. Latency covers
+successful responses only, and failures are counted separately. With --baseline, the
+exit status is 1 when any scenario's p95 grows or its throughput drops by more than
+--tolerance.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+MANIFEST_PATH = Path(__file__).resolve().parent / "seed_manifest.json"
+API = "/api/v1"
+
+# Smallest valid PNG (1x1 transparent pixel)
+AVATAR_BYTES = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6300010000000500010d0a2db40000000049454e44ae426082"
+)
+
+IN_PROCESS_ENV = {
+    "MEDIA_STORAGE": "local",
+    "LOAD_SHEDDING_ENABLED": "false",
+    "LOGIN_ATTEMPTS_PER_IP_PER_MINUTE": "1000000",
+    "LOGIN_ATTEMPTS_PER_ACCOUNT_PER_MINUTE": "1000000",
+    "JOB_WORKER_ENABLED": "false",
+}
+
+
+class Context:
+    def __init__(self, manifest: dict, tokens: List[str], rng: random.Random):
+        self.manifest = manifest
+        self.tokens = tokens
+        self.rng = rng
+
+    def auth(self) -> dict:
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+    def spot_id(self) -> str:
+        return self.rng.choice(self.manifest["spot_ids"])
+
+    def city(self) -> dict:
+        return self.rng.choice(self.manifest["cities"])
+
+
+def login(client: httpx.AsyncClient, ctx: Context):
+    return client.post(f"{API}/auth/login", json={
+        "username_or_email": ctx.rng.choice(ctx.manifest["usernames"]),
+        "password": ctx.manifest["password"],
+    })
+
+
+def spots_geo(client: httpx.AsyncClient, ctx: Context):
+    city = ctx.city()
+    return client.get(f"{API}/spots/", params={
+        "latitude": city["latitude"], "longitude": city["longitude"], "radius_km": 5, "limit": 50,
+    })
+
+
+def spots_search(client: httpx.AsyncClient, ctx: Context):
+    return client.get(f"{API}/spots/", params={
+        "search": ctx.rng.choice(ctx.manifest["search_terms"]), "limit": 50,
+    })
+
+
+def get_spot(client: httpx.AsyncClient, ctx: Context):
+    return client.get(f"{API}/spots/{ctx.spot_id()}")
+
+
+def rate_spot(client: httpx.AsyncClient, ctx: Context):
+    return client.post(
+        f"{API}/spots/{ctx.spot_id()}/ratings",
+        json={"rating": ctx.rng.randint(1, 5)},
+        headers=ctx.auth(),
+    )
+
+
+def upload_avatar(client: httpx.AsyncClient, ctx: Context):
+    return client.post(
+        f"{API}/users/upload-avatar",
+        files={"file": ("avatar.png", AVATAR_BYTES, "image/png")},
+        headers=ctx.auth(),
+    )
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "login": login,
+    "spots_geo": spots_geo,
+    "spots_search": spots_search,
+    "get_spot": get_spot,
+    "rate_spot": rate_spot,
+    "upload_avatar": upload_avatar,
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def run_scenario(client, ctx: Context, request_fn, requests: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    failures: Dict[str, int] = {}
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                response = await request_fn(client, ctx)
+                ok = response.status_code < 400
+                outcome = str(response.status_code)
+            except httpx.HTTPError as e:
+                ok = False
+                outcome = type(e).__name__
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                failures[outcome] = failures.get(outcome, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": sum(failures.values()),
+        "error_codes": failures,
+        "throughput_rps": round(requests / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def obtain_tokens(client: httpx.AsyncClient, manifest: dict, count: int) -> List[str]:
+    tokens = []
+    for username in manifest["usernames"][:count]:
+        response = await client.post(f"{API}/auth/login", json={
+            "username_or_email": username, "password": manifest["password"],
+        })
+        response.raise_for_status()
+        tokens.append(response.json()["access_token"])
+    return tokens
+
+
+def make_client(args) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.in_process:
+        os.environ.update(IN_PROCESS_ENV)
+        sys.path.insert(0, str(ROOT))
+        import main
+        transport = httpx.ASGITransport(app=main.app)
+        return httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60)
+    return httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {previous['throughput_rps']} -> {current['throughput_rps']} req/s"
+            )
+    return regressions
+
+
+def print_results(results: dict, baseline: Optional[dict]) -> None:
+    print(f"{'scenario':<15}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}{'vs p95':>9}")
+    for name, r in results.items():
+        delta = ""
+        if baseline and baseline.get(name, {}).get("p95_ms"):
+            delta = f"{r['p95_ms'] / baseline[name]['p95_ms'] - 1:+.0%}"
+        print(
+            f"{name:<15}{r['throughput_rps']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}"
+            f"{r['p99_ms']:>10}{r['errors']:>8}{delta:>9}"
+        )
+
+
+async def run(args) -> int:
+    if not MANIFEST_PATH.exists():
+        print(f"No seed manifest at {MANIFEST_PATH}; run benchmarks/seed.py first")
+        return 2
+    manifest = json.loads(MANIFEST_PATH.read_text())
+    names = args.scenario or list(SCENARIOS)
+
+    async with make_client(args) as client:
+        if args.in_process:
+            import main
+            lifespan = main.app.router.lifespan_context(main.app)
+            await lifespan.__aenter__()
+
+        try:
+            ctx = Context(manifest, await obtain_tokens(client, manifest, args.users), random.Random(args.seed))
+            results = {}
+            for name in names:
+                request_fn = SCENARIOS[name]
+                await run_scenario(client, ctx, request_fn, args.warmup, args.concurrency)
+                results[name] = await run_scenario(client, ctx, request_fn, args.requests, args.concurrency)
+        finally:
+            if args.in_process:
+                await lifespan.__aexit__(None, None, None)
+
+    baseline = json.loads(Path(args.baseline).read_text())["results"] if args.baseline else None
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps({
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "in_process": args.in_process,
+            "results": results,
+        }, indent=2))
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("Regressions over tolerance:\n  " + "\n  ".join(regressions))
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%}")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--in-process", action="store_true", help="Drive main.app directly instead of a server")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="Repeatable; default all")
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=20, help="Accounts logged in for authenticated scenarios")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--baseline", help="Compare against this saved baseline")
+    parser.add_argument("--save-baseline", help="Write these results as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
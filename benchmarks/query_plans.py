@@ -0,0 +1,219 @@
+"""Query-plan regression check: EXPLAIN every statement the routers run and fail on Seq Scans.
+
+    python benchmarks/seed.py --reset            # once, against a throwaway database
+    python benchmarks/query_plans.py             # exits 1 if any statement plans a Seq Scan
+    python benchmarks/query_plans.py --verbose   # also print each statement and its plan
+
+Each scenario drives main.app in-process (as loadtest.py --in-process does) and records
+the SQL it sends, with its parameters. Each distinct statement is then planned with
+EXPLAIN, which only plans it and does not run it. Planning uses `enable_seqscan = off`,
+so Postgres only picks a sequential scan when no index can answer the query. A Seq Scan
+in the plan therefore means an index is missing, whatever the table size. `--natural`
+plans with the default settings instead, which is useful for seeing what the seeded
+volumes really get.
+
+Unanchored ILIKE searches cannot use a btree index, and pg_trgm is not assumed to be
+installed, so those statements are reported but do not fail the check.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loadtest import API, AVATAR_BYTES, IN_PROCESS_ENV, MANIFEST_PATH  # noqa: E402
+
+PLANNED_PREFIXES = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+ALLOWED_MARKERS = ("ILIKE",)
+
+
+class Recorder:
+    """Collects the statements sent to Postgres while a scenario runs"""
+
+    def __init__(self):
+        self.scenario = None
+        self.statements: Dict[str, Tuple[str, object]] = {}
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.scenario is None or not statement.lstrip().upper().startswith(PLANNED_PREFIXES):
+            return
+        if executemany:
+            parameters = parameters[0] if parameters else ()
+        self.statements.setdefault(statement, (self.scenario, parameters))
+
+
+async def run_scenarios(client: httpx.AsyncClient, manifest: dict, recorder: Recorder) -> List[str]:
+    spot_id = manifest["spot_ids"][0]
+    city = manifest["cities"][0]
+
+    response = await client.post(f"{API}/auth/login", json={
+        "username_or_email": manifest["usernames"][0], "password": manifest["password"],
+    })
+    response.raise_for_status()
+    auth = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    me = (await client.get(f"{API}/auth/me", headers=auth)).json()["id"]
+
+    async def create_spot():
+        return await client.post(f"{API}/spots/", headers=auth, json={
+            "name": "Plan check ledge", "latitude": city["latitude"], "longitude": city["longitude"],
+            "spot_type": "street",
+        })
+
+    async def update_and_delete_spot():
+        created = (await create_spot()).json()["id"]
+        await client.put(f"{API}/spots/{created}", headers=auth, json={"description": "Waxed"})
+        return await client.delete(f"{API}/spots/{created}", headers=auth)
+
+    def upload_avatar():
+        return client.post(
+            f"{API}/users/upload-avatar", headers=auth,
+            files={"file": ("avatar.png", AVATAR_BYTES, "image/png")},
+        )
+
+    async def add_spot_image():
+        # Only uploaded images can be attached to a spot
+        uploaded = (await upload_avatar()).json()["avatar_url"]
+        return await client.post(f"{API}/spots/{spot_id}/images", headers=auth, json={"image_url": uploaded})
+
+    scenarios: Dict[str, Callable] = {
+        "login": lambda: client.post(f"{API}/auth/login", json={
+            "username_or_email": manifest["usernames"][1], "password": manifest["password"],
+        }),
+        "me": lambda: client.get(f"{API}/auth/me", headers=auth),
+        "users_list": lambda: client.get(f"{API}/users/", params={"account_type": "skater"}),
+        "users_search": lambda: client.get(f"{API}/users/", params={"search": "bench"}),
+        "user_suggestions": lambda: client.get(f"{API}/users/suggestions", headers=auth),
+        "users_batch": lambda: client.post(f"{API}/users/batch", headers=auth, json={"ids": [me]}),
+        "user_profile": lambda: client.get(f"{API}/users/{me}", headers=auth),
+        "update_profile": lambda: client.put(f"{API}/users/profile", headers=auth, json={"bio": "Plan check"}),
+        "upload_avatar": upload_avatar,
+        "spots_newest": lambda: client.get(f"{API}/spots/", params={"limit": 50}),
+        "spots_geo": lambda: client.get(f"{API}/spots/", params={
+            "latitude": city["latitude"], "longitude": city["longitude"], "radius_km": 5,
+        }),
+        "spots_search": lambda: client.get(f"{API}/spots/", params={"search": manifest["search_terms"][0]}),
+        "spots_nearby": lambda: client.post(f"{API}/spots/nearby", json={
+            "points": [{"latitude": c["latitude"], "longitude": c["longitude"]} for c in manifest["cities"][:3]],
+            "radius_km": 5,
+        }),
+        "spots_along_route": lambda: client.post(f"{API}/spots/along-route", json={
+            "route": [
+                {"latitude": city["latitude"] + i * 0.001, "longitude": city["longitude"] + i * 0.002}
+                for i in range(200)
+            ],
+            "corridor_km": 0.3,
+        }),
+        "spots_clusters": lambda: client.get(f"{API}/spots/clusters", params={
+            "min_latitude": city["latitude"] - 1, "max_latitude": city["latitude"] + 1,
+            "min_longitude": city["longitude"] - 1, "max_longitude": city["longitude"] + 1, "zoom": 8,
+        }),
+        "spots_trending": lambda: client.get(f"{API}/spots/trending"),
+        "spots_changes": lambda: client.get(f"{API}/spots/changes"),
+        "spots_batch": lambda: client.post(f"{API}/spots/batch", json={"ids": manifest["spot_ids"][:20]}),
+        "spot": lambda: client.get(f"{API}/spots/{spot_id}"),
+        "spot_detail": lambda: client.get(f"{API}/spots/{spot_id}/detail"),
+        "spot_similar": lambda: client.get(f"{API}/spots/{spot_id}/similar", params={"max_distance_km": 50}),
+        "spot_ratings": lambda: client.get(f"{API}/spots/{spot_id}/ratings"),
+        "spot_images": lambda: client.get(f"{API}/spots/{spot_id}/images"),
+        "rate_spot": lambda: client.post(f"{API}/spots/{spot_id}/ratings", headers=auth, json={"rating": 4}),
+        "add_spot_image": add_spot_image,
+        "create_spot": create_spot,
+        "update_and_delete_spot": update_and_delete_spot,
+        "upload_intent": lambda: client.post(f"{API}/uploads/intents", headers=auth, json={"purpose": "avatar"}),
+        "notifications": lambda: client.get(f"{API}/notifications/", headers=auth),
+        "unread_count": lambda: client.get(f"{API}/notifications/unread-count", headers=auth),
+        "mark_read": lambda: client.post(f"{API}/notifications/read", headers=auth, json={}),
+    }
+
+    failed = []
+    for name, request in scenarios.items():
+        recorder.scenario = name
+        try:
+            response = await request()
+        finally:
+            recorder.scenario = None
+        if response.status_code >= 400:
+            failed.append(f"{name}: HTTP {response.status_code} {response.text[:200]}")
+    return failed
+
+
+def seq_scans(plan: dict) -> List[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+async def explain_all(engine, recorder: Recorder, natural: bool, verbose: bool) -> List[str]:
+    failures = []
+    async with engine.connect() as conn:
+        if not natural:
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+        for statement, (scenario, parameters) in recorder.statements.items():
+            result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters or ())
+            plan = result.scalar()
+            plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+            tables = seq_scans(plan)
+            allowed = any(marker in statement.upper() for marker in ALLOWED_MARKERS)
+            summary = " ".join(statement.split())[:160]
+
+            if tables and not allowed:
+                failures.append(f"{scenario}: Seq Scan on {', '.join(tables)}\n    {summary}")
+            elif tables:
+                print(f"allowed  {scenario}: Seq Scan on {', '.join(tables)} (unanchored ILIKE)")
+            if verbose:
+                print(f"-- {scenario}\n{statement}\n{json.dumps(plan, indent=2)}\n")
+        await conn.rollback()
+    return failures
+
+
+async def run(args) -> int:
+    if not MANIFEST_PATH.exists():
+        print(f"No seed manifest at {MANIFEST_PATH}; run benchmarks/seed.py first")
+        return 2
+    manifest = json.loads(MANIFEST_PATH.read_text())
+
+    os.environ.update(IN_PROCESS_ENV, INVALIDATION_BUS_ENABLED="false", DEBUG="false")
+    import main
+    from sqlalchemy import event
+    from app.core.database import get_engine
+
+    engine = get_engine()
+    recorder = Recorder()
+    event.listen(engine.sync_engine, "before_cursor_execute", recorder.before_cursor_execute)
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://plans", timeout=60) as client:
+        async with main.app.router.lifespan_context(main.app):
+            request_failures = await run_scenarios(client, manifest, recorder)
+            plan_failures = await explain_all(engine, recorder, args.natural, args.verbose)
+
+    for failure in request_failures:
+        print(f"request failed  {failure}")
+    print(f"Planned {len(recorder.statements)} distinct statements")
+    if plan_failures:
+        print("Sequential scans:\n  " + "\n  ".join(plan_failures))
+        return 1
+    if request_failures:
+        return 1
+    print("No sequential scans")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--natural", action="store_true", help="Plan without disabling sequential scans")
+    parser.add_argument("--verbose", action="store_true", help="Print every statement and its plan")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Compare the lean list read path with the ORM + response_model path it replaced.
+
+    python benchmarks/seed.py --reset            # once
+    python benchmarks/read_path.py --iterations 200
+
+Both paths run the same query for a 100-row page and produce the same JSON bytes.
+The timings include the query, building the rows and serialization. The lean path
+returns column tuples and serializes dicts. The ORM path builds entities, validates
+them with from_attributes and dumps them, which is what FastAPI's response_model did.
+"cpu" is this process's CPU time (excludes Postgres), which is what bounds a worker.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+from app.core.database import AsyncSessionLocal, get_engine  # noqa: E402
+from app.core.lean import SPOT_COLUMNS, USER_COLUMNS, spot_record, user_record  # noqa: E402
+from pydantic_core import to_json  # noqa: E402
+import app.models  # noqa: E402,F401
+from app.models.spot import Spot  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.spot import SpotResponse  # noqa: E402
+from app.schemas.user import UserResponse  # noqa: E402
+
+PAGE_SIZE = 100
+
+
+async def orm_spots(db) -> bytes:
+    result = await db.execute(
+        select(Spot).where(Spot.is_public == True).order_by(Spot.created_at.desc(), Spot.id).limit(PAGE_SIZE)
+    )
+    spots = result.scalars().all()
+    adapter = TypeAdapter(list[SpotResponse])
+    return adapter.dump_json(adapter.validate_python(spots, from_attributes=True))
+
+
+async def lean_spots(db) -> bytes:
+    result = await db.execute(
+        select(*SPOT_COLUMNS).where(Spot.is_public == True).order_by(Spot.created_at.desc(), Spot.id).limit(PAGE_SIZE)
+    )
+    return to_json([spot_record(row) for row in result.all()])
+
+
+async def orm_users(db) -> bytes:
+    result = await db.execute(
+        select(User).where(User.is_active == True).order_by(User.created_at.desc(), User.id).limit(PAGE_SIZE)
+    )
+    users = result.scalars().all()
+    adapter = TypeAdapter(list[UserResponse])
+    return adapter.dump_json(adapter.validate_python(users, from_attributes=True))
+
+
+async def lean_users(db) -> bytes:
+    result = await db.execute(
+        select(*USER_COLUMNS).where(User.is_active == True).order_by(User.created_at.desc(), User.id).limit(PAGE_SIZE)
+    )
+    return to_json([user_record(row) for row in result.all()])
+
+
+async def measure(fn, iterations: int) -> tuple:
+    wall, cpu = [], []
+    for _ in range(iterations):
+        # A fresh session per page, as each request gets, so the identity map starts empty
+        async with AsyncSessionLocal() as db:
+            started, cpu_started = time.perf_counter(), time.process_time()
+            await fn(db)
+            wall.append(time.perf_counter() - started)
+            cpu.append(time.process_time() - cpu_started)
+    return sorted(wall), sorted(cpu)
+
+
+async def run(iterations: int) -> None:
+    print(f"{'endpoint':<10}{'path':<6}{'wall ms':>9}{'p95 ms':>9}{'cpu ms':>9}{'cpu speedup':>13}")
+    for name, orm_fn, lean_fn in (("spots", orm_spots, lean_spots), ("users", orm_users, lean_users)):
+        async with AsyncSessionLocal() as db:
+            orm_body, lean_body = await orm_fn(db), await lean_fn(db)
+        if orm_body != lean_body:
+            raise SystemExit(f"{name}: lean and ORM paths produced different JSON")
+
+        await measure(orm_fn, 10)
+        await measure(lean_fn, 10)
+        results = {"orm": await measure(orm_fn, iterations), "lean": await measure(lean_fn, iterations)}
+
+        orm_cpu = statistics.median(results["orm"][1])
+        for path, (wall, cpu) in results.items():
+            p95 = wall[int(len(wall) * 0.95) - 1]
+            speedup = f"{orm_cpu / statistics.median(cpu):.2f}x" if path == "lean" else ""
+            print(
+                f"{name:<10}{path:<6}{statistics.median(wall) * 1000:>9.2f}{p95 * 1000:>9.2f}"
+                f"{statistics.median(cpu) * 1000:>9.2f}{speedup:>13}"
+            )
+
+    await get_engine().dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    asyncio.run(run(parser.parse_args().iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Seed a local Postgres with realistic volumes for the load test.
+
+    DATABASE_URL=postgresql+asyncpg://postgres@localhost/sk8brigade_bench \\
+        python benchmarks/seed.py --users 2000 --spots 20000 --ratings 100000 --reset
+
+Any throwaway Postgres works: a local install, `docker run postgres:16`, or the
+containerless `pgserver` wheel. `--reset` drops and recreates every table, so never
+point this at a database you care about. The data is deterministic for a given
+--seed. A manifest with sample ids and the shared password is written next to this
+file for loadtest.py.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.auth import get_password_hash  # noqa: E402
+from app.core.database import AsyncSessionLocal, get_engine  # noqa: E402
+from app.core.database_sync import Base  # noqa: E402
+from app.core.spot_grid import rebuild_spot_grid  # noqa: E402
+import app.models  # noqa: E402,F401
+from app.models.user import User  # noqa: E402
+from app.models.spot import Spot, SpotRating  # noqa: E402
+
+MANIFEST_PATH = Path(__file__).resolve().parent / "seed_manifest.json"
+PASSWORD = "benchmark-password"
+BATCH_SIZE = 2000
+
+# Spots cluster around real skate cities, like production data does
+CITIES = [
+    ("Lisbon", 38.72, -9.14), ("Barcelona", 41.39, 2.17), ("Los Angeles", 34.05, -118.24),
+    ("New York", 40.71, -74.0), ("London", 51.51, -0.13), ("Berlin", 52.52, 13.40),
+    ("Sao Paulo", -23.55, -46.63), ("Tokyo", 35.68, 139.69), ("Melbourne", -37.81, 144.96),
+    ("Copenhagen", 55.68, 12.57),
+]
+SPOT_TYPES = ["street", "park", "bowl", "vert", "diy", "plaza"]
+DIFFICULTIES = ["Beginner", "Intermediate", "Advanced", "Expert"]
+FEATURES = ["rails", "stairs", "ledges", "gaps", "manual pad", "quarter pipe", "banks", "hubba"]
+ADJECTIVES = ["Red", "Old", "Hidden", "Smooth", "Crusty", "Harbor", "Sunset", "Concrete", "Marble", "Windy"]
+NOUNS = ["Ledges", "Plaza", "Banks", "Rail", "Bowl", "Gap", "Steps", "Pier", "Courthouse", "Yard"]
+REVIEWS = [None, None, None, "Great flow", "Security kicks you out fast", "Perfect ground", "Crusty but fun"]
+
+
+def build_users(rng: random.Random, count: int, hashed_password: str) -> list:
+    return [
+        {
+            "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+            "username": f"bench_user_{i}",
+            "email": f"bench_user_{i}@example.com",
+            "hashed_password": hashed_password,
+            "display_name": f"Bench Skater {i}",
+            "bio": None,
+            "is_shop": i % 25 == 0,
+            "is_active": True,
+            "is_verified": i % 10 == 0,
+            "follower_count": 0,
+            "following_count": 0,
+        }
+        for i in range(count)
+    ]
+
+
+def build_ratings(rng: random.Random, spot_ids: list, user_ids: list, count: int) -> list:
+    # Popularity is skewed: a few spots collect most of the ratings
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(len(spot_ids))]
+    targets = rng.choices(range(len(spot_ids)), weights=weights, k=count)
+    raters = defaultdict(set)
+    ratings = []
+    for spot_index in targets:
+        user_id = rng.choice(user_ids)
+        if user_id in raters[spot_index]:
+            continue  # One rating per user and spot
+        raters[spot_index].add(user_id)
+        ratings.append({
+            "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+            "spot_id": spot_ids[spot_index],
+            "user_id": user_id,
+            "rating": rng.choices([1, 2, 3, 4, 5], weights=[1, 2, 4, 6, 5])[0],
+            "review": rng.choice(REVIEWS),
+        })
+    return ratings
+
+
+def build_spots(rng: random.Random, spot_ids: list, user_ids: list, ratings: list) -> list:
+    histograms = defaultdict(lambda: [0] * 5)
+    for rating in ratings:
+        histograms[rating["spot_id"]][rating["rating"] - 1] += 1
+
+    spots = []
+    for i, spot_id in enumerate(spot_ids):
+        city, city_lat, city_lon = rng.choice(CITIES)
+        histogram = histograms[spot_id]
+        total = sum(histogram)
+        spots.append({
+            "id": spot_id,
+            "name": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}",
+            "description": f"{rng.choice(SPOT_TYPES).title()} spot in {city}",
+            "latitude": city_lat + rng.gauss(0, 0.08),
+            "longitude": city_lon + rng.gauss(0, 0.08),
+            "address": f"{rng.randint(1, 400)} Main Street, {city}",
+            "spot_type": rng.choice(SPOT_TYPES),
+            "difficulty": rng.choice(DIFFICULTIES),
+            "features": rng.sample(FEATURES, rng.randint(1, 4)),
+            "is_public": rng.random() > 0.03,
+            "is_verified": rng.random() > 0.7,
+            "rating": sum((stars + 1) * n for stars, n in enumerate(histogram)) / total if total else 0.0,
+            "rating_count": total,
+            **{f"rating_{stars + 1}_count": n for stars, n in enumerate(histogram)},
+            "creator_id": rng.choice(user_ids),
+        })
+    return spots
+
+
+async def insert_rows(conn, table, rows: list) -> None:
+    for start in range(0, len(rows), BATCH_SIZE):
+        await conn.execute(insert(table), rows[start:start + BATCH_SIZE])
+
+
+async def seed(args) -> None:
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+
+    # One bcrypt hash shared by every user keeps seeding fast; logins still verify it
+    users = build_users(rng, args.users, get_password_hash(PASSWORD))
+    user_ids = [user["id"] for user in users]
+    spot_ids = [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(args.spots)]
+    ratings = build_ratings(rng, spot_ids, user_ids, args.ratings)
+    spots = build_spots(rng, spot_ids, user_ids, ratings)
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        if args.reset:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        await insert_rows(conn, User.__table__, users)
+        await insert_rows(conn, Spot.__table__, spots)
+        await insert_rows(conn, SpotRating.__table__, ratings)
+
+    async with AsyncSessionLocal() as db:
+        await rebuild_spot_grid(db)
+        await db.commit()
+
+    # begin() so the statistics commit; the planner's row estimates depend on them
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("ANALYZE")
+
+    public_spots = [spot for spot in spots if spot["is_public"]]
+    manifest = {
+        "seed": args.seed,
+        "password": PASSWORD,
+        "usernames": [user["username"] for user in users if not user["is_shop"]][:500],
+        "spot_ids": [str(spot["id"]) for spot in rng.sample(public_spots, min(500, len(public_spots)))],
+        "cities": [{"name": name, "latitude": lat, "longitude": lon} for name, lat, lon in CITIES],
+        "search_terms": [word.lower() for word in ADJECTIVES + NOUNS],
+        "counts": {"users": len(users), "spots": len(spots), "ratings": len(ratings)},
+    }
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2))
+
+    print(
+        f"Seeded {len(users)} users, {len(spots)} spots and {len(ratings)} ratings "
+        f"in {time.perf_counter() - started:.1f}s; manifest at {MANIFEST_PATH}"
+    )
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--spots", type=int, default=20000)
+    parser.add_argument("--ratings", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first")
+    asyncio.run(seed(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Cold-start benchmark and import-time profile for the API process.
+
+    python benchmarks/startup.py                  # median import/startup/first request, 2.0s budget
+    python benchmarks/startup.py --budget 1.2 --runs 9
+    python benchmarks/startup.py --prewarm        # include the lifespan pre-warm (needs the database)
+    python benchmarks/startup.py --importtime     # which modules the import of main.py spends time in
+
+Every run happens in a fresh interpreter so nothing is already imported. The exit
+status is 1 when the median total is over budget, so this can gate a CI step.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def run():
+    import httpx
+    async with main.app.router.lifespan_context(main.app):
+        ready = time.perf_counter()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+            response = await client.get("/health")
+            response.raise_for_status()
+        first_response = time.perf_counter()
+    return ready, first_response
+
+ready, first_response = asyncio.run(run())
+print(json.dumps({
+    "import": imported - started,
+    "startup": ready - imported,
+    "first_request": first_response - ready,
+    "total": first_response - started,
+}))
+"""
+
+
+def run_probe(prewarm: bool) -> dict:
+    env = dict(os.environ)
+    env["JOB_WORKER_ENABLED"] = "false"
+    env["PREWARM_ENABLED"] = "true" if prewarm else "false"
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark(runs: int, budget: float, prewarm: bool) -> int:
+    samples = [run_probe(prewarm) for _ in range(runs)]
+
+    print(f"{'phase':<15}{'median':>10}{'min':>10}{'max':>10}")
+    for phase in ("import", "startup", "first_request", "total"):
+        values = [sample[phase] for sample in samples]
+        print(f"{phase:<15}{statistics.median(values):>9.3f}s{min(values):>9.3f}s{max(values):>9.3f}s")
+
+    total = statistics.median(sample["total"] for sample in samples)
+    if total > budget:
+        print(f"FAIL: median cold start {total:.3f}s is over the {budget:.3f}s budget")
+        return 1
+    print(f"OK: median cold start {total:.3f}s is within the {budget:.3f}s budget")
+    return 0
+
+
+def import_profile(top: int) -> int:
+    env = dict(os.environ, JOB_WORKER_ENABLED="false")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True
+    )
+
+    # Lines look like "import time:  self [us] | cumulative | <indent>module"
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    by_package = defaultdict(int)
+    for name, self_us, _ in modules:
+        by_package[name.split(".")[0]] += self_us
+    total_us = sum(by_package.values())
+
+    print(f"Total import time: {total_us / 1000:.1f} ms across {len(modules)} modules\n")
+    print(f"{'package':<30}{'self ms':>10}{'share':>8}")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<30}{self_us / 1000:>10.1f}{self_us / total_us:>8.1%}")
+
+    print(f"\n{'module (cumulative)':<50}{'ms':>10}")
+    for name, _, cumulative_us in sorted(modules, key=lambda module: -module[2])[:top]:
+        print(f"{name:<50}{cumulative_us / 1000:>10.1f}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=2.0, help="Seconds allowed for the median total")
+    parser.add_argument("--prewarm", action="store_true", help="Run the lifespan pre-warm step")
+    parser.add_argument("--importtime", action="store_true", help="Print an import-time profile instead")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    if args.importtime:
+        return import_profile(args.top)
+    return benchmark(args.runs, args.budget, args.prewarm)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
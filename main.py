@@ -1,20 +1,47 @@
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import PlainTextResponse
+from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import logging
 import uvicorn
 
 from app.core.config import settings
-from app.core.database import create_tables
+from app.core.database import create_tables, prewarm_pool
+from app.core.auth import load_crypto_backends
+from app.core.jobs import worker
+from app.core.invalidation import bus
+from app.core.counts import TOTAL_COUNT_HEADER, TOTAL_ACCURACY_HEADER
+from app.core.limiter import LoadSheddingMiddleware, render_metrics
 from app.api.v1 import api_router
 
+logger = logging.getLogger(__name__)
+
+
+async def prewarm():
+    """Do first-request setup work before the process starts serving"""
+    load_crypto_backends()
+    try:
+        await prewarm_pool(settings.PREWARM_POOL_CONNECTIONS)
+    except Exception:
+        # A cold pool is slower, not broken; connections are opened on demand instead
+        logger.warning("Connection pool pre-warm failed", exc_info=True)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup - tables are created via Alembic migrations
+    if settings.PREWARM_ENABLED:
+        await prewarm()
+    if settings.JOB_WORKER_ENABLED:
+        await worker.start()
+    if settings.INVALIDATION_BUS_ENABLED:
+        await bus.start()
     yield
     # Shutdown
-    pass
+    await bus.stop()
+    await worker.stop()
 
 
 app = FastAPI(
@@ -24,6 +51,10 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Load shedding - added before CORS so rejections still carry CORS headers
+if settings.LOAD_SHEDDING_ENABLED:
+    app.add_middleware(LoadSheddingMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -31,11 +62,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[TOTAL_COUNT_HEADER, TOTAL_ACCURACY_HEADER],
 )
 
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
+# Serve locally stored media when Cloudinary is not in use
+if settings.MEDIA_STORAGE == "local":
+    app.mount(settings.MEDIA_LOCAL_URL, StaticFiles(directory=settings.MEDIA_LOCAL_ROOT, check_dir=False), name="media")
+
 
 @app.get("/")
 async def root():
@@ -47,5 +83,10 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return render_metrics()
+
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -13,7 +13,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Import our models to ensure they're registered with SQLAlchemy
-from app.models import user, spot, session, post
+from app.models import user, spot, session, post, notification, outbox, media
 from app.core.database_sync import Base
 
 # this is the Alembic Config object, which provides
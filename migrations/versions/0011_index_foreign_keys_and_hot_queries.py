@@ -0,0 +1,127 @@
+"""index foreign keys and hot queries
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 01:18:03.412207
+
+Every index is built with CREATE INDEX CONCURRENTLY, so writes continue while it
+builds. Postgres cannot do that inside a transaction, so those statements run in an
+autocommit block. A failed concurrent build leaves an INVALID index behind. Those are
+dropped before building, so the migration can simply be re-run.
+
+Duplicate (spot_id, user_id) ratings are removed first, keeping each user's latest,
+and the affected spots' rating counters are recomputed.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+LISTED_SPOTS = sa.text('is_public AND deleted_at IS NULL')
+
+# (name, table, columns, options)
+INDEXES = [
+    ('ix_notifications_last_actor_id', 'notifications', ['last_actor_id'], {}),
+    ('ix_post_comments_parent_comment_id', 'post_comments', ['parent_comment_id'], {}),
+    ('ix_post_comments_post_id', 'post_comments', ['post_id'], {}),
+    ('ix_post_comments_user_id', 'post_comments', ['user_id'], {}),
+    ('ix_post_likes_post_id', 'post_likes', ['post_id'], {}),
+    ('ix_post_likes_user_id', 'post_likes', ['user_id'], {}),
+    ('ix_posts_author_id', 'posts', ['author_id'], {}),
+    ('ix_posts_session_id', 'posts', ['session_id'], {}),
+    ('ix_posts_spot_id', 'posts', ['spot_id'], {}),
+    ('ix_session_participants_session_id', 'session_participants', ['session_id'], {}),
+    ('ix_session_participants_user_id', 'session_participants', ['user_id'], {}),
+    ('ix_sessions_creator_id', 'sessions', ['creator_id'], {}),
+    ('ix_sessions_spot_id_scheduled_date', 'sessions', ['spot_id', 'scheduled_date'], {}),
+    ('ix_skate_setups_user_id', 'skate_setups', ['user_id'], {}),
+    ('ix_spot_images_spot_id', 'spot_images', ['spot_id'], {}),
+    ('ix_spot_images_uploaded_by', 'spot_images', ['uploaded_by'], {}),
+    ('ix_spot_ratings_spot_id_created_at', 'spot_ratings', ['spot_id', 'created_at'], {}),
+    ('ix_spot_ratings_user_id', 'spot_ratings', ['user_id'], {}),
+    ('uq_spot_ratings_spot_id_user_id', 'spot_ratings', ['spot_id', 'user_id'], {'unique': True}),
+    ('ix_spot_trending_scores_spot_id', 'spot_trending_scores', ['spot_id'], {}),
+    ('ix_spots_creator_id', 'spots', ['creator_id'], {}),
+    ('ix_spots_listed_created_at', 'spots', ['created_at'], {'postgresql_where': LISTED_SPOTS}),
+    ('ix_spots_listed_location', 'spots', ['latitude', 'longitude'], {'postgresql_where': LISTED_SPOTS}),
+    ('ix_upload_intents_user_id', 'upload_intents', ['user_id'], {}),
+    ('ix_users_active_created_at', 'users', ['created_at'], {'postgresql_where': sa.text('is_active')}),
+]
+
+
+def dedupe_ratings() -> None:
+    conn = op.get_bind()
+    removed = conn.execute(sa.text("""
+        DELETE FROM spot_ratings AS older
+        USING spot_ratings AS newer
+        WHERE older.spot_id = newer.spot_id
+          AND older.user_id = newer.user_id
+          AND (coalesce(older.updated_at, older.created_at), older.id)
+              < (coalesce(newer.updated_at, newer.created_at), newer.id)
+        RETURNING older.spot_id
+    """)).scalars().all()
+    if not removed:
+        return
+
+    conn.execute(
+        sa.text("""
+            UPDATE spots SET
+                rating_1_count = counts.c1,
+                rating_2_count = counts.c2,
+                rating_3_count = counts.c3,
+                rating_4_count = counts.c4,
+                rating_5_count = counts.c5,
+                rating_count = counts.total,
+                rating = counts.average
+            FROM (
+                SELECT spot_id,
+                       count(*) FILTER (WHERE rating = 1) AS c1,
+                       count(*) FILTER (WHERE rating = 2) AS c2,
+                       count(*) FILTER (WHERE rating = 3) AS c3,
+                       count(*) FILTER (WHERE rating = 4) AS c4,
+                       count(*) FILTER (WHERE rating = 5) AS c5,
+                       count(*) AS total,
+                       avg(rating) AS average
+                FROM spot_ratings
+                WHERE spot_id = ANY(:spot_ids)
+                GROUP BY spot_id
+            ) AS counts
+            WHERE spots.id = counts.spot_id
+        """),
+        {"spot_ids": list(set(removed))}
+    )
+
+
+def drop_invalid_indexes() -> None:
+    invalid = op.get_bind().execute(
+        sa.text("""
+            SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE NOT i.indisvalid AND c.relname = ANY(:names)
+        """),
+        {"names": [name for name, *_ in INDEXES]}
+    ).scalars().all()
+    for name in invalid:
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+def upgrade() -> None:
+    dedupe_ratings()
+
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes()
+        for name, table, columns, options in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, if_not_exists=True, **options
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
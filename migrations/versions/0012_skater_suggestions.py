@@ -0,0 +1,70 @@
+"""skater suggestions
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 09:42:17.508113
+
+Adds the skater_suggestions table read by GET /users/suggestions, and a partial index
+for the sweep that marks ended sessions completed. The table is new and empty, so its
+indexes are built normally. The sessions index is built concurrently, and an INVALID
+copy from a failed earlier run is dropped first (see 0011).
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+OPEN_SESSIONS_INDEX = 'ix_sessions_open_scheduled_date'
+
+
+def upgrade() -> None:
+    op.create_table(
+        'skater_suggestions',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('suggested_user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('shared_sessions', sa.Integer(), nullable=False),
+        sa.Column('mutual_skaters', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['suggested_user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'suggested_user_id')
+    )
+    op.create_index(
+        'ix_skater_suggestions_suggested_user_id', 'skater_suggestions', ['suggested_user_id']
+    )
+    op.create_index(
+        'ix_skater_suggestions_user_id_score', 'skater_suggestions', ['user_id', sa.text('score DESC')]
+    )
+
+    with op.get_context().autocommit_block():
+        invalid = op.get_bind().execute(
+            sa.text("""
+                SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE NOT i.indisvalid AND c.relname = :name
+            """),
+            {"name": OPEN_SESSIONS_INDEX}
+        ).scalars().all()
+        if invalid:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{OPEN_SESSIONS_INDEX}"')
+
+        op.create_index(
+            OPEN_SESSIONS_INDEX, 'sessions', ['scheduled_date'],
+            postgresql_where=sa.text("status IN ('scheduled', 'active')"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(OPEN_SESSIONS_INDEX, table_name='sessions', postgresql_concurrently=True, if_exists=True)
+
+    op.drop_index('ix_skater_suggestions_user_id_score', table_name='skater_suggestions')
+    op.drop_index('ix_skater_suggestions_suggested_user_id', table_name='skater_suggestions')
+    op.drop_table('skater_suggestions')
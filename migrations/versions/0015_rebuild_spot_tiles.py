@@ -0,0 +1,26 @@
+"""rebuild spot tiles
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-19 02:12:31.402518
+
+Tile format 2 widens the string table indices to u16. Stored tiles are marked stale so
+they are re-encoded as a new version on their next request.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0015'
+down_revision = '0014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE spot_tiles SET is_stale = true, generation = generation + 1")
+
+
+def downgrade() -> None:
+    op.execute("UPDATE spot_tiles SET is_stale = true, generation = generation + 1")
@@ -0,0 +1,79 @@
+"""notification unread groups
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-19 02:12:13.519512
+
+Adds notification_actors, which records every distinct actor of a notification, and a
+unique index allowing one unread notification per (user_id, notification_type, target_id)
+so delivery can upsert into it. Existing stored actors are copied into the new table.
+
+Duplicate unread groups from earlier concurrent deliveries are resolved first by marking
+all but the most recently updated one read. The index is built concurrently, after
+dropping an INVALID copy from a failed earlier run (see 0011).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0016'
+down_revision = '0015'
+branch_labels = None
+depends_on = None
+
+UNREAD_GROUP_INDEX = 'uq_notifications_unread_group'
+
+
+def upgrade() -> None:
+    op.create_table('notification_actors',
+    sa.Column('notification_id', sa.UUID(), nullable=False),
+    sa.Column('actor_id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['actor_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['notification_id'], ['notifications.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('notification_id', 'actor_id')
+    )
+    op.execute("""
+        INSERT INTO notification_actors (notification_id, actor_id)
+        SELECT n.id, u.id
+        FROM notifications AS n
+        CROSS JOIN json_array_elements_text(n.actor_ids) AS actor(id)
+        JOIN users AS u ON u.id = actor.id::uuid
+        ON CONFLICT DO NOTHING
+    """)
+    op.execute("""
+        UPDATE notifications AS older SET is_read = true
+        FROM notifications AS newer
+        WHERE NOT older.is_read AND NOT newer.is_read
+          AND older.user_id = newer.user_id
+          AND older.notification_type = newer.notification_type
+          AND older.target_id IS NOT DISTINCT FROM newer.target_id
+          AND (coalesce(older.updated_at, older.created_at), older.id)
+              < (coalesce(newer.updated_at, newer.created_at), newer.id)
+    """)
+
+    with op.get_context().autocommit_block():
+        invalid = op.get_bind().execute(
+            sa.text("""
+                SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE NOT i.indisvalid AND c.relname = :name
+            """),
+            {"name": UNREAD_GROUP_INDEX}
+        ).scalars().all()
+        if invalid:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{UNREAD_GROUP_INDEX}"')
+
+        op.create_index(
+            UNREAD_GROUP_INDEX, 'notifications', ['user_id', 'notification_type', 'target_id'],
+            unique=True, postgresql_nulls_not_distinct=True, postgresql_where=sa.text('is_read = false'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            UNREAD_GROUP_INDEX, table_name='notifications', postgresql_concurrently=True, if_exists=True
+        )
+
+    op.drop_table('notification_actors')
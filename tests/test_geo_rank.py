@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from app.core.geo import haversine_km
+from app.core.geo_rank import ROUTE_MAX_BOXES, rank_within, route_positions
+
+# One degree of latitude, in km, for the mean Earth radius used by geo_rank
+KM_PER_DEGREE = np.radians(6371.0088)
+
+
+def random_points(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(51.4, 51.6, count), rng.uniform(-0.2, 0.0, count)
+
+
+class TestRankWithin:
+    def test_matches_pairwise_haversine(self):
+        latitudes, longitudes = random_points(500)
+        points = [(51.5, -0.1), (51.45, -0.05)]
+        order, distances, in_range = rank_within(latitudes, longitudes, points, 4.0, 20)
+
+        expected = [
+            min(haversine_km(lat, lon, *point) for point in points)
+            for lat, lon in zip(latitudes, longitudes)
+        ]
+        nearest = sorted((d, i) for i, d in enumerate(expected) if d <= 4.0)
+        assert in_range == len(nearest)
+        assert order.tolist() == [i for _, i in nearest[:20]]
+        assert distances == pytest.approx([d for d, _ in nearest[:20]])
+
+    def test_k_larger_than_matches_returns_all_sorted(self):
+        latitudes, longitudes = random_points(50, seed=1)
+        order, distances, in_range = rank_within(latitudes, longitudes, [(51.5, -0.1)], 5.0, 1000)
+        assert len(order) == in_range
+        assert np.all(np.diff(distances) >= 0)
+        assert np.all(distances <= 5.0)
+
+    def test_zero_k_still_counts_matches(self):
+        latitudes, longitudes = random_points(50, seed=2)
+        order, distances, in_range = rank_within(latitudes, longitudes, [(51.5, -0.1)], 5.0, 0)
+        assert len(order) == 0 and len(distances) == 0
+        assert in_range > 0
+
+    def test_ties_keep_candidate_order(self):
+        order, _, _ = rank_within([51.5, 51.5, 51.5], [-0.1, -0.1, -0.1], [(51.5, -0.1)], 1.0, 3)
+        assert order.tolist() == [0, 1, 2]
+
+    def test_nothing_in_range(self):
+        order, _, in_range = rank_within([10.0], [10.0], [(51.5, -0.1)], 1.0, 5)
+        assert order.tolist() == [] and in_range == 0
+
+
+class TestRoutePositions:
+    # An east-west route on the equator, where the flat projection is exact
+    ROUTE = [(0.0, 0.0), (0.0, 0.01), (0.0, 0.02)]
+
+    def test_distance_and_position_along_the_route(self):
+        latitudes = [0.001, -0.0005, 0.0]
+        longitudes = [0.005, 0.015, 0.02]
+        distances, along = route_positions(latitudes, longitudes, self.ROUTE, 0.5)
+
+        assert distances == pytest.approx(np.array([0.001, 0.0005, 0.0]) * KM_PER_DEGREE)
+        assert along == pytest.approx(np.array([0.005, 0.015, 0.02]) * KM_PER_DEGREE)
+
+    def test_past_the_ends_measures_to_the_endpoints(self):
+        distances, along = route_positions([0.0, 0.0], [-0.002, 0.023], self.ROUTE, 0.5)
+        assert distances == pytest.approx(np.array([0.002, 0.003]) * KM_PER_DEGREE)
+        assert along == pytest.approx(np.array([0.0, 0.02]) * KM_PER_DEGREE)
+
+    def test_candidates_outside_every_box_are_not_measured(self):
+        distances, along = route_positions([0.5], [0.01], self.ROUTE, 0.5)
+        assert distances[0] == np.inf and along[0] == 0.0
+
+    def test_repeated_vertices(self):
+        route = [(0.0, 0.0), (0.0, 0.0), (0.0, 0.01), (0.0, 0.01)]
+        distances, along = route_positions([0.0, 0.001], [0.0, 0.01], route, 0.5)
+        assert np.all(np.isfinite(distances))
+        assert distances == pytest.approx(np.array([0.0, 0.001]) * KM_PER_DEGREE)
+        assert along == pytest.approx(np.array([0.0, 0.01]) * KM_PER_DEGREE)
+
+    def test_route_passing_twice_keeps_the_first_pass(self):
+        route = [(0.0, 0.0), (0.0, 0.01), (0.0, 0.0)]
+        _, along = route_positions([0.0], [0.005], route, 0.5)
+        assert along[0] == pytest.approx(0.005 * KM_PER_DEGREE)
+
+    def test_long_routes_group_segments_without_changing_results(self):
+        # Enough vertices that segments are grouped into ROUTE_MAX_BOXES boxes
+        vertices = ROUTE_MAX_BOXES * 5 + 1
+        route = [(0.0, i * 0.0001) for i in range(vertices)]
+        latitudes, longitudes = [0.0002] * 3, [0.0, 0.0123, (vertices - 1) * 0.0001]
+        distances, along = route_positions(latitudes, longitudes, route, 0.1)
+
+        assert distances == pytest.approx([0.0002 * KM_PER_DEGREE] * 3)
+        assert along == pytest.approx(np.array(longitudes) * KM_PER_DEGREE)
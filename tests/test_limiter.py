@@ -0,0 +1,39 @@
+import pytest
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.limiter import get_client_ip
+
+
+def request(peer="10.0.0.9", forwarded=()):
+    headers = [(b"x-forwarded-for", value.encode()) for value in forwarded]
+    return Request({"type": "http", "headers": headers, "client": (peer, 50000)})
+
+
+@pytest.fixture
+def hops(monkeypatch):
+    def set_hops(count):
+        monkeypatch.setattr(settings, "TRUSTED_PROXY_HOPS", count)
+    return set_hops
+
+
+def test_without_trusted_proxies_the_peer_is_the_client(hops):
+    hops(0)
+    assert get_client_ip(request(forwarded=["203.0.113.7"])) == "10.0.0.9"
+
+
+def test_one_proxy_uses_the_last_forwarded_entry(hops):
+    hops(1)
+    # The first entry was sent by the client and must not be trusted
+    assert get_client_ip(request(forwarded=["1.2.3.4, 203.0.113.7"])) == "203.0.113.7"
+
+
+def test_two_proxies_skip_the_inner_proxy(hops):
+    hops(2)
+    assert get_client_ip(request(forwarded=["1.2.3.4, 203.0.113.7", "10.0.0.2"])) == "203.0.113.7"
+
+
+def test_missing_or_short_header_falls_back_to_the_peer(hops):
+    hops(2)
+    assert get_client_ip(request()) == "10.0.0.9"
+    assert get_client_ip(request(forwarded=["203.0.113.7"])) == "10.0.0.9"
@@ -0,0 +1,106 @@
+import functools
+import operator
+
+import pytest
+from sqlalchemy import Column
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, Cast, ExpressionClauseList, Grouping
+from sqlalchemy.sql.functions import Function
+
+from app.core.ratings import STARS, _rating_values, apply_rating_change
+
+
+def evaluate(expression, row: dict):
+    """Evaluate a SET expression against a row the way Postgres would"""
+    if isinstance(expression, Column):
+        return row[expression.name]
+    if isinstance(expression, BindParameter):
+        return expression.value
+    if isinstance(expression, Grouping):
+        return evaluate(expression.element, row)
+    if isinstance(expression, Cast):
+        value = evaluate(expression.clause, row)
+        return None if value is None else float(value)
+    if isinstance(expression, (BinaryExpression, ExpressionClauseList)):
+        operands = (
+            [expression.left, expression.right] if isinstance(expression, BinaryExpression)
+            else list(expression.clauses)
+        )
+        values = [evaluate(operand, row) for operand in operands]
+        if any(value is None for value in values):
+            return None
+        return functools.reduce(expression.operator, values)
+    if isinstance(expression, Function):
+        args = [evaluate(arg, row) for arg in expression.clauses]
+        if expression.name == "coalesce":
+            return next((arg for arg in args if arg is not None), None)
+        if expression.name == "nullif":
+            return None if args[0] == args[1] else args[0]
+    raise TypeError(f"Unsupported expression {expression!r}")
+
+
+def spot_row(histogram: dict) -> dict:
+    row = {f"rating_{stars}_count": histogram.get(stars, 0) for stars in STARS}
+    total = sum(histogram.values())
+    row["rating_count"] = total
+    row["rating"] = sum(stars * count for stars, count in histogram.items()) / total if total else 0.0
+    return row
+
+
+def apply(row: dict, new_rating: int, previous_rating=None) -> dict:
+    values = _rating_values(new_rating, previous_rating)
+    # All right-hand sides read the old row, as in a single UPDATE
+    return {**row, **{name: evaluate(expression, row) for name, expression in values.items()}}
+
+
+def test_first_rating_of_a_spot():
+    row = apply(spot_row({}), 4)
+    assert row == spot_row({4: 1})
+
+
+def test_new_rating_joins_existing_ones():
+    row = apply(spot_row({5: 2, 3: 1}), 1)
+    assert row["rating_count"] == 4
+    assert row["rating_1_count"] == 1
+    assert row["rating"] == pytest.approx((5 * 2 + 3 + 1) / 4)
+
+
+def test_changed_rating_moves_between_buckets():
+    row = apply(spot_row({2: 1, 4: 2}), 5, previous_rating=2)
+    assert row == pytest.approx(spot_row({4: 2, 5: 1}))
+
+
+def test_unchanged_rating_leaves_buckets_alone():
+    values = _rating_values(3, previous_rating=3)
+    assert set(values) == {"rating_count", "rating"}
+    assert apply(spot_row({3: 2}), 3, previous_rating=3) == spot_row({3: 2})
+
+
+def test_average_of_only_rating_moved_to_another_bucket():
+    row = apply(spot_row({1: 1}), 5, previous_rating=1)
+    assert row == spot_row({5: 1})
+
+
+class CapturingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return self
+
+    def first(self):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_apply_rating_change_updates_live_spot_in_one_statement():
+    db = CapturingSession()
+    assert await apply_rating_change(db, "spot", 4, previous_rating=2) is None
+
+    [statement] = db.statements
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE spots SET")
+    assert "spots.deleted_at IS NULL" in sql
+    assert "RETURNING spots.creator_id, spots.is_public, spots.latitude, spots.longitude" in sql
+    assert "rating_4_count=" in sql and "rating_2_count=" in sql
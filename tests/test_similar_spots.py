@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.core.similar_spots import SpotFeatureIndex
+
+
+def row(spot_type="street", features=("rails",), difficulty="beginner", rating=4.0, spot_id=None):
+    return SimpleNamespace(
+        id=spot_id or uuid4(), latitude=51.5, longitude=-0.1,
+        spot_type=spot_type, difficulty=difficulty, features=list(features), rating=rating
+    )
+
+
+def built(rows):
+    index = SpotFeatureIndex()
+    index._build(rows)
+    return index
+
+
+def active_ids(index):
+    return {index._ids[i] for i in np.flatnonzero(index._active)}
+
+
+class TestGrow:
+    def test_first_growth_reserves_sixteen_rows(self):
+        index = built([])
+        assert index._grow() == 0
+        assert index._matrix.shape == (16, index.dimensions)
+        assert len(index._ids) == len(index._latitudes) == len(index._active) == 16
+        assert not index._active.any()
+        assert index._free == list(range(15, 0, -1))
+
+    def test_capacity_doubles_and_keeps_existing_rows(self):
+        rows = [row() for _ in range(20)]
+        index = built(rows)
+        matrix = index._matrix.copy()
+
+        assert index._grow() == 20
+        assert index._matrix.shape[0] == 40
+        assert np.array_equal(index._matrix[:20], matrix)
+        assert index._active[:20].all() and not index._active[20:].any()
+        assert index._ids[:20] == [r.id for r in rows] and index._ids[20:] == [None] * 20
+        # Free rows are handed out lowest first
+        assert index._free[-1] == 21 and len(index._free) == 19
+
+
+class TestPatch:
+    def test_updates_existing_row_in_place(self):
+        rows = [row(), row(spot_type="park")]
+        index = built(rows)
+        updated = row(spot_type="park", features=(), rating=1.0, spot_id=rows[0].id)
+
+        assert index._patch({str(rows[0].id)}, [updated])
+        assert index._rows[str(rows[0].id)] == 0
+        assert np.allclose(index._matrix[0], index._encode(updated))
+        assert np.allclose(index._matrix[1], index._encode(rows[1]))
+
+    def test_missing_rows_are_deactivated_and_their_slot_reused(self):
+        rows = [row(), row()]
+        index = built(rows)
+
+        assert index._patch({str(rows[0].id)}, [])
+        assert active_ids(index) == {rows[1].id}
+        assert str(rows[0].id) not in index._rows and index._free == [0]
+
+        added = row()
+        assert index._patch({str(added.id)}, [added])
+        assert index._rows[str(added.id)] == 0 and index._free == []
+        assert active_ids(index) == {rows[1].id, added.id}
+
+    def test_new_rows_grow_the_matrix(self):
+        rows = [row() for _ in range(3)]
+        index = built(rows)
+        added = [row(difficulty=None, rating=None) for _ in range(20)]
+
+        assert index._patch({str(r.id) for r in added}, added)
+        assert index._matrix.shape[0] >= 23
+        assert active_ids(index) == {r.id for r in rows + added}
+        for r in added:
+            position = index._rows[str(r.id)]
+            assert index._ids[position] == r.id
+            assert np.allclose(index._matrix[position], index._encode(r))
+
+    @pytest.mark.parametrize("unknown", [row(spot_type="bowl"), row(features=("rails", "gap"))])
+    def test_unknown_vocabulary_needs_a_rebuild(self, unknown):
+        rows = [row()]
+        index = built(rows)
+        matrix = index._matrix.copy()
+
+        assert not index._patch({str(unknown.id), str(rows[0].id)}, [unknown])
+        # Nothing was applied, not even the removal of the missing row
+        assert np.array_equal(index._matrix, matrix)
+        assert active_ids(index) == {rows[0].id}
+
+    def test_unknown_stale_ids_are_ignored(self):
+        index = built([row()])
+        assert index._patch({str(uuid4())}, [])
+        assert len(active_ids(index)) == 1 and index._free == []
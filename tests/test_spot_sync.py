@@ -0,0 +1,48 @@
+import base64
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.core.spot_sync import (
+    MAX_UUID, SyncTokenError, decode_sync_token, encode_sync_token
+)
+
+
+def test_round_trip_keeps_timestamp_and_id():
+    position = (datetime(2026, 3, 14, 15, 9, 26, 535897, tzinfo=timezone.utc), uuid4())
+    assert decode_sync_token(encode_sync_token(position)) == position
+
+
+def test_round_trip_keeps_utc_offset():
+    offset = timezone(timedelta(hours=-7))
+    position = (datetime(2026, 1, 1, 23, 30, tzinfo=offset), MAX_UUID)
+    timestamp, spot_id = decode_sync_token(encode_sync_token(position))
+    assert timestamp == position[0] and timestamp.utcoffset() == timedelta(hours=-7)
+    assert spot_id == MAX_UUID
+
+
+def test_token_is_url_safe_without_padding():
+    for microsecond in range(0, 1000000, 99991):
+        token = encode_sync_token((datetime(2026, 5, 1, microsecond=microsecond, tzinfo=timezone.utc), uuid4()))
+        assert "=" not in token
+        assert set(token) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+
+
+def _token(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("token", [
+    "",
+    "not a token",
+    _token("v2|2026-01-01T00:00:00+00:00|" + str(UUID(int=1))),
+    _token("v1|yesterday|" + str(UUID(int=1))),
+    _token("v1|2026-01-01T00:00:00+00:00|not-a-uuid"),
+    _token("v1|2026-01-01T00:00:00+00:00"),
+    _token("v1|2026-01-01T00:00:00+00:00|" + str(UUID(int=1)) + "|extra"),
+    _token("v1|2026-01-01T00:00:00|" + str(UUID(int=1))),
+])
+def test_malformed_tokens_are_rejected(token):
+    with pytest.raises(SyncTokenError):
+        decode_sync_token(token)
@@ -0,0 +1,105 @@
+import struct
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.core.geo import tile_bounds
+from app.core.spot_tiles import (
+    MAX_TABLE_ENTRIES, NO_DIFFICULTY, TILE_FORMAT_VERSION, TILE_MAGIC, encode_tile
+)
+
+ZOOM, X, Y = 14, 8185, 5448
+
+
+def spot(latitude, longitude, spot_type="street", difficulty=None, rating=None):
+    return SimpleNamespace(
+        id=uuid4(), latitude=latitude, longitude=longitude,
+        spot_type=spot_type, difficulty=difficulty, rating=rating
+    )
+
+
+def decode(data: bytes) -> dict:
+    """Reference decoder following the layout in the spot_tiles module docstring"""
+    magic, version, zoom, x, y = struct.unpack_from("<4sBBII", data)
+    offset = struct.calcsize("<4sBBII")
+
+    tables = []
+    for _ in range(2):
+        (count,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        values = []
+        for _ in range(count):
+            length = data[offset]
+            values.append(data[offset + 1:offset + 1 + length].decode("utf-8"))
+            offset += 1 + length
+        tables.append(values)
+
+    (count,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    spots = [struct.unpack_from("<16sHHHHB", data, offset + 25 * i) for i in range(count)]
+    assert offset + 25 * count == len(data)
+    return {
+        "header": (magic, version, zoom, x, y),
+        "spot_types": tables[0],
+        "difficulties": tables[1],
+        "spots": spots,
+    }
+
+
+def test_empty_tile_is_header_and_empty_tables():
+    tile = decode(encode_tile(ZOOM, X, Y, []))
+    assert tile["header"] == (TILE_MAGIC, TILE_FORMAT_VERSION, ZOOM, X, Y)
+    assert tile["spot_types"] == [] and tile["difficulties"] == [] and tile["spots"] == []
+
+
+def test_spots_are_encoded_with_string_table_indices():
+    min_lat, min_lon, max_lat, max_lon = tile_bounds(ZOOM, X, Y)
+    mid_lat, mid_lon = (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
+    spots = [
+        spot(mid_lat, mid_lon, "street", "advanced", 4.2),
+        spot(mid_lat, mid_lon, "bowl", None, None),
+        spot(mid_lat, mid_lon, "park", "beginner", 5.0),
+    ]
+    tile = decode(encode_tile(ZOOM, X, Y, spots))
+
+    assert tile["spot_types"] == ["bowl", "park", "street"]
+    assert tile["difficulties"] == ["advanced", "beginner"]
+    assert [record[0] for record in tile["spots"]] == [s.id.bytes for s in spots]
+    assert [record[3:] for record in tile["spots"]] == [
+        (2, 0, 210),
+        (0, NO_DIFFICULTY, 0),
+        (1, 1, 250),
+    ]
+
+
+def test_positions_are_quantized_within_tile_bounds():
+    min_lat, min_lon, max_lat, max_lon = tile_bounds(ZOOM, X, Y)
+    spots = [
+        spot(min_lat, min_lon),
+        spot(max_lat, max_lon),
+        spot(min_lat + (max_lat - min_lat) / 4, min_lon + (max_lon - min_lon) * 3 / 4),
+        # Points just outside the tile clamp to its edges
+        spot(max_lat + 1, min_lon - 1),
+    ]
+    positions = [record[1:3] for record in decode(encode_tile(ZOOM, X, Y, spots))["spots"]]
+    assert positions == [(0, 0), (65535, 65535), (16384, 49151), (65535, 0)]
+
+
+def test_long_strings_are_truncated_to_255_bytes():
+    tile = decode(encode_tile(ZOOM, X, Y, [spot(0, 0, "x" * 300)]))
+    assert tile["spot_types"] == ["x" * 255]
+    assert len(tile["spots"]) == 1
+
+
+def test_more_than_255_distinct_values_keep_their_indices():
+    spots = [spot(0, 0, f"type{i:03}", f"level{i:03}") for i in range(300)]
+    tile = decode(encode_tile(ZOOM, X, Y, spots))
+    assert len(tile["spots"]) == 300
+    assert [record[3:5] for record in tile["spots"]] == [(i, i) for i in range(300)]
+
+
+def test_too_many_distinct_values_raise():
+    spots = [spot(0, 0, str(i)) for i in range(MAX_TABLE_ENTRIES + 1)]
+    with pytest.raises(ValueError):
+        encode_tile(ZOOM, X, Y, spots)